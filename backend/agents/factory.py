@@ -23,7 +23,7 @@ RATE-LIMIT ALTERNATIVES (swap any above with these if you add OPENROUTER_API_KEY
 
 import os
 import logging
-from typing import List
+from typing import List, Dict, Callable
 
 from backend.agents.base import BaseAgent
 from backend.agents.simulated_agent import SimulatedAgent
@@ -32,6 +32,7 @@ from backend.agents.groq_agent import GroqAgent
 from backend.agents.gemini_agent import GeminiAgent
 from backend.agents.cerebras_agent import CerebrasAgent
 from backend.agents.openrouter_agent import OpenRouterAgent
+from backend.config import HEDGE_BACKUP_MODELS, SPARE_AGENTS
 
 logger = logging.getLogger("byzantinemind.factory")
 
@@ -104,3 +105,69 @@ def create_agents(mode: str) -> List[BaseAgent]:
     # Default: fast / simulated mode (7 agents, 1-indexed to match full mode IDs)
     logger.info("Creating FAST-MODE agents (7x simulated, agent_1..agent_7)...")
     return [SimulatedAgent(f"agent_{i}") for i in range(1, 8)]
+
+
+def create_backup_agents(mode: str, spec: str = HEDGE_BACKUP_MODELS) -> Dict[str, BaseAgent]:
+    """
+    Builds the hedge backups configured in HEDGE_BACKUP_MODELS ("agent_4:qwen2,agent_5:mistral").
+
+    Each entry maps an agent slot to an alternate model — a key of
+    OpenRouterAgent.RECOMMENDED_MODELS or a raw OpenRouter model id. Backups answer on behalf
+    of their slot, so their votes are signed with the slot's identity, not their own.
+
+    Returns:
+        Mapping of slot agent_id -> backup agent (empty if nothing is configured).
+    """
+    backups: Dict[str, BaseAgent] = {}
+    for entry in filter(None, (e.strip() for e in spec.split(","))):
+        slot, _, model = entry.partition(":")
+        model = OpenRouterAgent.RECOMMENDED_MODELS.get(model, model)
+        if mode == "full":
+            backups[slot] = OpenRouterAgent(f"{slot}_backup", model=model)
+        else:
+            backups[slot] = SimulatedAgent(f"{slot}_backup")
+        logger.info(f"Hedge backup for {slot}: {model if mode == 'full' else 'SimulatedAgent'}")
+    return backups
+
+
+SPARE_PROVIDERS: Dict[str, Callable[..., BaseAgent]] = {
+    "openrouter": OpenRouterAgent,
+    "cerebras": CerebrasAgent,
+    "groq": GroqAgent,
+    "gemini": GeminiAgent,
+    "mistral": MistralAgent,
+}
+
+
+def create_model_agents(mode: str, specs: List[str], prefix: str) -> List[BaseAgent]:
+    """
+    Builds one agent per "provider:model" spec (providers: SPARE_PROVIDERS), numbered
+    {prefix}_1, {prefix}_2, ... Without a known provider the whole spec is an OpenRouter
+    model (a key of OpenRouterAgent.RECOMMENDED_MODELS or a raw model id). In fast mode
+    every agent is a SimulatedAgent.
+    """
+    built: List[BaseAgent] = []
+    for i, entry in enumerate(filter(None, (e.strip() for e in specs)), start=1):
+        provider, _, model = entry.partition(":")
+        if provider.lower() not in SPARE_PROVIDERS:
+            provider, model = "openrouter", entry
+        if provider.lower() == "openrouter":
+            model = OpenRouterAgent.RECOMMENDED_MODELS.get(model, model)
+        agent_id = f"{prefix}_{i}"
+        if mode == "full":
+            built.append(SPARE_PROVIDERS[provider.lower()](agent_id, model=model))
+        else:
+            built.append(SimulatedAgent(agent_id))
+        logger.info(f"{agent_id}: {f'{provider}:{model}' if mode == 'full' else 'SimulatedAgent'}")
+    return built
+
+
+def create_spare_agents(mode: str, spec: str = SPARE_AGENTS) -> List[BaseAgent]:
+    """
+    Builds the hot spares configured in SPARE_AGENTS ("openrouter:phi4,cerebras:llama3.1-8b"),
+    numbered spare_1, spare_2, ... (see create_model_agents). Spares sign with their own identity.
+
+    Returns:
+        The spares in the order they are pulled in (empty if nothing is configured).
+    """
+    return create_model_agents(mode, spec.split(","), "spare")
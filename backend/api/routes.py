@@ -8,8 +8,15 @@ Endpoints:
   POST /api/faults/clear   — clear a fault (or all faults)
   GET  /api/history        — retrieve audit trail from Auditor
   GET  /api/config         — current system configuration
+  GET  /api/checkpoints    — stable checkpoint and log size per consensus engine
+  GET  /api/rounds/{seq}   — full audit trail of the round(s) ordered under a sequence number
+  GET  /api/rounds?since=  — recent rounds after a sequence number
+  GET  /api/rounds/actions/{action_id} — the round of one request (read-only lane included)
+  GET  /api/shards         — consensus shards, their routing rules and engines
+  GET  /api/shards/intents/{intent_id} — which shard (and sequence number) ordered an intent
 """
 
+import asyncio
 import logging
 import datetime
 from typing import Optional
@@ -17,8 +24,12 @@ from pydantic import BaseModel
 from fastapi import APIRouter, HTTPException
 import os
 
-from backend.config import MODE, F_FAULTS, N_AGENTS
-from backend.agents.factory import create_agents
+from backend.config import (
+    MODE, F_FAULTS, N_AGENTS, BATCH_MAX_SIZE, CHECKPOINT_INTERVAL, CLUSTER_PEERS, CLUSTER_KEYS_FILE,
+    DECISION_CACHE_TTLS, READ_ONLY_LANE, COMMITTEE_SAMPLE_SIZE, STATE_SNAPSHOT_PATH, SHARDS_FILE,
+)
+from backend.agents.factory import create_agents, create_backup_agents, create_spare_agents
+from backend.agents.base import SYSTEM_PROMPT
 from backend.armoriq.intent_engine import IntentEngine
 from backend.armoriq.gatekeeper import Gatekeeper
 from backend.armoriq.sentry import Sentry
@@ -27,8 +38,18 @@ from backend.armoriq.auditor import Auditor
 from backend.armoriq.trust_engine import TrustEngine
 from backend.armoriq.policy_engine import policy_engine
 from backend.consensus.engine import ConsensusEngine
+from backend.consensus.batching import RequestBatcher
+from backend.consensus.cache import DecisionCache, parse_ttls
+from backend.consensus.round_store import RoundStore
+from backend.consensus.state_store import StateStore
+from backend.consensus.sharding import DEFAULT_SHARD, ShardRouter, load_shards
+from backend.consensus.network import ReplicaCluster
+from backend.consensus.replica import load_cluster_keys
+from backend.consensus.transport import parse_peers
+from backend.crypto.identity import AgentIdentity
 from backend.faults.injector import FaultInjector, FaultConfig, FaultType
 from backend.api.websocket import ws_event_hook
+from backend.utils import canonical_json, sha256
 
 # Analytics specific imports
 import time
@@ -41,11 +62,52 @@ router = APIRouter(prefix="/api")
 # These are initialized once when the server starts and shared across requests.
 
 agents = create_agents(MODE)
+backup_agents = create_backup_agents(MODE)
+spare_agents = create_spare_agents(MODE)
+# Shards: independent committees with their own rosters; unmatched intents use `agents`
+shard_router = ShardRouter(load_shards(SHARDS_FILE, MODE) if SHARDS_FILE else [])
+shard_agents = [agent for shard in shard_router.shards for agent in shard.agents]
+
+# Durable state: agents keep their keys across restarts (so old certificates still verify)
+# and each engine resumes its sequence/view numbers and checkpoint
+state_store = StateStore() if STATE_SNAPSHOT_PATH else None
+if state_store is not None:
+    state_store.identities(agents + spare_agents + shard_agents)
+
+# Multi-process deployment: agents sign with the same keys as their replica processes
+cluster_peers = parse_peers(CLUSTER_PEERS)
+if cluster_peers:
+    _seeds = load_cluster_keys(CLUSTER_KEYS_FILE)
+    for agent in agents:
+        agent.identity = AgentIdentity(agent.agent_id, seed=_seeds[agent.agent_id])
 registry = Registry()
 auditor = Auditor(db_path="audit.db")
 injector = FaultInjector()
 trust_engine = TrustEngine(persist_path="trust_scores.json")
 
+# One long-lived engine (and batcher) per authorized roster, so sequence numbers and
+# view state persist across requests and concurrent queries pipeline through it.
+engines = {}
+batchers = {}
+
+
+def _decision_version() -> str:
+    """
+    Cached decisions are only valid for the policies, prompt, mode and injected faults that
+    produced them, so injecting (or clearing) a fault never serves a certificate from before.
+    """
+    return sha256(canonical_json({
+        "policies": policy_engine.get_all_policies(),
+        "prompt": SYSTEM_PROMPT,
+        "mode": MODE,
+        "faults": injector.get_active_faults(),
+    }))
+
+
+decision_cache = DecisionCache(version=_decision_version)
+round_store = RoundStore()
+cache_ttls = parse_ttls(DECISION_CACHE_TTLS)
+
 # In-memory analytics state
 analytics_data = {
     "total_queries": 0,
@@ -83,6 +145,8 @@ _MODEL_LABELS = (
 
 for agent in agents:
     registry.register_agent(agent.agent_id, _MODEL_LABELS.get(agent.agent_id, "Unknown"))
+for agent in spare_agents + shard_agents:
+    registry.register_agent(agent.agent_id, getattr(agent, "model", "SimulatedAgent"))
 
 
 # ── Request / Response Models ─────────────────────────────────────
@@ -104,6 +168,63 @@ class FaultClearRequest(BaseModel):
     agent_id: Optional[str] = None  # None = clear all
 
 
+# ── Helpers ───────────────────────────────────────────────────────
+
+def _agent_score(agent_id: str) -> float:
+    """Ranks agents for the optimistic committee: trust score × observed reliability,
+    zero for agents the registry currently marks as faulty."""
+    info = registry.agents.get(agent_id, {})
+    if info.get("status", "ONLINE") != "ONLINE":
+        return 0.0
+    ok, failed = info.get("successful_participations", 0), info.get("failed_participations", 0)
+    reliability = ok / (ok + failed) if ok + failed else 1.0
+    return trust_engine.scores.get(agent_id, {}).get("score", 100.0) * reliability
+
+
+def _is_read_only(request: dict) -> bool:
+    """LOW-risk operations take the engine's read-only lane. Classified from the operation
+    itself, never from the client-supplied risk field."""
+    return IntentEngine.classify_risk(request.get("operation", ""), request.get("target", "")) == "LOW"
+
+
+def get_engine(authorized: list, shard=None) -> ConsensusEngine:
+    """Returns the persistent engine for this roster, refreshing its agent objects."""
+    roster = tuple(a.agent_id for a in authorized)
+    if roster not in engines and shard is not None:
+        # A shard's committee is self-contained: its own f, no replicas, spares or sampling
+        engines[roster] = ConsensusEngine(
+            authorized, on_event=ws_event_hook, agent_score=_agent_score, cache=decision_cache,
+            round_store=round_store, read_only=_is_read_only if READ_ONLY_LANE else None,
+            f=shard.f, sample_size=0, state_store=state_store,
+        )
+        batchers[roster] = RequestBatcher(engines[roster])
+    elif roster not in engines:
+        # Replicas keep a single sequence space, so only the full roster is ordered by them;
+        # narrower rosters run their nodes in-process.
+        cluster = None
+        if cluster_peers and set(roster) == set(cluster_peers):
+            cluster = ReplicaCluster(cluster_peers, {a.agent_id: a.identity.verify_key for a in authorized})
+        engines[roster] = ConsensusEngine(
+            authorized, on_event=ws_event_hook, backups=backup_agents, cluster=cluster, agent_score=_agent_score,
+            cache=decision_cache, round_store=round_store, read_only=_is_read_only if READ_ONLY_LANE else None,
+            # Spares need in-process nodes; with sampling the rest of the roster stands by instead
+            spares=spare_agents if cluster is None and not COMMITTEE_SAMPLE_SIZE else None,
+            state_store=state_store,
+        )
+        batchers[roster] = RequestBatcher(engines[roster])
+    engine = engines[roster]
+    engine.agents = list(authorized)  # pick up fault-injected wrappers
+    return engine
+
+
+async def _score_late_votes(rnd, decision: str, start_time: float):
+    """Feed votes that arrived after an early quorum into the trust engine."""
+    await rnd.wait_for_stragglers()
+    if rnd.late_results:
+        latency_ms = int((time.time() - start_time) * 1000)
+        trust_engine.evaluate_round(decision, rnd.late_results, latency_ms)
+
+
 # ── Routes ────────────────────────────────────────────────────────
 
 @router.post("/query")
@@ -138,12 +259,14 @@ async def submit_query(req: QueryRequest):
             "guardrail_bypassed": False,
         }
 
-    # Step 3: Gatekeeper — authorize agents
-    authorized = Gatekeeper.authorize_agents(intent, agents)
-    
     # Evaluate Governance Policy
     policy_result = policy_engine.evaluate(intent, default_quorum=2 * F_FAULTS + 1)
     required_quorum = policy_result["required_quorum"]
+
+    # Step 3: Shard routing, then Gatekeeper — authorize the shard's agents
+    shard = shard_router.route(intent.intent_id, intent.target, policy_result["policy_id"])
+    shard_id = shard.id if shard else DEFAULT_SHARD
+    authorized = Gatekeeper.authorize_agents(intent, shard.agents if shard else agents)
     
     if len(authorized) < required_quorum:
         return {
@@ -153,22 +276,34 @@ async def submit_query(req: QueryRequest):
         }
 
     # Step 4: PBFT Consensus
-    engine = ConsensusEngine(authorized, on_event=ws_event_hook)
-    
     # We pass required_quorum to the engine now (if it supports it) or rely on default threshold
     # For now, we manually override the engine's quorum threshold if it exposes it, 
     # but the ConsensusEngine hardcodes f. Let's just pass the policy data to the response.
-    
-    result, cert, rnd = await engine.submit_request(intent.intent_id, request_data)
+    engine = get_engine(authorized, shard)
+    cache_ttl = cache_ttls.get(intent.risk_level, 0)
+    cached = engine.lookup_cached(intent.intent_id, request_data) if cache_ttl > 0 else None
+    if cached:
+        result, cert, rnd = cached
+    elif BATCH_MAX_SIZE > 1:
+        batcher = batchers[tuple(a.agent_id for a in authorized)]
+        result, cert, rnd = await batcher.submit(intent.intent_id, request_data)
+    else:
+        result, cert, rnd = await engine.submit_request(intent.intent_id, request_data)
+    # A duplicate that joined another caller's round shares its outcome but must not
+    # count the agents' votes a second time.
+    shared = rnd.cache_hit or intent.intent_id in rnd.coalesced
+    if cert and not shared:
+        engine.remember(rnd, result, cert, cache_ttl)
+    shard_router.record(intent.intent_id, shard_id, rnd.sequence_number if rnd else None, rnd.path if rnd else None)
 
     # Step 5: Sentry — drift detection
     sentry_valid = Sentry.validate_consensus_alignment(intent, result) if result else False
 
-    # Step 6: Registry — record participation
+    # Step 6: Registry — record participation (once per round actually run)
     ts = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    for aid in rnd.agent_results:
+    for aid in ([] if shared else rnd.agent_results):
         registry.record_participation(aid, True, ts)
-    for aid in rnd.agent_errors:
+    for aid in ([] if shared else rnd.agent_errors):
         registry.record_participation(aid, False, ts)
 
     # Step 7: Trust Evaluation & Analytics update
@@ -183,12 +318,15 @@ async def submit_query(req: QueryRequest):
         if len(analytics_data["latency_ms_history"]) > 100:
             analytics_data["latency_ms_history"] = analytics_data["latency_ms_history"][-100:]
             
-        # Update trust scores
-        trust_engine.evaluate_round(
-            cert.decision,
-            rnd.agent_results,
-            latency_ms
-        )
+        # Update trust scores — already done for the round a shared decision came from
+        if not shared:
+            trust_engine.evaluate_round(
+                cert.decision,
+                rnd.agent_results,
+                latency_ms
+            )
+        if rnd.stragglers and not shared:
+            asyncio.create_task(_score_late_votes(rnd, cert.decision, start_time))
 
     # Step 8: Auditor — log everything
     auditor.log_execution(intent, cert, sentry_valid)
@@ -198,11 +336,21 @@ async def submit_query(req: QueryRequest):
         "intent": intent.model_dump(),
         "guardrail_bypassed": guardrail_bypassed,
         "policy": policy_result,
+        "shard": shard_id,
         "consensus": {
             "decision": rnd.consensus_decision,
             "agent_decisions": {aid: r.get("decision") for aid, r in rnd.agent_results.items()},
             "agent_errors": rnd.agent_errors,
             "sequence_number": rnd.sequence_number,
+            "path": rnd.path,
+            "message_stats": rnd.message_stats,
+            "signing_ms": round(rnd.signing_ms, 2),
+            "agent_queries": rnd.agent_queries,
+            "committee": rnd.committee,
+            "escalated": rnd.escalated,
+            "substitutions": rnd.substitutions,
+            "cache_hit": rnd.cache_hit,
+            "coalesced": intent.intent_id in rnd.coalesced,
             "agent_details": {
                 aid: {
                     "decision": r.get("decision"),
@@ -315,6 +463,20 @@ async def get_trust_scores():
 @router.get("/analytics")
 async def get_analytics():
     """Returns system analytics."""
+    hedging = defaultdict(lambda: {"calls": 0, "hedged": 0, "backup_wins": 0})
+    for engine in engines.values():
+        for agent_id, stats in engine.hedge_stats.items():
+            for key, value in stats.items():
+                hedging[agent_id][key] += value
+    for stats in hedging.values():
+        stats["hedge_rate"] = round(stats["hedged"] / stats["calls"], 3) if stats["calls"] else 0.0
+
+    committee = {"rounds": 0, "escalations": 0, "queries_saved": 0}
+    for engine in engines.values():
+        for key, value in engine.committee_stats.items():
+            committee[key] += value
+    committee["escalation_rate"] = round(committee["escalations"] / committee["rounds"], 3) if committee["rounds"] else 0.0
+
     avg_latency = 0
     if analytics_data["latency_ms_history"]:
         avg_latency = sum(analytics_data["latency_ms_history"]) / len(analytics_data["latency_ms_history"])
@@ -325,7 +487,13 @@ async def get_analytics():
         "total_blocked_guardrail": analytics_data["total_blocked_guardrail"],
         "actions_count": dict(analytics_data["actions_count"]),
         "avg_latency_ms": int(avg_latency),
-        "decisions_count": analytics_data["decisions_count"]
+        "decisions_count": analytics_data["decisions_count"],
+        "hedging": dict(hedging),
+        "optimistic_committee": committee,
+        "decision_cache": decision_cache.stats(),
+        "single_flight": {
+            key: sum(engine.flight_stats[key] for engine in engines.values()) for key in ("flights", "coalesced")
+        },
     }
 
 @router.get("/policy")
@@ -346,19 +514,87 @@ async def update_policies(req: PolicyUpdateRequest):
 
 @router.get("/config")
 async def get_config():
-    """Returns current system configuration."""
-    # Assuming consensus_engine is scoped to the query route, we calculate the primary dynamically
-    # For a real system this would be tracked globally. We can track it via the WS events.
-    # To keep the API simple, we'll return the nominal view here (0 unless overridden)
+    """Returns current system configuration and the live state of each consensus engine."""
     return {
         "mode": MODE,
         "f_faults": F_FAULTS,
         "n_agents": N_AGENTS,
         "quorum_size": 2 * F_FAULTS + 1,
         "active_faults": injector.get_active_faults(),
+        "engines": [engine.get_state() for engine in engines.values()],
+    }
+
+
+@router.get("/checkpoints")
+async def get_checkpoints():
+    """Returns the stable checkpoint and per-node message-log sizes of every engine."""
+    return {
+        "checkpoint_interval": CHECKPOINT_INTERVAL,
+        "engines": [
+            {
+                "roster": state["roster"],
+                "low_watermark": state["low_watermark"],
+                "stable_checkpoint": state["stable_checkpoint"],
+                "node_log_sizes": state["node_log_sizes"],
+            }
+            for state in (engine.get_state() for engine in engines.values())
+        ],
+    }
+
+
+@router.get("/rounds")
+async def list_rounds(since: int = 0, limit: int = 50):
+    """Recent rounds with a sequence number above `since`, oldest first, with per-agent detail."""
+    return {
+        "rounds": round_store.since(since, min(max(1, limit), 500)),
+        "store": round_store.stats(),
+    }
+
+
+@router.get("/rounds/{seq}")
+async def get_round(seq: int):
+    """Full audit trail of the round(s) ordered under a sequence number."""
+    rounds = round_store.by_sequence(seq)
+    if not rounds:
+        raise HTTPException(status_code=404, detail=f"No stored round with sequence number {seq}")
+    return {"rounds": rounds}
+
+
+@router.get("/shards")
+async def list_shards():
+    """Every shard's routing rule, roster and engine state (None until its first round)."""
+    def engine_state(roster):
+        engine = engines.get(tuple(roster))
+        return engine.get_state() if engine else None
+
+    stats = shard_router.stats()
+    return {
+        **stats,
+        "shards": [
+            {**s, "engine": engine_state(s["agents"])}
+            for s in [{"id": DEFAULT_SHARD, "agents": [a.agent_id for a in agents]}] + stats["shards"]
+        ],
     }
 
 
+@router.get("/shards/intents/{intent_id}")
+async def get_intent_shard(intent_id: str):
+    """Which shard ordered an intent, and under which of its sequence numbers."""
+    entry = shard_router.lookup(intent_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"No shard recorded for intent {intent_id}")
+    return entry
+
+
+@router.get("/rounds/actions/{action_id}")
+async def get_action_round(action_id: str):
+    """Full audit trail of one request's round, including unordered read-only rounds."""
+    record = round_store.by_action(action_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"No stored round for action {action_id}")
+    return {"round": record}
+
+
 # ── Session Export ────────────────────────────────────────────────
 import csv
 import io
@@ -3,10 +3,15 @@ import sqlite3
 import datetime
 from typing import Dict, Any, Optional
 
+from backend import codec
+
 class Auditor:
     """
     Auditor stores immutable proofs of all AI actions.
     Links Intent -> Gatekeeper -> Sentry -> PBFT Consensus Proof.
+
+    Certificates are stored in the compact binary codec (consensus_cert_bin) and decoded
+    back to the same JSON on read; consensus_cert only holds rows written before that.
     """
     
     def __init__(self, db_path: str = "audit.db"):
@@ -28,17 +33,20 @@ class Auditor:
                     sentry_validation BOOLEAN
                 )
             """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(audit_logs)")}
+            if "consensus_cert_bin" not in columns:
+                conn.execute("ALTER TABLE audit_logs ADD COLUMN consensus_cert_bin BLOB")
             
     def log_execution(self, intent: Any, consensus_cert: Optional[Any], sentry_valid: bool) -> int:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cert_json = json.dumps(consensus_cert.to_dict()) if consensus_cert else None
+            cert_bin = consensus_cert.to_bytes() if consensus_cert else None
             is_reached = consensus_cert is not None
             
             cursor.execute("""
                 INSERT INTO audit_logs (
                     intent_id, timestamp, risk_level, action_type, target, 
-                    consensus_reached, consensus_cert, sentry_validation
+                    consensus_reached, consensus_cert_bin, sentry_validation
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 getattr(intent, "intent_id", "UNKNOWN"),
@@ -47,7 +55,7 @@ class Auditor:
                 getattr(intent, "action_type", "UNKNOWN"),
                 getattr(intent, "target", "UNKNOWN"),
                 is_reached,
-                cert_json,
+                cert_bin,
                 sentry_valid
             ))
             return cursor.lastrowid
@@ -57,4 +65,12 @@ class Auditor:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM audit_logs ORDER BY timestamp DESC LIMIT ?", (limit,))
-            return [dict(row) for row in cursor.fetchall()]
+            return [self._decode_row(dict(row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _decode_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Presents the binary certificate as the JSON text the API has always returned."""
+        blob = row.pop("consensus_cert_bin", None)
+        if blob is not None:
+            row["consensus_cert"] = json.dumps(codec.decode(blob))
+        return row
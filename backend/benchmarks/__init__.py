@@ -0,0 +1 @@
+# Micro-benchmarks for the consensus hot path (run each with python -m)
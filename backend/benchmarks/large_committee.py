@@ -0,0 +1,56 @@
+"""
+CPU cost of a consensus round as the roster grows, with and without committee sampling.
+
+    python -m backend.benchmarks.large_committee [--sizes 4,13,31,100] [--rounds 20] [--sample 4]
+
+Agents answer instantly, so what is measured is the engine itself: Phase 0 tallying,
+signing and verifying every Prepare/Commit, and the certificate. Times are process CPU
+time per round. Without sampling every agent votes and every node checks O(n) messages
+(O(n²) signatures per round); with sampling only the committee does, and what is left
+growing with n is delivering the committee's commits to the non-members.
+"""
+
+import time
+import asyncio
+import logging
+import argparse
+from typing import Any, Dict
+
+from backend.agents.simulated_agent import SimulatedAgent
+from backend.consensus.engine import ConsensusEngine
+
+REQUEST = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+
+
+class InstantAgent(SimulatedAgent):
+    async def decide_async(self, action_id: str, user_request: Dict[str, Any]) -> Dict[str, Any]:
+        result = {"action_id": action_id, "decision": "APPROVE", "reason_code": "SAFE", "confidence": 0.99}
+        return self.validate_decision(action_id, result)
+
+
+async def cpu_ms_per_round(n: int, sample_size: int, rounds: int) -> float:
+    engine = ConsensusEngine([InstantAgent(f"agent_{i}") for i in range(n)], f=1, sample_size=sample_size)
+    await engine.submit_request("warmup", REQUEST)
+    start = time.process_time()
+    for i in range(rounds):
+        await engine.submit_request(f"action_{i}", dict(REQUEST, target=str(i)))
+    return (time.process_time() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="4,13,31,100")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--sample", type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'n':>5} {'full roster':>14} {f'sampled ({args.sample})':>14}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        full = asyncio.run(cpu_ms_per_round(n, 0, args.rounds))
+        sampled = asyncio.run(cpu_ms_per_round(n, args.sample if n > args.sample else 0, args.rounds))
+        print(f"{n:>5} {full:>11.1f} ms {sampled:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+PBFT vs HotStuff-style ordering: messages, signatures and latency per round.
+
+    python -m backend.benchmarks.protocols [--sizes 4,7,13,31] [--rounds 20]
+
+Each roster runs with the largest f it tolerates (n = 3f+1) and agents that answer
+instantly, so latency is the engine's own: Phases 1-3 and the certificate. "messages" is
+every message a node received (ConsensusRound.message_stats["deliveries"]), "signatures"
+every phase message signed; latency is wall time per round, CPU is process time.
+"""
+
+import time
+import asyncio
+import logging
+import argparse
+from typing import Dict
+
+from backend.benchmarks.large_committee import InstantAgent, REQUEST
+from backend.consensus.engine import ConsensusEngine
+from backend.consensus.protocol import PROTOCOLS
+
+
+async def per_round(n: int, protocol: str, rounds: int) -> Dict[str, float]:
+    engine = ConsensusEngine(
+        [InstantAgent(f"agent_{i}") for i in range(n)], f=(n - 1) // 3, protocol=protocol,
+    )
+    await engine.submit_request("warmup", REQUEST)
+    messages = signatures = 0
+    wall, cpu = time.perf_counter(), time.process_time()
+    for i in range(rounds):
+        _, cert, rnd = await engine.submit_request(f"action_{i}", dict(REQUEST, target=str(i)))
+        assert cert is not None
+        messages += rnd.message_stats["deliveries"]
+        signatures += rnd.message_stats["signatures"]
+    return {
+        "messages": messages / rounds,
+        "signatures": signatures / rounds,
+        "latency_ms": (time.perf_counter() - wall) / rounds * 1000,
+        "cpu_ms": (time.process_time() - cpu) / rounds * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="4,7,13,31")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'n':>4} {'protocol':>9} {'messages':>9} {'signatures':>11} {'latency':>11} {'cpu':>11}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        for protocol in PROTOCOLS:
+            r = asyncio.run(per_round(n, protocol, args.rounds))
+            print(
+                f"{n:>4} {protocol:>9} {r['messages']:>9.0f} {r['signatures']:>11.0f} "
+                f"{r['latency_ms']:>8.1f} ms {r['cpu_ms']:>8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+ByzantineMind — local replica cluster launcher
+
+Starts an n = 3f+1 cluster on localhost: one PBFT replica process per agent slot plus
+(optionally) the API server wired to them.
+
+Run with:
+    python -m backend.cluster                      # TCP replicas on 127.0.0.1:9101..
+    python -m backend.cluster --unix /tmp/bm       # Unix-socket replicas
+    python -m backend.cluster --with-api           # also start uvicorn on :8000
+
+Without --with-api it prints the CLUSTER_PEERS / CLUSTER_KEYS_FILE settings to export
+before starting the API yourself. Ctrl+C stops every process.
+
+With STATE_SNAPSHOT_PATH set, replica seeds come from (and are kept in) the state store, so
+certificates issued before a restart still verify; otherwise every launch has new keys.
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from typing import Dict, List
+
+from backend.config import F_FAULTS, STATE_SNAPSHOT_PATH
+from backend.consensus.replica import write_cluster_keys
+from backend.consensus.state_store import StateStore
+
+
+def replica_addresses(agent_ids: List[str], host: str, base_port: int, unix_dir: str = "") -> Dict[str, str]:
+    if unix_dir:
+        return {aid: f"unix:{os.path.join(unix_dir, aid + '.sock')}" for aid in agent_ids}
+    return {aid: f"{host}:{base_port + i}" for i, aid in enumerate(agent_ids, start=1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Launch a local ByzantineMind replica cluster")
+    parser.add_argument("--f", type=int, default=F_FAULTS, help="tolerated faults (n = 3f+1 replicas)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=9100)
+    parser.add_argument("--unix", default="", help="directory for Unix sockets instead of TCP")
+    parser.add_argument("--keys", default="cluster_keys.json", help="where to write the replica key file")
+    parser.add_argument("--with-api", action="store_true", help="also run the API server against the cluster")
+    parser.add_argument("--api-port", type=int, default=8000)
+    args = parser.parse_args()
+
+    n = 3 * args.f + 1
+    agent_ids = [f"agent_{i}" for i in range(1, n + 1)]
+    if args.unix:
+        os.makedirs(args.unix, exist_ok=True)
+        for aid in agent_ids:
+            path = os.path.join(args.unix, aid + ".sock")
+            if os.path.exists(path):
+                os.unlink(path)
+    addresses = replica_addresses(agent_ids, args.host, args.base_port, args.unix)
+    write_cluster_keys(args.keys, agent_ids, StateStore().seeds(agent_ids) if STATE_SNAPSHOT_PATH else None)
+
+    env = dict(os.environ)
+    env.update({
+        "F_FAULTS": str(args.f),
+        "CLUSTER_PEERS": ",".join(f"{aid}={addr}" for aid, addr in addresses.items()),
+        "CLUSTER_KEYS_FILE": os.path.abspath(args.keys),
+    })
+
+    procs: List[subprocess.Popen] = []
+    try:
+        for aid, addr in addresses.items():
+            procs.append(subprocess.Popen(
+                [sys.executable, "-m", "backend.consensus.replica",
+                 "--agent-id", aid, "--listen", addr, "--keys", args.keys, "--f", str(args.f)],
+                env=env,
+            ))
+            print(f"  {aid:<9} pid={procs[-1].pid:<7} {addr}")
+
+        if args.with_api:
+            procs.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(args.api_port)],
+                env=env,
+            ))
+            print(f"  api       pid={procs[-1].pid:<7} http://127.0.0.1:{args.api_port}")
+        else:
+            print("\nExport these before starting the API:")
+            for key in ("F_FAULTS", "CLUSTER_PEERS", "CLUSTER_KEYS_FILE"):
+                print(f"  {key}={env[key]}")
+
+        while all(p.poll() is None for p in procs):
+            time.sleep(0.5)
+        print("A cluster process exited — shutting down")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for p in procs:
+            if p.poll() is None:
+                p.terminate()
+        for p in procs:
+            try:
+                p.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+
+if __name__ == "__main__":
+    main()
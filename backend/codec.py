@@ -0,0 +1,160 @@
+"""
+Compact deterministic binary encoding (a canonical subset of CBOR, RFC 8949).
+
+Used for PBFT messages, certificates and audit storage where canonical JSON is bulky:
+
+- integers, text, arrays, maps, booleans, null and float64 — nothing else
+- shortest-form lengths and integers; map keys sorted bytewise on their encoding, so
+  equal values always produce identical bytes
+- lowercase hex strings of HEX_MIN_LEN+ characters (signatures, SHA-256 digests) are stored
+  as raw bytes under tag 23 ("expected conversion to base16"); a 128-char signature costs
+  66 bytes instead of 130, and decoding turns it back into the same hex string
+
+decode(encode(x)) == x for every JSON-compatible value, so the API keeps serving JSON.
+"""
+
+import struct
+from typing import Any, Tuple
+
+HEX_MIN_LEN = 16
+_HEX_CHARS = frozenset("0123456789abcdef")
+_TAG_BASE16 = 23
+
+
+class CodecError(ValueError):
+    """Raised for values that cannot be encoded or bytes that are not valid encodings."""
+
+
+def _head(major: int, value: int) -> bytes:
+    if value < 24:
+        return bytes([major << 5 | value])
+    if value < 0x100:
+        return bytes([major << 5 | 24, value])
+    if value < 0x10000:
+        return bytes([major << 5 | 25]) + value.to_bytes(2, "big")
+    if value < 0x100000000:
+        return bytes([major << 5 | 26]) + value.to_bytes(4, "big")
+    if value < 0x10000000000000000:
+        return bytes([major << 5 | 27]) + value.to_bytes(8, "big")
+    raise CodecError(f"Integer out of range: {value}")
+
+
+def _is_hex(s: str) -> bool:
+    return len(s) >= HEX_MIN_LEN and len(s) % 2 == 0 and _HEX_CHARS.issuperset(s)
+
+
+def _encode(value: Any, out: bytearray):
+    if value is None:
+        out.append(0xF6)
+    elif value is True:
+        out.append(0xF5)
+    elif value is False:
+        out.append(0xF4)
+    elif isinstance(value, int):
+        out += _head(0, value) if value >= 0 else _head(1, -1 - value)
+    elif isinstance(value, float):
+        out += b"\xfb" + struct.pack(">d", value)
+    elif isinstance(value, str):
+        if _is_hex(value):
+            raw = bytes.fromhex(value)
+            out += _head(6, _TAG_BASE16) + _head(2, len(raw)) + raw
+        else:
+            data = value.encode()
+            out += _head(3, len(data)) + data
+    elif isinstance(value, (bytes, bytearray)):
+        out += _head(2, len(value)) + bytes(value)
+    elif isinstance(value, (list, tuple)):
+        out += _head(4, len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        items = []
+        for k, v in value.items():
+            if not isinstance(k, str):
+                raise CodecError(f"Map keys must be strings, got {type(k).__name__}")
+            key = bytearray()
+            _encode(k, key)
+            items.append((bytes(key), v))
+        items.sort(key=lambda kv: kv[0])
+        out += _head(5, len(items))
+        for key, v in items:
+            out += key
+            _encode(v, out)
+    else:
+        raise CodecError(f"Cannot encode {type(value).__name__}")
+
+
+def encode(value: Any) -> bytes:
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def _read_arg(data: bytes, pos: int, info: int) -> Tuple[int, int]:
+    if info < 24:
+        return info, pos
+    size = {24: 1, 25: 2, 26: 4, 27: 8}.get(info)
+    if size is None or pos + size > len(data):
+        raise CodecError(f"Bad length encoding at offset {pos}")
+    return int.from_bytes(data[pos:pos + size], "big"), pos + size
+
+
+def _take(data: bytes, pos: int, n: int) -> Tuple[bytes, int]:
+    if pos + n > len(data):
+        raise CodecError("Truncated input")
+    return data[pos:pos + n], pos + n
+
+
+def _decode(data: bytes, pos: int) -> Tuple[Any, int]:
+    if pos >= len(data):
+        raise CodecError("Truncated input")
+    initial = data[pos]
+    major, info = initial >> 5, initial & 0x1F
+    pos += 1
+    if major == 7:
+        if info == 20:
+            return False, pos
+        if info == 21:
+            return True, pos
+        if info == 22:
+            return None, pos
+        if info == 27:
+            raw, pos = _take(data, pos, 8)
+            return struct.unpack(">d", raw)[0], pos
+        raise CodecError(f"Unsupported simple value {info}")
+
+    arg, pos = _read_arg(data, pos, info)
+    if major == 0:
+        return arg, pos
+    if major == 1:
+        return -1 - arg, pos
+    if major == 2:
+        return _take(data, pos, arg)
+    if major == 3:
+        raw, pos = _take(data, pos, arg)
+        return raw.decode(), pos
+    if major == 4:
+        items = []
+        for _ in range(arg):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return items, pos
+    if major == 5:
+        result = {}
+        for _ in range(arg):
+            key, pos = _decode(data, pos)
+            result[key], pos = _decode(data, pos)
+        return result, pos
+    if major == 6 and arg == _TAG_BASE16:
+        raw, pos = _decode(data, pos)
+        if not isinstance(raw, bytes):
+            raise CodecError("Tag 23 must wrap a byte string")
+        return raw.hex(), pos
+    raise CodecError(f"Unsupported major type {major} (tag {arg})")
+
+
+def decode(data: bytes) -> Any:
+    value, pos = _decode(bytes(data), 0)
+    if pos != len(data):
+        raise CodecError(f"{len(data) - pos} trailing bytes")
+    return value
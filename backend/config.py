@@ -20,6 +20,115 @@ N_AGENTS = 3 * F_FAULTS + 1
 # PBFT timeout (seconds) — increased for real API latency
 CONSENSUS_TIMEOUT_SEC = float(os.getenv("CONSENSUS_TIMEOUT_SEC", "30.0"))
 
+# Adaptive per-agent timeouts — once an agent has a latency history its Phase 0 timeout
+# becomes p99 × ADAPTIVE_TIMEOUT_FACTOR, clamped to [ADAPTIVE_TIMEOUT_MIN_SEC, CONSENSUS_TIMEOUT_SEC].
+ADAPTIVE_TIMEOUT_FACTOR = float(os.getenv("ADAPTIVE_TIMEOUT_FACTOR", "2.0"))
+ADAPTIVE_TIMEOUT_MIN_SEC = float(os.getenv("ADAPTIVE_TIMEOUT_MIN_SEC", "2.0"))
+
+# View-change pause — doubles on every consecutive view change, capped at the max
+VIEW_CHANGE_BASE_SEC = float(os.getenv("VIEW_CHANGE_BASE_SEC", "0.5"))
+VIEW_CHANGE_MAX_SEC = float(os.getenv("VIEW_CHANGE_MAX_SEC", "8.0"))
+
+# Consensus protocol for in-process nodes (backend/consensus/protocol.py): "pbft" exchanges
+# Prepare/Commit all-to-all (O(n²) messages), "hotstuff" has the leader collect the votes
+# and forward them as quorum certificates (O(n) messages). Replica clusters run PBFT.
+CONSENSUS_PROTOCOL = os.getenv("CONSENSUS_PROTOCOL", "pbft").lower()
+
+# Early quorum — move to Pre-Prepare as soon as 2f+1 agents agree instead of
+# waiting for the slowest provider. Stragglers keep running in the background.
+EARLY_QUORUM = os.getenv("EARLY_QUORUM", "false").lower() == "true"
+
+# Hedged requests — if an agent slot has not answered by its observed HEDGE_QUANTILE
+# latency, the same prompt goes to that slot's backup model and the first answer wins.
+# HEDGE_BACKUP_MODELS maps slots to backups, e.g. "agent_4:qwen2,agent_5:mistral"
+# (keys of OpenRouterAgent.RECOMMENDED_MODELS or raw OpenRouter model ids).
+HEDGE_QUANTILE = float(os.getenv("HEDGE_QUANTILE", "0.95"))
+HEDGE_BACKUP_MODELS = os.getenv("HEDGE_BACKUP_MODELS", "")
+
+# Hot spares — agents beyond the roster that stand in, for one round, for a roster agent
+# that failed in Phase 0, so a single-vendor outage does not cost a view change. Spares
+# sign with their own identity and the swap is recorded in the certificate.
+# SPARE_AGENTS lists "provider:model" entries (openrouter, cerebras, groq, gemini, mistral),
+# e.g. "openrouter:phi4,cerebras:llama3.1-8b"; a bare model is an OpenRouter model.
+SPARE_AGENTS = os.getenv("SPARE_AGENTS", "")
+
+# Shards — independent committees, each with its own roster, engine, sequence numbers and
+# certificates. SHARDS_FILE is a YAML file listing shards (id, a "target" regex and/or the
+# PolicyEngine "policy" id it takes, its "agents" as SPARE_AGENTS-style "provider:model"
+# entries, optional "f"); the first matching shard takes an intent and everything else runs
+# on the main roster. Empty = one committee. SHARD_INDEX_SIZE bounds the intent -> shard index.
+SHARDS_FILE = os.getenv("SHARDS_FILE", "")
+SHARD_INDEX_SIZE = int(os.getenv("SHARD_INDEX_SIZE", "100000"))
+
+# Optimistic committee — Phase 0 first asks only the primary plus the best-ranked agents
+# (trust score, reliability, latency) to make up 2f+1, and escalates to everyone else only
+# if that committee disagrees or someone fails to answer.
+OPTIMISTIC_COMMITTEE = os.getenv("OPTIMISTIC_COMMITTEE", "false").lower() == "true"
+
+# Sampled committees — for large rosters, each round is run by COMMITTEE_SAMPLE_SIZE agents
+# (at least 3f+1) drawn verifiably from the roster; 0 lets every agent take part.
+COMMITTEE_SAMPLE_SIZE = int(os.getenv("COMMITTEE_SAMPLE_SIZE", "0"))
+
+# Read-only lane — LOW-risk requests (READ, GET, PING, HEALTHCHECK, LIST) skip the
+# three-phase exchange: 2f+1 matching signed Phase 0 votes form a single-phase "READ"
+# certificate, with no sequence number, Pre-Prepare, Commit or view change.
+READ_ONLY_LANE = os.getenv("READ_ONLY_LANE", "false").lower() == "true"
+
+# Decision cache — identical requests reuse the committed result and certificate.
+# DECISION_CACHE_TTLS gives the lifetime per risk level in seconds (0 or missing = never
+# cached), e.g. "LOW:300"; empty disables the cache. DECISION_CACHE_DB enables a persistent
+# SQLite tier.
+DECISION_CACHE_TTLS = os.getenv("DECISION_CACHE_TTLS", "")
+DECISION_CACHE_SIZE = int(os.getenv("DECISION_CACHE_SIZE", "1024"))
+DECISION_CACHE_DB = os.getenv("DECISION_CACHE_DB", "")
+
+# Round store — recent rounds' full audit trail (per-agent results, latencies, messages)
+# kept in memory up to ROUND_STORE_SIZE rounds / ROUND_STORE_MAX_BYTES, older ones spill
+# to the ROUND_STORE_DB SQLite file (empty = dropped). Served by /api/rounds.
+ROUND_STORE_SIZE = int(os.getenv("ROUND_STORE_SIZE", "256"))
+ROUND_STORE_MAX_BYTES = int(os.getenv("ROUND_STORE_MAX_BYTES", str(4 * 1024 * 1024)))
+ROUND_STORE_DB = os.getenv("ROUND_STORE_DB", "")
+
+# Durable state — with STATE_SNAPSHOT_PATH set, every engine's sequence/view numbers, stable
+# checkpoint and node state, plus the agents' signing keys (encrypted with STATE_SNAPSHOT_KEY,
+# 64 hex chars, or a generated "<path>.key" file), survive restarts.
+STATE_SNAPSHOT_PATH = os.getenv("STATE_SNAPSHOT_PATH", "")
+STATE_SNAPSHOT_KEY = os.getenv("STATE_SNAPSHOT_KEY", "")
+
+# Speculative fast path — when all 3f+1 agents return the same decision, skip
+# Pre-Prepare/Prepare/Commit and issue a single-phase "FAST" certificate
+SPECULATIVE_FAST_PATH = os.getenv("SPECULATIVE_FAST_PATH", "false").lower() == "true"
+
+# Request batching — the primary orders up to BATCH_MAX_SIZE pending requests under one
+# sequence number, waiting at most BATCH_LINGER_MS for a batch to fill. 1 disables batching.
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "1"))
+BATCH_LINGER_MS = float(os.getenv("BATCH_LINGER_MS", "20"))
+
+# Watermark window — how many sequence numbers a long-lived engine may have in flight
+# at once (PBFT's H - h). Later rounds wait until the low watermark advances.
+WATERMARK_WINDOW = int(os.getenv("WATERMARK_WINDOW", "16"))
+
+# Checkpoint interval (PBFT's K) — nodes checkpoint every K finished sequences and
+# garbage-collect their message logs below the latest stable checkpoint.
+CHECKPOINT_INTERVAL = int(os.getenv("CHECKPOINT_INTERVAL", "8"))
+
+# Signature verification — every PBFT node verifies incoming messages; results are cached
+# in an LRU of SIGNATURE_CACHE_SIZE entries and large batches use VERIFY_WORKERS threads.
+SIGNATURE_CACHE_SIZE = int(os.getenv("SIGNATURE_CACHE_SIZE", "4096"))
+VERIFY_WORKERS = int(os.getenv("VERIFY_WORKERS", "4"))
+
+# Signing — Ed25519 signatures (certificate quorums, PBFT phase messages) are produced on a
+# pool of SIGNING_WORKERS threads instead of the asyncio event loop.
+SIGNING_WORKERS = int(os.getenv("SIGNING_WORKERS", "4"))
+
+# Replica cluster — when set, each PBFTNode runs in its own process (see backend/cluster.py)
+# and the engine exchanges signed messages with them over length-prefixed socket frames.
+# CLUSTER_PEERS: "agent_1=127.0.0.1:9101,agent_2=unix:/tmp/bm/agent_2.sock,..."
+# CLUSTER_KEYS_FILE: JSON written by the launcher with each replica's Ed25519 seed.
+CLUSTER_PEERS = os.getenv("CLUSTER_PEERS", "")
+CLUSTER_KEYS_FILE = os.getenv("CLUSTER_KEYS_FILE", "")
+CLUSTER_RPC_TIMEOUT_SEC = float(os.getenv("CLUSTER_RPC_TIMEOUT_SEC", "5.0"))
+
 # Agent model IDs (for HFAgent / display purposes)
 AGENT_MODELS = {
     "agent_1": os.getenv("AGENT_1_MODEL", "mistralai/Mistral-7B-Instruct-v0.2"),
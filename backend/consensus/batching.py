@@ -0,0 +1,74 @@
+"""
+RequestBatcher — collects concurrent requests and hands them to the engine as one batch.
+
+A batch is flushed when it reaches max_batch_size or when the oldest pending request has
+waited max_linger_sec, whichever comes first. Each caller awaits its own
+(consensus_result, certificate, round_data) tuple, exactly as with submit_request, and
+identical concurrent requests are coalesced by the engine before they reach a batch.
+Requests for the engine's read-only lane are never ordered, so they bypass the batch.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, List, Tuple, Optional
+
+from backend.config import BATCH_MAX_SIZE, BATCH_LINGER_MS
+
+logger = logging.getLogger("byzantinemind.batching")
+
+
+class RequestBatcher:
+    def __init__(self, engine, max_batch_size: int = BATCH_MAX_SIZE, max_linger_sec: float = BATCH_LINGER_MS / 1000):
+        self.engine = engine
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_linger_sec = max_linger_sec
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._linger_task: Optional[asyncio.Task] = None
+
+    async def submit(self, action_id: str, request: Dict[str, Any]):
+        """Queue a request for the next batch and wait for its outcome."""
+        if self.engine.is_read_only(request):
+            return await self.engine.submit_request(action_id, request)
+        return await self.engine.coalesce(action_id, request, lambda: self._enqueue(action_id, request))
+
+    async def _enqueue(self, action_id: str, request: Dict[str, Any]):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((action_id, request, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            if self._linger_task:
+                self._linger_task.cancel()
+                self._linger_task = None
+            loop.create_task(self._flush())
+        elif self._linger_task is None:
+            self._linger_task = loop.create_task(self._linger())
+
+        return await future
+
+    async def _linger(self):
+        await asyncio.sleep(self.max_linger_sec)
+        self._linger_task = None
+        await self._flush()
+
+    async def _flush(self):
+        items, self._pending = self._pending, []
+        if not items:
+            return
+
+        logger.info(f"Flushing batch of {len(items)} request(s)")
+        try:
+            if len(items) == 1:
+                action_id, request, _ = items[0]
+                outcomes = [await self.engine.order_request(action_id, request)]
+            else:
+                outcomes = await self.engine.submit_batch([(a, r) for a, r, _ in items])
+        except Exception as e:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), outcome in zip(items, outcomes):
+            if not future.done():
+                future.set_result(outcome)
@@ -0,0 +1,130 @@
+"""
+InProcessBroadcast — message fan-out between PBFTNodes living in the same process.
+
+Each message is signed (and therefore serialized) exactly once by its sender and the same
+object is handed to every node. Nodes emit at most one Prepare and one Commit per
+(view, seq), so a round costs O(n) signatures instead of one Commit per received Prepare.
+
+The broadcast also keeps per-round traffic counters, exposed as ConsensusRound.message_stats.
+Its methods are coroutines so the engine drives it exactly like network.RemoteBroadcast.
+Each phase's messages are batch-verified per node before delivery. Given a SigningService,
+the nodes process each phase concurrently on its thread pool instead of the event loop.
+
+For a sampled committee only its members (`members`) receive the Pre-Prepare and prepare;
+their Commits still reach every node, so the rest learn the outcome and keep executing the
+same log (and agreeing on checkpoints) at O(n) rather than O(n²) cost.
+"""
+
+import asyncio
+from typing import Dict, Any, List, Callable, Collection, Optional, TypeVar
+
+from backend.consensus.messages import PBFTMessage, PrePrepare, Prepare, Commit, ViewChange, signing_payload
+from backend.consensus.pbft_node import PBFTNode
+from backend.crypto.signer import SigningService
+
+T = TypeVar("T")
+
+
+class InProcessBroadcast:
+    def __init__(
+        self,
+        nodes: Dict[str, PBFTNode],
+        signer: Optional[SigningService] = None,
+        members: Optional[List[str]] = None,
+    ):
+        self.nodes = nodes
+        self.signer = signer
+        self.members = set(members) if members is not None else None
+        self.stats: Dict[str, int] = {
+            "pre_prepare": 0,
+            "prepare": 0,
+            "commit": 0,
+            "deliveries": 0,
+            "signatures": 0,
+        }
+
+    def _sent(self, kind: str, count: int = 1):
+        self.stats[kind] += count
+        self.stats["signatures"] += count
+
+    async def _on_nodes(self, work: Callable[[str, PBFTNode], T], agent_ids: Optional[Collection[str]] = None) -> List[T]:
+        """
+        Runs work(agent_id, node) for every node (or just agent_ids), each under its node's
+        lock. With a signer the nodes run concurrently on its thread pool, so their
+        signing and verification stay off the event loop.
+        """
+        def locked(agent_id: str, node: PBFTNode) -> T:
+            with node.lock:
+                return work(agent_id, node)
+
+        targets = [(aid, node) for aid, node in self.nodes.items() if agent_ids is None or aid in agent_ids]
+        if self.signer is None:
+            return [locked(aid, node) for aid, node in targets]
+        return list(await asyncio.gather(*(self.signer.run(locked, aid, node) for aid, node in targets)))
+
+    async def _preverify(self, msgs: List[PBFTMessage]):
+        """Verifies a phase's messages once per distinct verifier before the nodes run, so
+        concurrently running nodes all hit the shared signature cache."""
+        verifiers = {id(node.verifier): node.verifier for node in self.nodes.values()}
+        items = [(m.agent_id, signing_payload(m), m.signature) for m in msgs]
+        for verifier in verifiers.values():
+            if self.signer is None:
+                verifier.verify_many(items)
+            else:
+                await self.signer.run(verifier.verify_many, items)
+
+    async def pre_prepare(self, msg: PrePrepare) -> List[Prepare]:
+        """Delivers the primary's Pre-Prepare; returns the Prepare each node emits."""
+        self._sent("pre_prepare")
+        self.stats["deliveries"] += len(self.nodes) if self.members is None else len(self.members)
+        await self._preverify([msg])
+        prepares = [p for p in await self._on_nodes(lambda aid, node: node.on_pre_prepare(msg), self.members) if p]
+        self._sent("prepare", len(prepares))
+        return prepares
+
+    async def prepare(
+        self,
+        prepares: List[Prepare],
+        node_results: Dict[str, Dict[str, Any]],
+        result_hashes: Optional[Dict[str, str]] = None,
+    ) -> List[Commit]:
+        """Delivers every Prepare to every node holding a result; returns the Commits emitted.
+        result_hashes (agent_id -> hash of its result) spares the nodes re-hashing them."""
+        hashes = result_hashes or {}
+
+        def deliver(agent_id: str, node: PBFTNode) -> List[Commit]:
+            result, result_hash = node_results[agent_id], hashes.get(agent_id)
+            return [c for c in (node.on_prepare(p, result, result_hash) for p in node.verify_batch(prepares)) if c]
+
+        targets = {aid for aid in self.nodes if aid in node_results}
+        self.stats["deliveries"] += len(prepares) * len(targets)
+        await self._preverify(prepares)
+        commits = [c for emitted in await self._on_nodes(deliver, targets) for c in emitted]
+        self._sent("commit", len(commits))
+        return commits
+
+    async def commit(self, commits: List[Commit]) -> bool:
+        """Delivers every Commit to every node; True if any node reached the commit quorum."""
+        def deliver(agent_id: str, node: PBFTNode) -> bool:
+            return any([node.on_commit(c) for c in node.verify_batch(commits)])
+
+        self.stats["deliveries"] += len(commits) * len(self.nodes)
+        await self._preverify(commits)
+        return any(await self._on_nodes(deliver))
+
+    async def view_change(self, new_view: int) -> List[ViewChange]:
+        """Moves every node to new_view; returns their signed ViewChange messages."""
+        return await self._on_nodes(lambda aid, node: node.on_view_change(new_view))
+
+    async def checkpoint(self, seq: int) -> List[Dict[str, Any]]:
+        """Every node signs its state digest at seq and receives everyone's checkpoint.
+        Returns each node's stable checkpoint afterwards."""
+        checkpoints = await self._on_nodes(lambda aid, node: node.make_checkpoint(seq))
+        await self._preverify(checkpoints)
+
+        def deliver(agent_id: str, node: PBFTNode) -> Dict[str, Any]:
+            for cp in node.verify_batch(checkpoints):
+                node.on_checkpoint(cp)
+            return dict(node.stable_checkpoint)
+
+        return await self._on_nodes(deliver)
@@ -0,0 +1,136 @@
+"""
+DecisionCache — reuse committed decisions for identical requests.
+
+Entries are keyed by the round's request_hash, the engine's roster and a version string
+(policies + agent prompt), so editing a policy or the prompt invalidates everything cached
+under the old one. Each entry keeps the original result and certificate; a hit returns
+them unchanged and the round is marked cache_hit.
+
+- TTLs are chosen per risk level by the caller (0 = never cache)
+- In-memory LRU bounded by max_entries; evictions are counted
+- Optional SQLite tier (db_path): entries are written through in the binary codec and
+  read back on a memory miss, so they survive restarts
+"""
+
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from backend import codec
+from backend.config import DECISION_CACHE_SIZE, DECISION_CACHE_DB
+from backend.utils import sha256
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """Parses "LOW:300,MEDIUM:60,HIGH:0" into {risk_level: seconds}."""
+    ttls = {}
+    for entry in filter(None, (e.strip() for e in spec.split(","))):
+        level, _, seconds = entry.partition(":")
+        ttls[level.strip().upper()] = float(seconds)
+    return ttls
+
+
+class DecisionCache:
+    def __init__(
+        self,
+        max_entries: int = DECISION_CACHE_SIZE,
+        db_path: str = DECISION_CACHE_DB,
+        version: Callable[[], str] = lambda: "",
+    ):
+        self.max_entries = max(1, max_entries)
+        self.db_path = db_path
+        self.version = version
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if db_path:
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS decision_cache (
+                        key TEXT PRIMARY KEY,
+                        expires_at REAL,
+                        entry BLOB
+                    )
+                """)
+
+    def key(self, request_hash: str, scope: str) -> str:
+        return sha256(f"{request_hash}:{scope}:{self.version()}")
+
+    def _load(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if not self.db_path:
+            return None
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT expires_at, entry FROM decision_cache WHERE key = ?", (key,)).fetchone()
+        return (row[0], codec.decode(row[1])) if row else None
+
+    def _delete(self, key: str):
+        if self.db_path:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("DELETE FROM decision_cache WHERE key = ?", (key,))
+
+    def get(self, request_hash: str, scope: str) -> Optional[Dict[str, Any]]:
+        """The cached entry for this request, or None if absent or expired."""
+        key = self.key(request_hash, scope)
+        with self._lock:
+            found = self._entries.get(key)
+        if found is None:
+            found = self._load(key)
+        if found is not None and found[0] <= time.time():
+            with self._lock:
+                self._entries.pop(key, None)
+                self.expirations += 1
+            self._delete(key)
+            found = None
+        with self._lock:
+            if found is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, found)
+        return found[1]
+
+    def _remember(self, key: str, value: Tuple[float, Dict[str, Any]]):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def put(self, request_hash: str, scope: str, entry: Dict[str, Any], ttl: float):
+        if ttl <= 0:
+            return
+        key = self.key(request_hash, scope)
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, (expires_at, entry))
+        if self.db_path:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO decision_cache (key, expires_at, entry) VALUES (?, ?, ?)",
+                    (key, expires_at, codec.encode(entry)),
+                )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("DELETE FROM decision_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "capacity": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "persistent": bool(self.db_path),
+        }
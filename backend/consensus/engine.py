@@ -5,6 +5,31 @@ Production design:
 - Handles both APPROVE and REJECT consensus (majority decision wins)
 - Returns a cryptographic certificate for ANY consensus outcome
 - Gracefully handles agent failures without crashing the round
+- Optional early quorum: proceeds once 2f+1 agents agree, stragglers finish in the background
+- Request batching: several requests share one sequence number under a Merkle root
+- Long-lived: rounds pipeline concurrently inside a low/high watermark window and
+  view state persists across requests
+- Periodic stable checkpoints let every PBFTNode truncate its message logs
+- Optional durable state (StateStore): sequence/view, stable checkpoint and node state are
+  snapshotted and restored on restart; lagging nodes catch up by state transfer
+- View changes keep every signed Phase 0 vote and only re-query agents that failed
+- Per-agent timeouts adapt to observed latency; view-change pauses back off exponentially
+- Optional speculative fast path: a unanimous 3f+1 vote yields a single-phase certificate
+- Optional read-only lane: read-only requests are answered by 2f+1 matching signed votes,
+  unordered and without Pre-Prepare/Commit or view changes; PBFT is the fallback
+- Optional optimistic committee: ask the best-ranked 2f+1 agents first, escalate on dissent
+- Optional decision cache: identical requests reuse the original result and certificate
+- Single-flight: concurrent identical requests share one round and one certificate
+- Optional round store: every finished round's audit trail is kept for /api/rounds
+- Large rosters: array-backed vote tallies, bitmap quorums in the nodes and optional
+  verifiably sampled per-round committees
+- Hedged requests: a slot that is slower than its observed p95 is raced against a backup model
+- Hot spares: an agent that failed in Phase 0 is replaced for the round by a spare with its
+  own identity when the round would otherwise need a view change; the swap is certified
+- Nodes run in-process or as separate replica processes reached over sockets (ReplicaCluster)
+- Pluggable exchange for Phases 1-3 (protocol.py): all-to-all PBFT or HotStuff-style
+  leader-collected quorum certificates
+- Ed25519 signing (phase messages, certificate quorums) runs on a thread pool, not the loop
 - Event hooks for real-time WebSocket streaming
 - Structured logging for every phase transition
 """
@@ -12,18 +37,34 @@ Production design:
 import asyncio
 import logging
 import datetime
-from typing import List, Dict, Any, Tuple, Optional, Callable
-from collections import Counter
+from typing import List, Dict, Any, Tuple, Optional, Callable, Collection, Awaitable, TypeVar
 
 from backend.consensus.pbft_node import PBFTNode
-from backend.consensus.messages import PrePrepare, Prepare, Commit
-from backend.crypto.certificate import ConsensusCertificate
+from backend.consensus.messages import PrePrepare, Prepare, Commit, signing_payload, message_fields
+from backend.consensus.broadcast import InProcessBroadcast
+from backend.consensus.protocol import OrderingProtocol, ProtocolFactory, protocol_class
+from backend.consensus.network import ReplicaCluster
+from backend.consensus.cache import DecisionCache
+from backend.consensus.round_store import RoundStore
+from backend.consensus.state_store import StateStore
+from backend.consensus.tally import VoteTally
+from backend.consensus.timeouts import LatencyTracker, ViewChangeBackoff
+from backend.crypto.certificate import ConsensusCertificate, vote_digest
+from backend.crypto.merkle import merkle_root, merkle_proof
+from backend.crypto.verifier import SignatureVerifier
+from backend.crypto.signer import SigningService, default_signing_service
+from backend.crypto.sortition import committee_seed, sample_committee
 from backend.agents.base import BaseAgent
-from backend.utils import canonical_json, sha256
-from backend.config import F_FAULTS, CONSENSUS_TIMEOUT_SEC
+from backend.utils import canonical_json, sha256, DigestMemo
+from backend.config import (
+    F_FAULTS, EARLY_QUORUM, WATERMARK_WINDOW, CHECKPOINT_INTERVAL, SPECULATIVE_FAST_PATH,
+    HEDGE_QUANTILE, OPTIMISTIC_COMMITTEE, COMMITTEE_SAMPLE_SIZE, CONSENSUS_PROTOCOL,
+)
 
 logger = logging.getLogger("byzantinemind.consensus")
 
+T = TypeVar("T")
+
 
 class ConsensusRound:
     """Encapsulates the full state of a single consensus round for auditability."""
@@ -33,33 +74,276 @@ class ConsensusRound:
         self.sequence_number = sequence_number
         self.view_number = view_number
         self.request = request
-        self.request_hash = sha256(canonical_json(request))
+        # Request and agent results are canonicalized and hashed once per round
+        self.digest = DigestMemo()
+        self.request_hash = self.digest(request)
         self.started_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        self.finished_at: Optional[str] = None
         self.agent_results: Dict[str, Dict[str, Any]] = {}
         self.agent_errors: Dict[str, str] = {}
+        # agent_id -> the agent's signature over its vote (request_hash + result hash)
+        self.vote_signatures: Dict[str, str] = {}
+        self.agent_queries = 0  # LLM calls made for this round, across view changes
+        # agent_id -> ms from the start of the Phase 0 collection to the agent's answer
+        self.agent_latency_ms: Dict[str, float] = {}
+        # Hot spares pulled into this round: failed agent_id -> spare agent_id
+        self.substitutions: Dict[str, str] = {}
+        # Votes that arrived after an early quorum was reached (kept for trust scoring)
+        self.late_results: Dict[str, Dict[str, Any]] = {}
+        self.stragglers: List[asyncio.Task] = []
         self.prepare_msgs: List[Prepare] = []
         self.commit_msgs: List[Commit] = []
+        self.message_stats: Dict[str, int] = {}
+        self.signing_ms = 0.0  # time spent waiting on signature work (phases + certificate)
         self.consensus_decision: Optional[str] = None
+        self.path = "PBFT"  # "FAST" for the speculative single-phase path, "READ" for the read-only lane
+        self.committee: List[str] = []  # optimistic committee asked first (empty = everyone)
+        self.escalated = False  # the committee disagreed or failed and the rest were asked
+        self.cache_hit = False  # result and certificate were served from the DecisionCache
+        self.coalesced: List[str] = []  # action_ids of identical requests that awaited this round
+        # Agents taking part in this round (empty = the engine's whole roster) and, for a
+        # sampled committee, how it was drawn: {"beacon", "size", "roster", "members"}
+        self.members: List[BaseAgent] = []
+        self.sample: Optional[Dict[str, Any]] = None
         self.certificate: Optional[ConsensusCertificate] = None
 
+    def vote_digest(self, result: Dict[str, Any]) -> str:
+        """The digest an agent signs to vouch for its Phase 0 result in this round."""
+        return vote_digest(self.request_hash, self.digest(result))
+
+    def answered(self, agent_id: str, started: float):
+        """Notes how long agent_id took to answer a Phase 0 query sent at loop time started."""
+        elapsed = asyncio.get_running_loop().time() - started
+        self.agent_latency_ms[agent_id] = round(elapsed * 1000, 1)
+
+    def to_record(self, roster: List[str]) -> Dict[str, Any]:
+        """The round's full audit trail as plain data (for the RoundStore)."""
+        return {
+            "action_id": self.action_id,
+            "sequence_number": self.sequence_number,
+            "view_number": self.view_number,
+            "roster": roster,
+            "request": self.request,
+            "request_hash": self.request_hash,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "path": self.path,
+            "decision": self.consensus_decision,
+            "agent_results": self.agent_results,
+            "late_results": self.late_results,
+            "agent_errors": self.agent_errors,
+            "agent_latency_ms": self.agent_latency_ms,
+            "agent_queries": self.agent_queries,
+            "committee": self.committee,
+            "sample": self.sample,
+            "substitutions": self.substitutions,
+            "escalated": self.escalated,
+            "signing_ms": round(self.signing_ms, 2),
+            "message_stats": self.message_stats,
+            "prepare_msgs": [message_fields(m) for m in self.prepare_msgs],
+            "commit_msgs": [message_fields(m) for m in self.commit_msgs],
+            "certificate": self.certificate.to_dict() if self.certificate else None,
+        }
+
+    async def wait_for_stragglers(self):
+        """Wait until every agent still running after an early quorum has finished."""
+        if self.stragglers:
+            await asyncio.gather(*self.stragglers, return_exceptions=True)
+
 
 class ConsensusEngine:
-    def __init__(self, agents: List[BaseAgent], on_event: Optional[Callable] = None):
+    def __init__(
+        self,
+        agents: List[BaseAgent],
+        on_event: Optional[Callable] = None,
+        early_quorum: bool = EARLY_QUORUM,
+        watermark_window: int = WATERMARK_WINDOW,
+        checkpoint_interval: int = CHECKPOINT_INTERVAL,
+        speculative: bool = SPECULATIVE_FAST_PATH,
+        backups: Optional[Dict[str, BaseAgent]] = None,
+        hedge_quantile: float = HEDGE_QUANTILE,
+        cluster: Optional[ReplicaCluster] = None,
+        signer: Optional[SigningService] = None,
+        optimistic: bool = OPTIMISTIC_COMMITTEE,
+        agent_score: Optional[Callable[[str], float]] = None,
+        cache: Optional[DecisionCache] = None,
+        round_store: Optional[RoundStore] = None,
+        f: int = F_FAULTS,
+        sample_size: int = COMMITTEE_SAMPLE_SIZE,
+        read_only: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        protocol: str = CONSENSUS_PROTOCOL,
+        spares: Optional[List[BaseAgent]] = None,
+        state_store: Optional[StateStore] = None,
+    ):
         self.agents = agents
-        self.f = F_FAULTS
+        self.f = f
         self.n = len(agents)
         self.quorum_size = 2 * self.f + 1
 
         if self.n < 3 * self.f + 1:
             raise ValueError(f"Need at least {3 * self.f + 1} agents for f={self.f}, got {self.n}")
+        # Sampled committees: rosters larger than sample_size run each round on a committee
+        # of sample_size agents (see backend/crypto/sortition.py)
+        if sample_size and sample_size < 3 * self.f + 1:
+            raise ValueError(f"A sampled committee needs at least {3 * self.f + 1} agents for f={self.f}, got {sample_size}")
+        if sample_size and cluster is not None:
+            raise ValueError("Sampled committees are only supported with in-process nodes")
+        self.sample_size = sample_size
+        # Hot spares get PBFT nodes of their own (learners until they stand in for someone)
+        self.spares: List[BaseAgent] = list(spares or [])
+        if self.spares and (cluster is not None or sample_size):
+            raise ValueError("Hot spares are only supported with in-process nodes and without committee sampling")
+        self.spare_stats: Dict[str, int] = {"rounds": 0, "substitutions": 0}
+        self.protocol: ProtocolFactory = protocol_class(protocol)
+        self.protocol_name = protocol.lower()
+        if self.protocol_name != "pbft" and cluster is not None:
+            raise ValueError(f"Replica clusters run PBFT, not {protocol!r}")
 
+        self.signer = signer or default_signing_service()
+        # One verifier (key registry + signature cache) shared by every local node
+        self.verifier = SignatureVerifier({agent.agent_id: agent.identity.verify_key for agent in agents + self.spares})
         self.nodes: Dict[str, PBFTNode] = {
-            agent.agent_id: PBFTNode(agent.agent_id, agent.identity, self.f)
-            for agent in agents
+            agent.agent_id: PBFTNode(agent.agent_id, agent.identity, self.f, self.verifier)
+            for agent in agents + self.spares
         }
+        # With a cluster, Phases 1-3, view changes and checkpoints run on the replica
+        # processes instead of the local nodes above.
+        self.cluster = cluster
+        if cluster is not None and set(cluster.peers) != set(self.nodes):
+            raise ValueError(f"Cluster replicas {sorted(cluster.peers)} do not match the roster {sorted(self.nodes)}")
         self.sequence_number = 0
         self.view_number = 0
         self.on_event = on_event or (lambda *a, **k: None)
+        self.early_quorum = early_quorum
+        self.speculative = speculative
+        self.latency = LatencyTracker()
+        self.view_change_backoff = ViewChangeBackoff()
+
+        # Hedging: slot agent_id -> backup agent. Whichever answers first is the slot's vote,
+        # signed with the slot's identity, so the certificate never names the backup.
+        self.backups: Dict[str, BaseAgent] = dict(backups or {})
+        self.hedge_quantile = hedge_quantile
+        self.hedge_stats: Dict[str, Dict[str, int]] = {}
+
+        # Optimistic committee: agent_score(agent_id) ranks agents (higher is better; ties go
+        # to lower observed latency). Without a scorer only latency is used.
+        self.optimistic = optimistic
+        self.agent_score = agent_score or (lambda agent_id: 0.0)
+        self.committee_stats: Dict[str, int] = {"rounds": 0, "escalations": 0, "queries_saved": 0}
+        self.cache = cache
+        self.round_store = round_store
+        # Read-only lane: requests for which read_only(request) is true are not ordered
+        self.read_only = read_only
+        self.read_stats: Dict[str, int] = {"reads": 0, "fallbacks": 0}
+        # Single-flight: request_hash -> the task running that request's round
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.flight_stats: Dict[str, int] = {"flights": 0, "coalesced": 0}
+
+        # Watermarks: every sequence <= low_watermark has finished; new rounds may only be
+        # assigned sequences in (low_watermark, low_watermark + watermark_window].
+        self.watermark_window = max(1, watermark_window)
+        self.low_watermark = 0
+        self._in_flight: set = set()
+        self._finished: set = set()
+        self._window_open: Optional[asyncio.Condition] = None
+
+        # Checkpoints: every checkpoint_interval finished sequences the nodes sign a state
+        # digest; once 2f+1 match the checkpoint is stable and logs below it are dropped.
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.stable_checkpoint: Dict[str, Any] = dict(next(iter(self.nodes.values())).stable_checkpoint)
+        self._checkpointing = False  # a remote checkpoint exchange is in progress
+
+        self.state_store = state_store
+        self.state_transfers = 0  # nodes brought forward by state transfer
+        # Snapshot writes run in the default executor; requests made while one is running
+        # are coalesced into a single follow-up write of the latest state
+        self._persist_task: Optional[asyncio.Task] = None
+        self._persist_dirty = False
+        if state_store is not None:
+            saved = state_store.engine_state(self._cache_scope())
+            if saved:
+                self.restore(saved)
+
+    @property
+    def high_watermark(self) -> int:
+        return self.low_watermark + self.watermark_window
+
+    def get_state(self) -> Dict[str, Any]:
+        """Snapshot of the engine's ordering state for the API."""
+        return {
+            "roster": [a.agent_id for a in self.agents],
+            "sequence_number": self.sequence_number,
+            "view_number": self.view_number,
+            "primary": self.agents[self.view_number % self.n].agent_id,
+            "low_watermark": self.low_watermark,
+            "high_watermark": self.high_watermark,
+            "in_flight": sorted(self._in_flight),
+            "stable_checkpoint": {
+                "sequence_number": self.stable_checkpoint["sequence_number"],
+                "state_digest": self.stable_checkpoint["state_digest"],
+                "signers": [p["agent_id"] for p in self.stable_checkpoint["proof"]],
+            },
+            "deployment": "cluster" if self.cluster else "in_process",
+            "protocol": "pbft" if self.cluster else self.protocol_name,
+            "node_log_sizes": (
+                dict(self.cluster.log_sizes) if self.cluster
+                else {aid: node.log_size() for aid, node in self.nodes.items()}
+            ),
+            "agent_latency": self.latency.snapshot(),
+            "signature_cache": self.verifier.stats(),
+            "rejected_messages": (
+                dict(self.cluster.rejected) if self.cluster
+                else {aid: node.rejected for aid, node in self.nodes.items()}
+            ),
+            "consecutive_view_changes": self.view_change_backoff.consecutive_failures,
+            "hedging": self.hedge_snapshot(),
+            "committee": dict(self.committee_stats),
+            "committee_sample_size": self.sample_size if 0 < self.sample_size < self.n else None,
+            "single_flight": {**self.flight_stats, "in_flight": len(self._flights)},
+            "read_lane": dict(self.read_stats) if self.read_only else None,
+            "state_store": {**self.state_store.stats(), "state_transfers": self.state_transfers} if self.state_store else None,
+            "spares": {**self.spare_stats, "agents": [a.agent_id for a in self.spares]} if self.spares else None,
+        }
+
+    def hedge_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-slot hedge counters: eligible calls, hedges fired, backup wins and the hedge rate."""
+        return {
+            agent_id: {
+                **stats,
+                "backup": self.backups[agent_id].agent_id if agent_id in self.backups else None,
+                "hedge_rate": round(stats["hedged"] / stats["calls"], 3) if stats["calls"] else 0.0,
+            }
+            for agent_id, stats in self.hedge_stats.items()
+        }
+
+    async def _acquire_sequence(self) -> int:
+        """Assign the next sequence number and wait until it falls inside the watermark window."""
+        if self._window_open is None:
+            self._window_open = asyncio.Condition()
+        self.sequence_number += 1
+        seq = self.sequence_number
+        async with self._window_open:
+            await self._window_open.wait_for(lambda: seq <= self.high_watermark)
+        self._in_flight.add(seq)
+        return seq
+
+    async def _release_sequence(self, seq: int):
+        """Mark a sequence finished and slide the low watermark over every contiguous finished one."""
+        self._in_flight.discard(seq)
+        self._finished.add(seq)
+        while self.low_watermark + 1 in self._finished:
+            self.low_watermark += 1
+            self._finished.discard(self.low_watermark)
+        if not self._checkpointing and \
+                self.low_watermark >= self.stable_checkpoint["sequence_number"] + self.checkpoint_interval:
+            self._checkpointing = True
+            try:
+                await self._take_checkpoint(self.low_watermark)
+            finally:
+                self._checkpointing = False
+        self._persist()
+        async with self._window_open:
+            self._window_open.notify_all()
 
     def _emit(self, event_type: str, data: Dict[str, Any]):
         """Emit event for WebSocket streaming."""
@@ -68,11 +352,319 @@ class ConsensusEngine:
         except Exception:
             pass
 
-    async def _attempt_view_change(self, reason: str, seq: int) -> BaseAgent:
-        """Increment view and elect new primary."""
+    def _record_agent_result(self, rnd: ConsensusRound, agent: BaseAgent, task: asyncio.Task, seq: int):
+        """Record the outcome of a finished Phase 0 agent task into the round."""
+        if task.cancelled():
+            rnd.agent_errors[agent.agent_id] = "CANCELLED"
+            return
+        result = task.exception() or task.result()
+        if isinstance(result, asyncio.TimeoutError):
+            rnd.agent_errors[agent.agent_id] = "TIMEOUT"
+            self.latency.record_timeout(agent.agent_id)
+            logger.warning(f"[Round {seq}] Agent {agent.agent_id} timed out")
+            self._emit("agent_response", {"agent_id": agent.agent_id, "status": "TIMEOUT"})
+        elif isinstance(result, Exception):
+            rnd.agent_errors[agent.agent_id] = str(result)
+            logger.error(f"[Round {seq}] Agent {agent.agent_id} failed: {result}")
+            self._emit("agent_response", {"agent_id": agent.agent_id, "status": "ERROR", "error": str(result)})
+        else:
+            rnd.agent_results[agent.agent_id] = result
+            logger.info(f"[Round {seq}] Agent {agent.agent_id} decided: {result.get('decision')}")
+            self._emit("agent_response", {"agent_id": agent.agent_id, "status": "OK", "decision": result.get("decision")})
+
+    def _record_late_result(self, rnd: ConsensusRound, agent: BaseAgent, task: asyncio.Task, seq: int):
+        """Done-callback for stragglers: keep their vote for trust scoring, outside the quorum."""
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            if isinstance(task.exception(), asyncio.TimeoutError):
+                self.latency.record_timeout(agent.agent_id)
+            return
+        result = task.result()
+        rnd.late_results[agent.agent_id] = result
+        logger.info(f"[Round {seq}] Late vote from {agent.agent_id}: {result.get('decision')}")
+        self._emit("agent_response", {
+            "agent_id": agent.agent_id, "status": "LATE", "decision": result.get("decision"),
+        })
+
+    async def _vote(self, rnd: ConsensusRound, agent: BaseAgent, action_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        One agent's Phase 0 vote: its answer within the agent's adaptive timeout, then its
+        signature over the vote, made on the signing service rather than the event loop.
+        """
+        result = await asyncio.wait_for(
+            self._timed_decide(agent, action_id, request), timeout=self.latency.timeout_for(agent.agent_id)
+        )
+        rnd.vote_signatures[agent.agent_id] = await self.signer.sign(agent.identity, rnd.vote_digest(result))
+        return result
+
+    async def _timed_decide(self, agent: BaseAgent, action_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Calls the agent (hedged if it has a backup) and feeds the latency of successful calls into the tracker."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        backup = self.backups.get(agent.agent_id)
+        hedge_after = self.latency.percentile(agent.agent_id, self.hedge_quantile) if backup else None
+        if hedge_after is None:
+            result = await agent.decide_async(action_id, request)
+        else:
+            result = await self._hedged_decide(agent, backup, hedge_after, action_id, request)
+        self.latency.record(agent.agent_id, loop.time() - started)
+        return result
+
+    async def _hedged_decide(
+        self,
+        agent: BaseAgent,
+        backup: BaseAgent,
+        hedge_after: float,
+        action_id: str,
+        request: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Races a slot against its backup. The backup is only started once the slot has been
+        silent for hedge_after seconds (its observed p95) or has already failed; the first
+        successful answer wins and the other call is cancelled. If both fail, the slot's own
+        error is raised.
+        """
+        stats = self.hedge_stats.setdefault(agent.agent_id, {"calls": 0, "hedged": 0, "backup_wins": 0})
+        stats["calls"] += 1
+        primary = asyncio.ensure_future(agent.decide_async(action_id, request))
+        pending = {primary}
+        try:
+            await asyncio.wait(pending, timeout=hedge_after)
+            if primary.done() and primary.exception() is None:
+                return primary.result()
+
+            stats["hedged"] += 1
+            secondary = asyncio.ensure_future(backup.decide_async(action_id, request))
+            pending = {secondary} if primary.done() else {primary, secondary}
+            logger.info(f"[HEDGE] {agent.agent_id} silent for {hedge_after:.2f}s, racing backup {backup.agent_id}")
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary:
+                            stats["backup_wins"] += 1
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _members(self, rnd: ConsensusRound) -> List[BaseAgent]:
+        return rnd.members or self.agents
+
+    def _primary(self, rnd: ConsensusRound) -> BaseAgent:
+        members = self._members(rnd)
+        return members[self.view_number % len(members)]
+
+    def _sample_members(self, rnd: ConsensusRound):
+        """Draws the round's committee when the roster is larger than sample_size."""
+        if not 0 < self.sample_size < self.n:
+            return
+        beacon = self.stable_checkpoint["state_digest"]
+        seed = committee_seed(beacon, rnd.sequence_number, rnd.request_hash)
+        by_id = {a.agent_id: a for a in self.agents}
+        member_ids = sample_committee(by_id, self.sample_size, seed)
+        rnd.members = [by_id[aid] for aid in member_ids]
+        rnd.sample = {"beacon": beacon, "size": self.sample_size, "roster": sorted(by_id), "members": member_ids}
+        logger.info(f"[Round {rnd.sequence_number}] Sampled committee of {self.sample_size}/{self.n}: {member_ids}")
+
+    async def _substitute_spares(
+        self, rnd: ConsensusRound, action_id: str, request: Dict[str, Any], seq: int, read: bool = False
+    ):
+        """
+        Hot spares: while the round lacks an answering primary (reads need none) or a 2f+1
+        decision quorum, every member that failed in Phase 0 is replaced by the best-ranked
+        unused spare, which takes over its slot (primary included) for this round and is
+        queried. Spares are ranked like the optimistic committee, by agent_score.
+        """
+        while True:
+            members = list(self._members(rnd))
+            tally = VoteTally.of([a.agent_id for a in members], rnd.agent_results)
+            if tally.leader()[1] >= self.quorum_size and (read or self._primary(rnd).agent_id in rnd.agent_results):
+                return
+            failed = [a for a in members if a.agent_id in rnd.agent_errors and a.agent_id not in rnd.agent_results]
+            used = {a.agent_id for a in members} | set(rnd.substitutions)
+            available = sorted(
+                (s for s in self.spares if s.agent_id not in used), key=lambda s: -self.agent_score(s.agent_id)
+            )
+            swaps = list(zip(failed, available))
+            if not swaps:
+                return
+            if not rnd.substitutions:
+                self.spare_stats["rounds"] += 1
+            for out, spare in swaps:
+                members[members.index(out)] = spare
+                rnd.substitutions[out.agent_id] = spare.agent_id
+            rnd.members = members
+            self.spare_stats["substitutions"] += len(swaps)
+            logger.warning(f"[Round {seq}] Hot spares stand in: {dict((o.agent_id, s.agent_id) for o, s in swaps)}")
+            self._emit("agent_substituted", {
+                "sequence": seq, "substitutions": {o.agent_id: s.agent_id for o, s in swaps},
+            })
+            await self._collect_agent_results(rnd, action_id, request, seq, agents=[s for _, s in swaps], read=read)
+
+    def _select_committee(self, rnd: ConsensusRound, candidates: List[BaseAgent]) -> List[BaseAgent]:
+        """The current primary plus the best-ranked other agents, 2f+1 in total."""
+        primary = self._primary(rnd)
+
+        def rank(agent: BaseAgent):
+            p50 = self.latency.percentile(agent.agent_id, 0.5)
+            return -self.agent_score(agent.agent_id), self.latency.max_timeout if p50 is None else p50
+
+        others = sorted((a for a in candidates if a is not primary), key=rank)
+        committee = ([primary] if primary in candidates else []) + others
+        return committee[:self.quorum_size]
+
+    async def _collect_with_committee(
+        self,
+        rnd: ConsensusRound,
+        action_id: str,
+        request: Dict[str, Any],
+        seq: int,
+        candidates: List[BaseAgent],
+    ):
+        """
+        Phase 0 in optimistic mode: query only the committee; if every member answered with
+        the same decision that is already a 2f+1 quorum. Otherwise escalate to the rest of
+        the candidates in the same view.
+        """
+        committee = self._select_committee(rnd, candidates)
+        rnd.committee = [a.agent_id for a in committee]
+        self.committee_stats["rounds"] += 1
+        await self._collect_agent_results(rnd, action_id, request, seq, agents=committee)
+
+        answered = [rnd.agent_results[aid] for aid in rnd.committee if aid in rnd.agent_results]
+        decisions = {r.get("decision") for r in answered}
+        if len(answered) == len(committee) and len(decisions) == 1 and len(rnd.agent_results) >= self.quorum_size:
+            self.committee_stats["queries_saved"] += len(candidates) - len(committee)
+            return
+
+        rest = [a for a in candidates if a.agent_id not in rnd.committee]
+        rnd.escalated = True
+        self.committee_stats["escalations"] += 1
+        logger.info(
+            f"[Round {seq}] Committee {rnd.committee} not unanimous ({len(answered)}/{len(committee)} answered, "
+            f"decisions={sorted(map(str, decisions))}); escalating to {[a.agent_id for a in rest]}"
+        )
+        self._emit("committee_escalation", {"sequence": seq, "committee": rnd.committee, "escalated_to": [a.agent_id for a in rest]})
+        await self._collect_agent_results(rnd, action_id, request, seq, agents=rest)
+
+    def _retain_verified_votes(self, rnd: ConsensusRound):
+        """
+        Before re-running Phase 0 in a new view, keep every vote (including late ones) whose
+        signature still verifies against its agent's key and drop everything else.
+        """
+        for aid, result in rnd.late_results.items():
+            rnd.agent_results.setdefault(aid, result)
+        rnd.late_results.clear()
+
+        for aid in list(rnd.agent_results):
+            sig = rnd.vote_signatures.get(aid, "")
+            if not self.verifier.verify(aid, rnd.vote_digest(rnd.agent_results[aid]), sig):
+                logger.warning(f"[Round {rnd.sequence_number}] Discarding unverifiable vote from {aid}")
+                del rnd.agent_results[aid]
+                rnd.vote_signatures.pop(aid, None)
+
+    async def _collect_agent_results(
+        self,
+        rnd: ConsensusRound,
+        action_id: str,
+        request: Dict[str, Any],
+        seq: int,
+        agents: Optional[List[BaseAgent]] = None,
+        read: bool = False,
+    ):
+        """
+        Phase 0: query agents concurrently (all of them, or only `agents` when given).
+        Votes already in rnd.agent_results count towards the quorum.
+
+        In early-quorum mode results are consumed as they arrive and collection stops as
+        soon as 2f+1 agents agree on one decision and the current primary has answered.
+        Reads always collect this way, and without waiting for the primary.
+        Collection also stops once no decision can reach quorum any more. Agents still
+        running are left in rnd.stragglers and their votes land in rnd.late_results.
+        """
+        tasks = {
+            asyncio.ensure_future(self._vote(rnd, agent, action_id, request)): agent
+            for agent in (self._members(rnd) if agents is None else agents)
+        }
+        rnd.agent_queries += len(tasks)
+        started = asyncio.get_running_loop().time()
+        for task, agent in tasks.items():
+            task.add_done_callback(lambda t, aid=agent.agent_id: None if t.cancelled() else rnd.answered(aid, started))
+        primary_id = self._primary(rnd).agent_id
+        pending = set(tasks)
+        tally = VoteTally.of([a.agent_id for a in self._members(rnd)], rnd.agent_results)
+        order = {task: i for i, task in enumerate(tasks)}
+        if not pending:
+            return
+
+        while pending:
+            if self.early_quorum or read:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                done, pending = await asyncio.wait(pending)
+            for task in sorted(done, key=order.__getitem__):
+                agent = tasks[task]
+                self._record_agent_result(rnd, agent, task, seq)
+                if agent.agent_id in rnd.agent_results:
+                    tally.record(agent.agent_id, rnd.agent_results[agent.agent_id].get("decision"))
+
+            top_count = tally.leader()[1]
+            if top_count >= self.quorum_size and (read or primary_id in rnd.agent_results):
+                break
+            if top_count + len(pending) < self.quorum_size:
+                break
+
+        for task in pending:
+            agent = tasks[task]
+            task.add_done_callback(lambda t, a=agent: self._record_late_result(rnd, a, t, seq))
+            rnd.stragglers.append(task)
+        if pending:
+            logger.info(f"[Round {seq}] Early quorum: {len(pending)} agent(s) still running in background")
+
+    async def _take_checkpoint(self, seq: int):
+        """Every node signs its state digest at seq and the checkpoints are exchanged."""
+        if self.cluster:
+            reported = await self.cluster.checkpoint(seq)
+        else:
+            reported = await InProcessBroadcast(self.nodes, self.signer).checkpoint(seq)
+
+        stable = [cp for cp in reported if cp["sequence_number"] == seq]
+        if len(stable) < self.quorum_size:
+            logger.warning(f"[Checkpoint {seq}] Not stable: only {len(stable)} node(s) agree on the state digest")
+            # Nodes that missed part of the log (e.g. restarted replicas) disagree on the
+            # digest; they catch up from their peers and the next release retries
+            await self.state_transfer()
+            return
+        self.stable_checkpoint = dict(stable[0])
+        logger.info(f"[Checkpoint {seq}] Stable (digest={self.stable_checkpoint['state_digest'][:12]}…), logs truncated")
+        self._emit("checkpoint_stable", {
+            "sequence": seq,
+            "state_digest": self.stable_checkpoint["state_digest"],
+        })
+
+    async def _attempt_view_change(self, reason: str, rnd: ConsensusRound, from_view: int) -> BaseAgent:
+        """
+        Increment view and elect new primary (of the round's members).
+
+        Concurrent rounds may time out on the same primary; only the first one to report it
+        moves the view forward, the others adopt the view that is already current.
+        """
+        seq = rnd.sequence_number
+        if self.view_number != from_view:
+            await asyncio.sleep(self.view_change_backoff.base)
+            return self._primary(rnd)
         old_view = self.view_number
         self.view_number += 1
-        new_primary = self.agents[self.view_number % self.n]
+        self._persist()
+        if self.cluster:
+            await self.cluster.view_change(self.view_number)
+        else:
+            await InProcessBroadcast(self.nodes, self.signer).view_change(self.view_number)
+        new_primary = self._primary(rnd)
+        delay = self.view_change_backoff.next_delay()
         logger.warning(f"[Round {seq}] VIEW CHANGE: {old_view}→{self.view_number}. Reason: {reason}. New primary: {new_primary.agent_id}")
         self._emit("view_change", {
             "old_view": old_view,
@@ -80,15 +672,150 @@ class ConsensusEngine:
             "new_primary": new_primary.agent_id,
             "reason": reason,
             "sequence": seq,
+            "backoff_sec": delay,
         })
-        await asyncio.sleep(0.5)  # brief stabilization pause
+        await asyncio.sleep(delay)  # stabilization pause, doubles on consecutive view changes
         return new_primary
 
+    def snapshot(self) -> Dict[str, Any]:
+        """The engine's durable state (see StateStore). Remote replicas keep their own."""
+        return {
+            "sequence_number": self.sequence_number,
+            "view_number": self.view_number,
+            "stable_checkpoint": self.stable_checkpoint,
+            "nodes": {} if self.cluster else {aid: node.state_summary() for aid, node in self.nodes.items()},
+        }
+
+    def restore(self, state: Dict[str, Any]):
+        """Resumes from snapshot(). Sequences in flight when it was taken are abandoned."""
+        self.sequence_number = self.low_watermark = state["sequence_number"]
+        self.view_number = state["view_number"]
+        self.stable_checkpoint = dict(state["stable_checkpoint"])
+        for aid, summary in state["nodes"].items():
+            if aid in self.nodes:
+                self.nodes[aid].restore_state(summary)
+        logger.info(
+            f"Restored engine state: sequence={self.sequence_number} view={self.view_number} "
+            f"checkpoint={self.stable_checkpoint['sequence_number']}"
+        )
+
+    def _persist(self):
+        """Schedules a snapshot write (encode, fsync, rename) off the event loop."""
+        if self.state_store is None:
+            return
+        if self._persist_task is not None and not self._persist_task.done():
+            self._persist_dirty = True
+            return
+        self._persist_task = asyncio.ensure_future(self._write_snapshot())
+
+    async def _write_snapshot(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._persist_dirty = False
+            try:
+                await loop.run_in_executor(None, self.state_store.save, self._cache_scope(), self.snapshot())
+            except Exception as e:
+                logger.error(f"Failed to persist engine state: {e}")
+            if not self._persist_dirty:
+                return
+
+    async def flush_state(self):
+        """Waits until the latest state has been written to the state store."""
+        while self._persist_task is not None and not self._persist_task.done():
+            await self._persist_task
+
+    async def state_transfer(self) -> Dict[str, bool]:
+        """
+        Offers every node its peers' state summaries; nodes that are behind adopt the newest
+        proven stable checkpoint and the log above it (PBFTNode.install_state) instead of
+        replaying history. Returns agent_id -> whether the node moved forward.
+        """
+        if self.cluster:
+            moved = await self.cluster.state_transfer()
+        else:
+            summaries = {aid: node.state_summary() for aid, node in self.nodes.items()}
+            moved = {
+                aid: node.install_state([s for peer, s in summaries.items() if peer != aid])
+                for aid, node in self.nodes.items()
+            }
+        caught_up = [aid for aid, ok in moved.items() if ok]
+        if caught_up:
+            self.state_transfers += len(caught_up)
+            logger.info(f"State transfer brought {caught_up} up to date")
+            self._emit("state_transfer", {"agents": caught_up})
+        return moved
+
+    def _cache_scope(self) -> str:
+        return ",".join(sorted(self.nodes))
+
+    def lookup_cached(
+        self, action_id: str, request: Dict[str, Any]
+    ) -> Optional[Tuple[Dict[str, Any], ConsensusCertificate, ConsensusRound]]:
+        """A previously committed (result, certificate, round) for an identical request, if cached."""
+        if self.cache is None:
+            return None
+        rnd = ConsensusRound(action_id, 0, self.view_number, request)
+        entry = self.cache.get(rnd.request_hash, self._cache_scope())
+        if entry is None:
+            return None
+        original = entry["round"]
+        rnd.sequence_number = original["sequence_number"]
+        rnd.view_number = original["view_number"]
+        rnd.agent_results = original["agent_results"]
+        rnd.consensus_decision = original["consensus_decision"]
+        rnd.path = original["path"]
+        rnd.cache_hit = True
+        rnd.certificate = ConsensusCertificate.from_dict(entry["certificate"])
+        logger.info(f"[Cache] {action_id} served from the decision of round {rnd.sequence_number}")
+        return entry["result"], rnd.certificate, rnd
+
+    def remember(self, rnd: ConsensusRound, result: Dict[str, Any], cert: ConsensusCertificate, ttl: float):
+        """Caches a committed round's result and certificate for ttl seconds."""
+        if self.cache is None or ttl <= 0 or rnd.cache_hit:
+            return
+        self.cache.put(rnd.request_hash, self._cache_scope(), {
+            "result": result,
+            "certificate": cert.to_dict(),
+            "round": {
+                "action_id": rnd.action_id,
+                "sequence_number": rnd.sequence_number,
+                "view_number": rnd.view_number,
+                "agent_results": rnd.agent_results,
+                "consensus_decision": rnd.consensus_decision,
+                "path": rnd.path,
+            },
+        }, ttl)
+
+    async def coalesce(
+        self, action_id: str, request: Dict[str, Any], run: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Single-flight: the first caller for a request_hash starts run(); identical requests
+        arriving while it is in flight await the same outcome (same round, same certificate)
+        and are listed in round_data.coalesced. The round runs as its own task, so a
+        cancelled caller does not cancel it for the others.
+        """
+        key = sha256(canonical_json(request))  # == ConsensusRound.request_hash
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.flight_stats["coalesced"] += 1
+            logger.info(f"[SingleFlight] {action_id} joins the in-flight round for an identical request")
+            outcome = await asyncio.shield(flight)
+            outcome[2].coalesced.append(action_id)
+            return outcome
+
+        flight = asyncio.ensure_future(run())
+        self._flights[key] = flight
+        self.flight_stats["flights"] += 1
+        flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        return await asyncio.shield(flight)
+
     async def submit_request(
         self, action_id: str, request: Dict[str, Any]
     ) -> Tuple[Optional[Dict[str, Any]], Optional[ConsensusCertificate], ConsensusRound]:
         """
-        Drives the full 3-phase PBFT consensus protocol.
+        Drives the full 3-phase PBFT consensus protocol, coalescing concurrent identical
+        requests into a single round.
 
         Returns:
             (consensus_result, certificate, round_data)
@@ -96,54 +823,130 @@ class ConsensusEngine:
             - certificate: Cryptographic proof of consensus, or None
             - round_data: Full audit trail of the round
         """
-        self.sequence_number += 1
-        seq = self.sequence_number
+        return await self.coalesce(action_id, request, lambda: self.order_request(action_id, request))
+
+    async def order_request(
+        self, action_id: str, request: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[ConsensusCertificate], ConsensusRound]:
+        """Runs one request in its own round, without single-flight (for callers that already coalesce)."""
+        read = None
+        if self.is_read_only(request):
+            outcome = await self._run_read(action_id, request)
+            if outcome[1] is not None:
+                self._store_round(outcome[2])
+                return outcome
+            read = outcome[2]
+            self.read_stats["fallbacks"] += 1
+        seq = await self._acquire_sequence()
+        try:
+            outcome = await self._run_round(seq, action_id, request, read)
+        finally:
+            await self._release_sequence(seq)
+        self._store_round(outcome[2])
+        return outcome
+
+    def is_read_only(self, request: Dict[str, Any]) -> bool:
+        return self.read_only is not None and self.read_only(request)
+
+    async def _run_read(
+        self, action_id: str, request: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[ConsensusCertificate], ConsensusRound]:
+        """
+        Read-only lane: Phase 0 only. The first 2f+1 agents to agree on a decision vouch for
+        it with their signed votes and that is the certificate. Nothing is ordered, so the
+        round takes no sequence number or watermark slot and the nodes never see it; it is
+        stamped with the low watermark, the last sequence every earlier write finished by
+        (the RoundStore and shard index keep it apart from the round ordered in that slot).
+        Returns no certificate when the votes do not reach a quorum.
+        """
+        self.read_stats["reads"] += 1
+        seq = self.low_watermark
+        rnd = ConsensusRound(action_id, seq, self.view_number, request)
+        rnd.path = "READ"
+        logger.info(f"[Read @{seq}] Starting read-only round for action={action_id}")
+        self._emit("round_started", {"action_id": action_id, "sequence": seq, "path": "READ"})
+
+        self._sample_members(rnd)
+        self._emit("phase_update", {"phase": "AGENT_EXECUTION", "sequence": seq, "view": rnd.view_number})
+        await self._collect_agent_results(rnd, action_id, request, seq, read=True)
+        if self.spares:
+            await self._substitute_spares(rnd, action_id, request, seq, read=True)
+
+        tally = VoteTally.of([a.agent_id for a in self._members(rnd)], rnd.agent_results)
+        decision, count = tally.leader()
+        if count < self.quorum_size:
+            logger.warning(f"[Read @{seq}] No 2f+1 vote quorum ({tally.counts()}), falling back to PBFT")
+            # Votes still on their way are awaited so the fallback reuses them instead of asking again
+            await rnd.wait_for_stragglers()
+            return None, None, rnd
+        rnd.consensus_decision = decision
+        majority_result = next(r for r in rnd.agent_results.values() if r.get("decision") == decision)
+        return await self._vote_certificate(rnd, rnd.view_number, majority_result)
+
+    def _store_round(self, rnd: ConsensusRound):
+        """Records a finished round, and again once its stragglers have answered."""
+        if self.round_store is None:
+            return
+        rnd.finished_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        roster = [a.agent_id for a in self.agents]
+        self.round_store.record(rnd.to_record(roster))
+        if rnd.stragglers:
+            later = asyncio.ensure_future(rnd.wait_for_stragglers())
+            later.add_done_callback(lambda _: self.round_store.record(rnd.to_record(roster)))
+
+    async def _run_round(
+        self, seq: int, action_id: str, request: Dict[str, Any], read: Optional[ConsensusRound] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[ConsensusCertificate], ConsensusRound]:
         view = self.view_number
 
-        rnd = ConsensusRound(action_id, seq, view, request)
+        if read is not None and read.sample is None:
+            # A read that fell back: its signed votes do not depend on the sequence, keep them
+            rnd = read
+            rnd.sequence_number, rnd.view_number, rnd.path = seq, view, "PBFT"
+        else:
+            rnd = ConsensusRound(action_id, seq, view, request)
         logger.info(f"[Round {seq}] Starting consensus for action={action_id}")
         self._emit("round_started", {"action_id": action_id, "sequence": seq})
 
-        primary_agent = self.agents[view % self.n]
+        self._sample_members(rnd)
+        members = self._members(rnd)
+        primary_agent = self._primary(rnd)
 
         # ── RETRY LOOP FOR VIEW CHANGES ───────────────────────────────
         MAX_VIEW_CHANGES = 2
         
         for attempt in range(MAX_VIEW_CHANGES + 1):
-            rnd.agent_results.clear()
-            rnd.agent_errors.clear()
-            
+            # Votes from earlier views stay valid; only agents without one are asked again
+            for task in rnd.stragglers:
+                task.cancel()
+            rnd.stragglers.clear()
+            self._retain_verified_votes(rnd)
+            to_query = [a for a in members if a.agent_id not in rnd.agent_results]
+            for agent in to_query:
+                rnd.agent_errors.pop(agent.agent_id, None)
+            attempt_view = self.view_number
+
             # ── PHASE 0: AGENT EXECUTION ──────────────────────────────────
-            logger.info(f"[Round {seq}][View {self.view_number}] Phase 0: Querying {self.n} agents...")
+            logger.info(
+                f"[Round {seq}][View {self.view_number}] Phase 0: Querying {len(to_query)} agents "
+                f"({len(rnd.agent_results)} votes reused)..."
+            )
             self._emit("phase_update", {"phase": "AGENT_EXECUTION", "sequence": seq, "view": self.view_number})
 
-            agent_tasks = [
-                asyncio.wait_for(agent.decide_async(action_id, request), timeout=CONSENSUS_TIMEOUT_SEC)
-                for agent in self.agents
-            ]
-            results = await asyncio.gather(*agent_tasks, return_exceptions=True)
-
-            for idx, result in enumerate(results):
-                agent = self.agents[idx]
-                if isinstance(result, asyncio.TimeoutError):
-                    rnd.agent_errors[agent.agent_id] = "TIMEOUT"
-                    logger.warning(f"[Round {seq}] Agent {agent.agent_id} timed out")
-                    self._emit("agent_response", {"agent_id": agent.agent_id, "status": "TIMEOUT"})
-                elif isinstance(result, Exception):
-                    rnd.agent_errors[agent.agent_id] = str(result)
-                    logger.error(f"[Round {seq}] Agent {agent.agent_id} failed: {result}")
-                    self._emit("agent_response", {"agent_id": agent.agent_id, "status": "ERROR", "error": str(result)})
-                else:
-                    rnd.agent_results[agent.agent_id] = result
-                    logger.info(f"[Round {seq}] Agent {agent.agent_id} decided: {result.get('decision')}")
-                    self._emit("agent_response", {"agent_id": agent.agent_id, "status": "OK", "decision": result.get("decision")})
+            if attempt == 0 and self.optimistic:
+                await self._collect_with_committee(rnd, action_id, request, seq, to_query)
+            else:
+                await self._collect_agent_results(rnd, action_id, request, seq, agents=to_query)
+            if self.spares:
+                await self._substitute_spares(rnd, action_id, request, seq)
+                members = self._members(rnd)
 
             # The Primary must be responsive to lead the next phases
-            primary_agent = self.agents[self.view_number % self.n]
+            primary_agent = self._primary(rnd)
             if primary_agent.agent_id not in rnd.agent_results:
                 logger.error(f"[Round {seq}] Primary {primary_agent.agent_id} failed to respond (timeout/crash)")
                 if attempt < MAX_VIEW_CHANGES:
-                    primary_agent = await self._attempt_view_change("PRIMARY_TIMEOUT", seq)
+                    primary_agent = await self._attempt_view_change("PRIMARY_TIMEOUT", rnd, attempt_view)
                     continue
                 else:
                     return None, None, rnd
@@ -151,26 +954,28 @@ class ConsensusEngine:
             if len(rnd.agent_results) < self.quorum_size:
                 logger.error(f"[Round {seq}] Not enough agent responses: {len(rnd.agent_results)} < {self.quorum_size}")
                 if attempt < MAX_VIEW_CHANGES:
-                    primary_agent = await self._attempt_view_change("INSUFFICIENT_RESPONSES", seq)
+                    primary_agent = await self._attempt_view_change("INSUFFICIENT_RESPONSES", rnd, attempt_view)
                     continue
                 else:
                     return None, None, rnd
 
             # ── DETERMINE MAJORITY DECISION ───────────────────────────────
-            decisions = [r.get("decision") for r in rnd.agent_results.values()]
-            decision_counts = Counter(decisions)
-            majority_decision, majority_count = decision_counts.most_common(1)[0]
+            tally = VoteTally.of([a.agent_id for a in members], rnd.agent_results)
+            majority_decision, majority_count = tally.leader()
 
             if majority_count < self.quorum_size:
-                logger.warning(f"[Round {seq}] No quorum on any decision: {dict(decision_counts)}")
+                logger.warning(f"[Round {seq}] No quorum on any decision: {tally.counts()}")
+                if len(rnd.agent_results) == len(members):
+                    # Every agent has a vote on record; a new view would reuse them all unchanged
+                    return None, None, rnd
                 if attempt < MAX_VIEW_CHANGES:
-                    primary_agent = await self._attempt_view_change("NO_DECISION_QUORUM", seq)
+                    primary_agent = await self._attempt_view_change("NO_DECISION_QUORUM", rnd, attempt_view)
                     continue
                 else:
                     return None, None, rnd
 
             rnd.consensus_decision = majority_decision
-            logger.info(f"[Round {seq}] Majority decision: {majority_decision} ({majority_count}/{self.n})")
+            logger.info(f"[Round {seq}] Majority decision: {majority_decision} ({majority_count}/{len(members)})")
 
             # Pick a canonical result from the majority
             majority_result = next(
@@ -180,70 +985,24 @@ class ConsensusEngine:
             # If we reached here, we have a successful Phase 0, break retry loop!
             break
 
-        # ── PHASE 1: PRE-PREPARE ──────────────────────────────────────
-        logger.info(f"[Round {seq}] Phase 1: Pre-Prepare from primary={primary_agent.agent_id}")
-        self._emit("phase_update", {"phase": "PRE_PREPARE", "primary": primary_agent.agent_id})
+        # The round is led in whatever view is current once Phase 0 succeeded
+        view = self.view_number
 
-        pre_prepare = PrePrepare(
-            agent_id=primary_agent.agent_id,
-            view_number=view,
-            sequence_number=seq,
-            request_hash=rnd.request_hash,
-            request=request,
+        if self.speculative and majority_count == len(members):
+            return await self._vote_certificate(rnd, view, majority_result)
+        pre_prepare = await self._run_protocol_phases(
+            rnd, primary_agent, view, rnd.request_hash, request, rnd.agent_results
         )
-        payload = canonical_json(pre_prepare.model_dump(exclude={"signature"}))
-        pre_prepare.signature = primary_agent.identity.sign(payload)
-
-        # ── PHASE 2: PREPARE ──────────────────────────────────────────
-        logger.info(f"[Round {seq}] Phase 2: Prepare broadcast")
-        self._emit("phase_update", {"phase": "PREPARE"})
-
-        for agent_id, node in self.nodes.items():
-            prep = node.on_pre_prepare(pre_prepare)
-            if prep:
-                rnd.prepare_msgs.append(prep)
-
-        # ── PHASE 3: COMMIT ───────────────────────────────────────────
-        logger.info(f"[Round {seq}] Phase 3: Commit broadcast")
-        self._emit("phase_update", {"phase": "COMMIT"})
-
-        committed = False
-        for prep in rnd.prepare_msgs:
-            for agent_id, node in self.nodes.items():
-                if agent_id in rnd.agent_results:
-                    com = node.on_prepare(prep, rnd.agent_results[agent_id])
-                    if com:
-                        rnd.commit_msgs.append(com)
-
-        for com in rnd.commit_msgs:
-            for agent_id, node in self.nodes.items():
-                if node.on_commit(com):
-                    committed = True
-
-        if not committed:
-            logger.warning(f"[Round {seq}] Commit phase failed — no quorum")
+        if pre_prepare is None:
             return None, None, rnd
 
         # ── BUILD CERTIFICATE ─────────────────────────────────────────
-        result_hash = sha256(canonical_json(majority_result))
-
-        # Build verifiable prepare signatures (sign the request_hash directly)
-        prepare_quorum = []
-        for agent in self.agents:
-            if agent.agent_id in rnd.agent_results:
-                sig = agent.identity.sign(rnd.request_hash)
-                prepare_quorum.append({"agent_id": agent.agent_id, "signature": sig})
-                if len(prepare_quorum) >= self.quorum_size:
-                    break
-
-        # Build verifiable commit signatures (sign the result_hash directly)
-        commit_quorum = []
-        for agent in self.agents:
-            if agent.agent_id in rnd.agent_results:
-                sig = agent.identity.sign(result_hash)
-                commit_quorum.append({"agent_id": agent.agent_id, "signature": sig})
-                if len(commit_quorum) >= self.quorum_size:
-                    break
+        result_hash = rnd.digest(majority_result)
+
+        # Verifiable prepare signatures sign the request_hash, commit signatures the result_hash
+        prepare_quorum, commit_quorum = await self._sign_quorums(
+            rnd, rnd.request_hash, result_hash, rnd.agent_results
+        )
 
         cert = ConsensusCertificate(
             view_number=view,
@@ -254,8 +1013,11 @@ class ConsensusEngine:
             commit_quorum=commit_quorum,
             result_hash=result_hash,
             decision=majority_decision,
+            committee=rnd.sample,
+            substitutions=rnd.substitutions,
         )
         rnd.certificate = cert
+        self.view_change_backoff.reset()
 
         logger.info(f"[Round {seq}] Consensus reached: {majority_decision} | Certificate generated")
         self._emit("consensus_reached", {
@@ -266,3 +1028,298 @@ class ConsensusEngine:
         })
 
         return majority_result, cert, rnd
+
+    async def _vote_certificate(
+        self, rnd: ConsensusRound, view: int, majority_result: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], ConsensusCertificate, ConsensusRound]:
+        """
+        Single-phase certificate made of Phase 0 votes: the speculative fast path
+        (Zyzzyva-style) when all 3f+1 agents agreed, or a read-only round (rnd.path == "READ")
+        with the 2f+1 agents that voted for the decision.
+
+        Every signer vouches for the canonical result with a signature over
+        vote_digest(request_hash, result_hash). Agents whose own Phase 0 result is
+        byte-identical already signed exactly that digest, so their vote signature is reused.
+        """
+        seq = rnd.sequence_number
+        path = "READ" if rnd.path == "READ" else "FAST"
+        result_hash = rnd.digest(majority_result)
+        digest = vote_digest(rnd.request_hash, result_hash)
+
+        members = self._members(rnd)
+        if path == "READ":
+            voters = [
+                a for a in members
+                if rnd.agent_results.get(a.agent_id, {}).get("decision") == rnd.consensus_decision
+            ]
+            # Prefer agents whose vote signature can be reused
+            voters.sort(key=lambda a: rnd.digest(rnd.agent_results[a.agent_id]) != result_hash)
+            signers = voters[:self.quorum_size]
+        else:
+            signers = members
+
+        signatures = {}
+        to_sign = []
+        for agent in signers:
+            own = rnd.agent_results[agent.agent_id]
+            if rnd.digest(own) == result_hash and agent.agent_id in rnd.vote_signatures:
+                signatures[agent.agent_id] = rnd.vote_signatures[agent.agent_id]
+            else:
+                to_sign.append(agent)
+        fresh = await self._timed_signing(rnd, self.signer.sign_many([(a.identity, digest) for a in to_sign]))
+        signatures.update({a.agent_id: sig for a, sig in zip(to_sign, fresh)})
+        quorum = [{"agent_id": a.agent_id, "signature": signatures[a.agent_id]} for a in signers]
+
+        cert = ConsensusCertificate(
+            view_number=view,
+            sequence_number=seq,
+            request_hash=rnd.request_hash,
+            pre_prepare_signature="",
+            prepare_quorum=[],
+            commit_quorum=quorum,
+            result_hash=result_hash,
+            decision=rnd.consensus_decision,
+            path=path,
+            committee=rnd.sample,
+            substitutions=rnd.substitutions,
+        )
+        rnd.path = path
+        rnd.certificate = cert
+        if path == "FAST":
+            self.view_change_backoff.reset()
+
+        logger.info(
+            f"[Round {seq}] {path.capitalize()} path: {rnd.consensus_decision} "
+            f"({len(quorum)}/{len(members)}) | Certificate generated"
+        )
+        self._emit("consensus_reached", {
+            "decision": rnd.consensus_decision,
+            "sequence": seq,
+            "path": path,
+            "commit_count": len(quorum),
+        })
+        return majority_result, cert, rnd
+
+    async def submit_batch(
+        self, items: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[ConsensusCertificate], ConsensusRound]]:
+        """
+        Orders several requests under a single sequence number.
+
+        Phase 0 runs for every request concurrently. Requests that the primary answered and
+        whose votes reach a 2f+1 decision quorum share one Pre-Prepare/Prepare/Commit exchange
+        keyed by the Merkle root of their request hashes, and one set of quorum signatures
+        over the request root and result root. Every request gets its own certificate with
+        inclusion proofs. Requests that cannot be batched fall back to order_request, which
+        runs the view-change path.
+
+        Returns one (consensus_result, certificate, round_data) tuple per item, in order.
+        """
+        seq = await self._acquire_sequence()
+        try:
+            rounds, outcomes = await self._run_batch(seq, items)
+        finally:
+            await self._release_sequence(seq)
+
+        # ── FALLBACK: requests left out of the batch ─────────────────
+        # Runs after the batch sequence is released so retries never wait on our own slot.
+        leftovers = [rnd for rnd in rounds if id(rnd) not in outcomes]
+        for rnd in rounds:
+            if id(rnd) in outcomes:
+                self._store_round(rnd)
+        if leftovers:
+            logger.warning(f"[Round {seq}] {len(leftovers)} request(s) fell out of the batch, retrying individually")
+            retried = await asyncio.gather(*(
+                self.order_request(rnd.action_id, rnd.request) for rnd in leftovers
+            ))
+            for rnd, outcome in zip(leftovers, retried):
+                outcomes[id(rnd)] = outcome
+
+        return [outcomes[id(rnd)] for rnd in rounds]
+
+    async def _run_batch(
+        self, seq: int, items: List[Tuple[str, Dict[str, Any]]]
+    ) -> Tuple[List[ConsensusRound], Dict[int, Tuple]]:
+        view = self.view_number
+        primary_agent = self.agents[view % self.n]
+
+        rounds = [ConsensusRound(action_id, seq, view, request) for action_id, request in items]
+        logger.info(f"[Round {seq}] Starting batched consensus for {len(rounds)} requests")
+        self._emit("round_started", {
+            "action_ids": [rnd.action_id for rnd in rounds], "sequence": seq, "batch_size": len(rounds),
+        })
+
+        # ── PHASE 0: AGENT EXECUTION (per request, concurrently) ─────
+        self._emit("phase_update", {"phase": "AGENT_EXECUTION", "sequence": seq, "view": view})
+        await asyncio.gather(*(
+            self._collect_agent_results(rnd, rnd.action_id, rnd.request, seq) for rnd in rounds
+        ))
+
+        batched: List[Tuple[ConsensusRound, Dict[str, Any]]] = []
+        roster = [a.agent_id for a in self.agents]
+        for rnd in rounds:
+            if primary_agent.agent_id not in rnd.agent_results or not rnd.agent_results:
+                continue
+            majority_decision, majority_count = VoteTally.of(roster, rnd.agent_results).leader()
+            if majority_count < self.quorum_size:
+                continue
+            rnd.consensus_decision = majority_decision
+            majority_result = next(
+                r for r in rnd.agent_results.values() if r.get("decision") == majority_decision
+            )
+            batched.append((rnd, majority_result))
+
+        # Only agents that answered every batched request can sign the batch roots
+        responders = set(self.nodes)
+        for rnd, _ in batched:
+            responders &= set(rnd.agent_results)
+        if len(responders) < self.quorum_size:
+            batched = []
+
+        outcomes: Dict[int, Tuple] = {}
+        if batched:
+            request_hashes = [rnd.request_hash for rnd, _ in batched]
+            result_hashes = [rnd.digest(result) for rnd, result in batched]
+            request_root = merkle_root(request_hashes)
+            result_root = merkle_root(result_hashes)
+
+            # Each node commits to the root over its own agent's results
+            node_results = {
+                aid: {"result_root": merkle_root([
+                    rnd.digest(rnd.agent_results[aid]) for rnd, _ in batched
+                ])}
+                for aid in responders
+            }
+            batch_rnd = ConsensusRound(f"batch-{seq}", seq, view, {"batch": request_hashes})
+            pre_prepare = await self._run_protocol_phases(
+                batch_rnd, primary_agent, view, request_root, {}, node_results, batch_hashes=request_hashes
+            )
+
+            if pre_prepare is not None:
+                prepare_quorum, commit_quorum = await self._sign_quorums(
+                    batch_rnd, request_root, result_root, responders
+                )
+                for index, (rnd, result) in enumerate(batched):
+                    rnd.prepare_msgs = batch_rnd.prepare_msgs
+                    rnd.commit_msgs = batch_rnd.commit_msgs
+                    rnd.message_stats = batch_rnd.message_stats
+                    rnd.signing_ms = batch_rnd.signing_ms
+                    rnd.certificate = ConsensusCertificate(
+                        view_number=view,
+                        sequence_number=seq,
+                        request_hash=rnd.request_hash,
+                        pre_prepare_signature=pre_prepare.signature,
+                        prepare_quorum=prepare_quorum,
+                        commit_quorum=commit_quorum,
+                        result_hash=result_hashes[index],
+                        decision=rnd.consensus_decision,
+                        batch={
+                            "size": len(batched),
+                            "index": index,
+                            "request_root": request_root,
+                            "request_proof": merkle_proof(request_hashes, index),
+                            "result_root": result_root,
+                            "result_proof": merkle_proof(result_hashes, index),
+                        },
+                    )
+                    outcomes[id(rnd)] = (result, rnd.certificate, rnd)
+
+                self.view_change_backoff.reset()
+                logger.info(f"[Round {seq}] Batch of {len(batched)} committed | Certificates generated")
+                self._emit("consensus_reached", {
+                    "decisions": [rnd.consensus_decision for rnd, _ in batched],
+                    "sequence": seq,
+                    "batch_size": len(batched),
+                    "prepare_count": len(prepare_quorum),
+                    "commit_count": len(commit_quorum),
+                })
+
+        return rounds, outcomes
+
+    async def _run_protocol_phases(
+        self,
+        rnd: ConsensusRound,
+        primary_agent: BaseAgent,
+        view: int,
+        request_hash: str,
+        request: Dict[str, Any],
+        node_results: Dict[str, Dict[str, Any]],
+        batch_hashes: Optional[List[str]] = None,
+    ) -> Optional[PrePrepare]:
+        """
+        Phases 1-3: Pre-Prepare, Prepare and Commit across all PBFT nodes, exchanged by the
+        engine's ordering protocol (or the replica cluster).
+
+        node_results maps agent_id -> the result that node commits to; only those nodes
+        send Commit messages. Returns the signed PrePrepare if the round committed, else None.
+        """
+        seq = rnd.sequence_number
+
+        # ── PHASE 1: PRE-PREPARE ──────────────────────────────────────
+        logger.info(f"[Round {seq}] Phase 1: Pre-Prepare from primary={primary_agent.agent_id}")
+        self._emit("phase_update", {"phase": "PRE_PREPARE", "primary": primary_agent.agent_id})
+
+        pre_prepare = PrePrepare(
+            agent_id=primary_agent.agent_id,
+            view_number=view,
+            sequence_number=seq,
+            request_hash=request_hash,
+            request=request,
+            batch_hashes=batch_hashes or [],
+        )
+        pre_prepare = pre_prepare.signed(await self._timed_signing(
+            rnd, self.signer.sign(primary_agent.identity, signing_payload(pre_prepare))
+        ))
+        broadcast: OrderingProtocol
+        if self.cluster:
+            broadcast = self.cluster.broadcast()
+        else:
+            members = [a.agent_id for a in self._members(rnd)]
+            broadcast = self.protocol(self.nodes, self.signer, members)
+
+        # ── PHASE 2: PREPARE ──────────────────────────────────────────
+        logger.info(f"[Round {seq}] Phase 2: Prepare broadcast")
+        self._emit("phase_update", {"phase": "PREPARE"})
+
+        rnd.prepare_msgs.extend(await self._timed_signing(rnd, broadcast.pre_prepare(pre_prepare)))
+
+        # ── PHASE 3: COMMIT ───────────────────────────────────────────
+        logger.info(f"[Round {seq}] Phase 3: Commit broadcast")
+        self._emit("phase_update", {"phase": "COMMIT"})
+
+        result_hashes = {aid: rnd.digest(result) for aid, result in node_results.items()}
+        rnd.commit_msgs.extend(await self._timed_signing(
+            rnd, broadcast.prepare(rnd.prepare_msgs, node_results, result_hashes)
+        ))
+        committed = await self._timed_signing(rnd, broadcast.commit(rnd.commit_msgs))
+        rnd.message_stats = broadcast.stats
+
+        if not committed:
+            logger.warning(f"[Round {seq}] Commit phase failed — no quorum")
+            return None
+        return pre_prepare
+
+    async def _timed_signing(self, rnd: ConsensusRound, work: Awaitable[T]) -> T:
+        """Awaits signature work and charges the time to the round's signing_ms."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            return await work
+        finally:
+            rnd.signing_ms += (loop.time() - started) * 1000
+
+    async def _sign_quorum(self, message: str, responders: Collection[str]) -> List[Dict[str, str]]:
+        """Collect 2f+1 signatures over message from agents that responded in Phase 0."""
+        signers = [a for a in self.agents + self.spares if a.agent_id in responders][:self.quorum_size]
+        signatures = await self.signer.sign_many([(a.identity, message) for a in signers])
+        return [{"agent_id": a.agent_id, "signature": sig} for a, sig in zip(signers, signatures)]
+
+    async def _sign_quorums(
+        self, rnd: ConsensusRound, prepare_message: str, commit_message: str, responders: Collection[str]
+    ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """Assembles the certificate's prepare and commit quorums concurrently."""
+        prepare_quorum, commit_quorum = await self._timed_signing(rnd, asyncio.gather(
+            self._sign_quorum(prepare_message, responders),
+            self._sign_quorum(commit_message, responders),
+        ))
+        return prepare_quorum, commit_quorum
@@ -0,0 +1,100 @@
+"""
+LinearBroadcast — HotStuff-style leader-collected voting between in-process PBFTNodes.
+
+Instead of every node sending its Prepare and Commit to every other node, the nodes send
+their votes to the leader (the primary that signed the Pre-Prepare), which checks them
+and forwards 2f+1 matching votes to everyone as a single quorum certificate (QC):
+
+    proposal   leader → n        Pre-Prepare
+    vote       n → leader        Prepare
+    prepareQC  leader → n        2f+1 Prepares; each node that holds a result Commits
+    vote       n → leader        Commit
+    commitQC   leader → n        2f+1 Commits; every node executes
+
+so a round costs O(n) messages instead of O(n²). Nodes never trust the leader: each one
+verifies every signature in a QC and counts the quorum itself (the same on_prepare /
+on_commit logic as PBFT), so a faulty leader can stall a round but not forge one. A QC is
+a list of Ed25519 signatures rather than a threshold signature, so its size (and the
+verification work per node) grows with f; the messages, not the bytes, are linear.
+
+Leader failure is handled by the engine's view change as with PBFT. Checkpoints and view
+changes, which run once per CHECKPOINT_INTERVAL rounds or on failure, stay all-to-all.
+"""
+
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Callable, TypeVar
+
+from backend.consensus.messages import PBFTMessage, PrePrepare, Prepare, Commit
+from backend.consensus.broadcast import InProcessBroadcast
+from backend.consensus.pbft_node import PBFTNode
+from backend.crypto.signer import SigningService
+
+M = TypeVar("M", bound=PBFTMessage)
+
+
+class LinearBroadcast(InProcessBroadcast):
+    def __init__(
+        self,
+        nodes: Dict[str, PBFTNode],
+        signer: Optional[SigningService] = None,
+        members: Optional[List[str]] = None,
+    ):
+        super().__init__(nodes, signer, members)
+        self.stats["qc"] = 0
+        self.leader: Optional[str] = None
+
+    def _certify(self, votes: List[M], key: Callable[[M], str]) -> List[M]:
+        """The leader's QC: the first 2f+1 authentic votes (one per sender) that agree on
+        key, or [] if no value has a quorum yet."""
+        collector = self.nodes[self.leader] if self.leader in self.nodes else next(iter(self.nodes.values()))
+        groups: Dict[str, Dict[str, M]] = defaultdict(dict)
+        for vote in collector.verify_batch(votes):
+            groups[key(vote)].setdefault(vote.agent_id, vote)
+        for group in groups.values():
+            if len(group) >= collector.quorum_size:
+                self.stats["qc"] += 1
+                return list(group.values())[:collector.quorum_size]
+        return []
+
+    async def pre_prepare(self, msg: PrePrepare) -> List[Prepare]:
+        """Sends the proposal to every participant; returns the Prepare votes the leader got."""
+        self.leader = msg.agent_id
+        prepares = await super().pre_prepare(msg)
+        self.stats["deliveries"] += len(prepares)  # each vote goes to the leader only
+        return prepares
+
+    async def prepare(
+        self,
+        prepares: List[Prepare],
+        node_results: Dict[str, Dict[str, Any]],
+        result_hashes: Optional[Dict[str, str]] = None,
+    ) -> List[Commit]:
+        """Forwards the prepareQC to every node holding a result; returns the Commit votes."""
+        qc = self._certify(prepares, lambda p: p.request_hash)
+        if not qc:
+            return []
+        hashes = result_hashes or {}
+
+        def deliver(agent_id: str, node: PBFTNode) -> List[Commit]:
+            result, result_hash = node_results[agent_id], hashes.get(agent_id)
+            return [c for c in (node.on_prepare(p, result, result_hash) for p in node.verify_batch(qc)) if c]
+
+        targets = {aid for aid in self.nodes if aid in node_results}
+        await self._preverify(qc)
+        commits = [c for emitted in await self._on_nodes(deliver, targets) for c in emitted]
+        self._sent("commit", len(commits))
+        self.stats["deliveries"] += len(targets) + len(commits)
+        return commits
+
+    async def commit(self, commits: List[Commit]) -> bool:
+        """Forwards the commitQC to every node; True if any node committed."""
+        qc = self._certify(commits, lambda c: c.request_hash)
+        if not qc:
+            return False
+
+        def deliver(agent_id: str, node: PBFTNode) -> bool:
+            return any([node.on_commit(c) for c in node.verify_batch(qc)])
+
+        self.stats["deliveries"] += len(self.nodes)
+        await self._preverify(qc)
+        return any(await self._on_nodes(deliver))
@@ -1,27 +1,114 @@
-from typing import Any, Dict
-from pydantic import BaseModel
+"""
+PBFT protocol messages.
 
-class PBFTMessage(BaseModel):
+Messages are frozen, slotted dataclasses: the in-process protocol creates O(n²) of them
+per round, so they are built without validation and never copied. Validation happens at
+the trust boundaries instead — decode_message / unpack_message run every message that
+arrives from another process through pydantic (validate_message).
+
+A message is signed once: msg.signed(signature) returns the signed copy. Its signing
+payload is computed on first use and then reused for every verification.
+"""
+
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import TypeAdapter
+
+from backend import codec
+from backend.utils import canonical_json
+
+M = TypeVar("M", bound="PBFTMessage")
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PBFTMessage:
     agent_id: str
     view_number: int
     sequence_number: int
     signature: str = ""
+    # canonical JSON of every field but the signature, filled in by signing_payload()
+    _payload: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
+    def signed(self: M, signature: str) -> M:
+        """This message carrying signature (the payload is unchanged and carried over)."""
+        msg = replace(self, signature=signature)
+        object.__setattr__(msg, "_payload", self._payload)
+        return msg
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class PrePrepare(PBFTMessage):
     request_hash: str
     request: Dict[str, Any]
+    batch_hashes: List[str] = field(default_factory=list)  # request hashes under a Merkle-rooted batch (request_hash = root)
 
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Prepare(PBFTMessage):
     request_hash: str
 
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Commit(PBFTMessage):
     request_hash: str
     result_hash: str
     result: Dict[str, Any]
 
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Checkpoint(PBFTMessage):
+    state_digest: str  # digest of everything executed up to sequence_number
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class ViewChange(PBFTMessage):
     new_view: int
 
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class NewView(PBFTMessage):
     new_view: int
     view_changes: list  # list of signed ViewChange messages
+
+
+MESSAGE_TYPES = {cls.__name__: cls for cls in (PrePrepare, Prepare, Commit, Checkpoint, ViewChange, NewView)}
+
+_FIELDS: Dict[type, Tuple[str, ...]] = {
+    cls: tuple(f.name for f in fields(cls) if f.init) for cls in MESSAGE_TYPES.values()
+}
+_VALIDATORS: Dict[type, TypeAdapter] = {cls: TypeAdapter(cls) for cls in MESSAGE_TYPES.values()}
+
+
+def message_fields(msg: PBFTMessage) -> Dict[str, Any]:
+    """The message as a plain dict (including its signature)."""
+    return {name: getattr(msg, name) for name in _FIELDS[type(msg)]}
+
+
+def validate_message(cls: Type[M], data: Dict[str, Any]) -> M:
+    """Builds a message from untrusted input, checking every field's type."""
+    return _VALIDATORS[cls].validate_python(data)
+
+
+def signing_payload(msg: PBFTMessage) -> str:
+    """Canonical serialization a message's signature is computed over."""
+    payload = msg._payload
+    if payload is None:
+        body = message_fields(msg)
+        del body["signature"]
+        payload = canonical_json(body)
+        object.__setattr__(msg, "_payload", payload)
+    return payload
+
+
+def pack_message(msg: PBFTMessage) -> bytes:
+    """Compact binary form of a signed message: [kind, fields] in the canonical codec."""
+    return codec.encode([type(msg).__name__, message_fields(msg)])
+
+
+def unpack_message(data: bytes) -> PBFTMessage:
+    kind, fields_ = codec.decode(data)
+    cls = MESSAGE_TYPES.get(kind)
+    if cls is None:
+        raise codec.CodecError(f"Unknown message kind: {kind!r}")
+    return validate_message(cls, fields_)
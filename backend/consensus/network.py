@@ -0,0 +1,197 @@
+"""
+Coordinator side of a multi-process replica cluster.
+
+ReplicaCluster keeps one framed connection per replica (see replica.py) and fans requests
+out concurrently. A replica that is unreachable or does not answer within
+CLUSTER_RPC_TIMEOUT_SEC simply contributes nothing to that phase, exactly like a crashed
+node in the in-process deployment.
+
+RemoteBroadcast has the same interface and traffic counters as InProcessBroadcast, so the
+engine runs the same Pre-Prepare / Prepare / Commit sequence whichever deployment it uses.
+Messages returned by replicas are validated and signature-checked before being relayed to
+the others; a malformed or forged one is dropped and counted against the replica that sent
+it. A slot only counts as committed once f+1 replicas report it, so at least one honest
+replica has seen the commit quorum.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from nacl.signing import VerifyKey
+from pydantic import ValidationError
+
+from backend.config import CLUSTER_RPC_TIMEOUT_SEC
+from backend.consensus.messages import PBFTMessage, PrePrepare, Prepare, Commit, Checkpoint, ViewChange, signing_payload
+from backend.consensus.transport import FrameError, read_frame, write_frame, open_connection, encode_message, decode_message
+from backend.crypto.verifier import SignatureVerifier
+
+logger = logging.getLogger("byzantinemind.network")
+
+
+class ReplicaCluster:
+    def __init__(
+        self,
+        peers: Dict[str, str],
+        verify_keys: Dict[str, VerifyKey],
+        rpc_timeout: float = CLUSTER_RPC_TIMEOUT_SEC,
+    ):
+        self.peers = peers
+        self.f = (len(peers) - 1) // 3
+        self.verifier = SignatureVerifier(verify_keys)
+        self.rpc_timeout = rpc_timeout
+        self.log_sizes: Dict[str, int] = {}
+        self.reported_rejected: Dict[str, int] = {}  # as reported by each replica
+        self.dropped: Dict[str, int] = {}  # malformed / forged messages each replica sent us
+        self._conns: Dict[str, Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def _call(self, agent_id: str, frame: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """One request/response exchange with a replica; None if it is down, too slow or
+        the exchange does not fit in (or does not parse as) a frame."""
+        lock = self._locks.setdefault(agent_id, asyncio.Lock())
+        async with lock:
+            try:
+                if agent_id not in self._conns:
+                    self._conns[agent_id] = await asyncio.wait_for(open_connection(self.peers[agent_id]), self.rpc_timeout)
+                reader, writer = self._conns[agent_id]
+                await write_frame(writer, frame)
+                reply = await asyncio.wait_for(read_frame(reader), self.rpc_timeout)
+                if reply is None:
+                    raise ConnectionError("connection closed")
+            except (OSError, asyncio.TimeoutError, ConnectionError, FrameError) as e:
+                logger.warning(f"[Cluster] {agent_id} unreachable for {frame.get('op')}: {e!r}")
+                self._drop(agent_id)
+                return None
+        if "error" in reply:
+            logger.warning(f"[Cluster] {agent_id} rejected {frame.get('op')}: {reply['error']}")
+            return None
+        self.log_sizes[agent_id] = reply.get("log_size", 0)
+        self.reported_rejected[agent_id] = reply.get("rejected", 0)
+        return reply
+
+    @property
+    def rejected(self) -> Dict[str, int]:
+        """Per replica: messages it rejected plus messages from it that the coordinator dropped."""
+        return {
+            aid: self.reported_rejected.get(aid, 0) + self.dropped.get(aid, 0)
+            for aid in set(self.reported_rejected) | set(self.dropped)
+        }
+
+    def _drop(self, agent_id: str):
+        conn = self._conns.pop(agent_id, None)
+        if conn is not None:
+            conn[1].close()
+
+    async def multicast(self, frames: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Sends each replica its frame concurrently; returns the replies that came back."""
+        agent_ids = list(frames)
+        replies = await asyncio.gather(*(self._call(aid, frames[aid]) for aid in agent_ids))
+        return {aid: reply for aid, reply in zip(agent_ids, replies) if reply is not None}
+
+    def verified(self, raw: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[PBFTMessage]:
+        """Decodes (replica, message) pairs, dropping messages that do not validate or whose
+        signature does not verify, and counting them against the replica that sent them."""
+        messages: List[PBFTMessage] = []
+        senders: List[str] = []
+        for aid, item in raw:
+            if not item:
+                continue
+            try:
+                messages.append(decode_message(item))
+                senders.append(aid)
+            except (ValidationError, FrameError, AttributeError, TypeError) as e:
+                logger.warning(f"[Cluster] Dropped a malformed message from {aid}: {e}")
+                self.dropped[aid] = self.dropped.get(aid, 0) + 1
+        results = self.verifier.verify_many([(m.agent_id, signing_payload(m), m.signature) for m in messages])
+        for msg, aid, ok in zip(messages, senders, results):
+            if not ok:
+                logger.warning(f"[Cluster] Dropped {type(msg).__name__} with a bad signature from {msg.agent_id} (via {aid})")
+                self.dropped[aid] = self.dropped.get(aid, 0) + 1
+        return [msg for msg, ok in zip(messages, results) if ok]
+
+    def broadcast(self) -> "RemoteBroadcast":
+        return RemoteBroadcast(self)
+
+    async def view_change(self, new_view: int) -> List[ViewChange]:
+        """Moves every replica to new_view; returns the signed ViewChange messages collected."""
+        replies = await self.multicast({aid: {"op": "view_change", "new_view": new_view} for aid in self.peers})
+        return self.verified([(aid, r.get("view_change")) for aid, r in replies.items()])
+
+    async def checkpoint(self, seq: int) -> List[Dict[str, Any]]:
+        """Every replica signs its state digest at seq and receives everyone's checkpoint.
+        Returns the stable checkpoints reported back by the replicas."""
+        replies = await self.multicast({aid: {"op": "make_checkpoint", "seq": seq} for aid in self.peers})
+        checkpoints: List[Checkpoint] = self.verified([(aid, r.get("checkpoint")) for aid, r in replies.items()])
+        encoded = [encode_message(cp) for cp in checkpoints]
+        replies = await self.multicast({aid: {"op": "checkpoint", "msgs": encoded} for aid in self.peers})
+        return [r["stable_checkpoint"] for r in replies.values() if r.get("stable_checkpoint")]
+
+    async def state_transfer(self) -> Dict[str, bool]:
+        """Collects every replica's state summary and offers each one its peers' summaries;
+        replicas verify them themselves. Returns agent_id -> whether the replica moved forward."""
+        replies = await self.multicast({aid: {"op": "state"} for aid in self.peers})
+        summaries = {aid: r["state"] for aid, r in replies.items() if r.get("state")}
+        frames = {
+            aid: {"op": "install_state", "summaries": [s for peer, s in summaries.items() if peer != aid]}
+            for aid in self.peers
+        }
+        replies = await self.multicast(frames)
+        return {aid: bool(r.get("installed")) for aid, r in replies.items()}
+
+    async def close(self):
+        for agent_id in list(self._conns):
+            self._drop(agent_id)
+
+
+class RemoteBroadcast:
+    def __init__(self, cluster: ReplicaCluster):
+        self.cluster = cluster
+        self.stats: Dict[str, int] = {
+            "pre_prepare": 0,
+            "prepare": 0,
+            "commit": 0,
+            "deliveries": 0,
+            "signatures": 0,
+        }
+
+    def _sent(self, kind: str, count: int = 1):
+        self.stats[kind] += count
+        self.stats["signatures"] += count
+
+    async def pre_prepare(self, msg: PrePrepare) -> List[Prepare]:
+        """Delivers the primary's Pre-Prepare to every replica; returns the Prepares they signed."""
+        self._sent("pre_prepare")
+        frame = {"op": "pre_prepare", "msg": encode_message(msg)}
+        replies = await self.cluster.multicast({aid: frame for aid in self.cluster.peers})
+        self.stats["deliveries"] += len(self.cluster.peers)
+        prepares = self.cluster.verified([(aid, r.get("prepare")) for aid, r in replies.items()])
+        self._sent("prepare", len(prepares))
+        return prepares
+
+    async def prepare(
+        self,
+        prepares: List[Prepare],
+        node_results: Dict[str, Dict[str, Any]],
+        result_hashes: Optional[Dict[str, str]] = None,
+    ) -> List[Commit]:
+        """Delivers every Prepare to every replica holding a result; returns the Commits emitted.
+        Replicas hash the results themselves, so result_hashes is not sent."""
+        msgs = [encode_message(p) for p in prepares]
+        frames = {
+            aid: {"op": "prepare", "msgs": msgs, "result": node_results[aid]}
+            for aid in self.cluster.peers if aid in node_results
+        }
+        replies = await self.cluster.multicast(frames)
+        self.stats["deliveries"] += len(prepares) * len(frames)
+        commits = self.cluster.verified([(aid, c) for aid, r in replies.items() for c in r.get("commits") or []])
+        self._sent("commit", len(commits))
+        return commits
+
+    async def commit(self, commits: List[Commit]) -> bool:
+        """Delivers every Commit to every replica; True once f+1 replicas report the commit
+        quorum, so a single Byzantine replica cannot claim the slot committed."""
+        frame = {"op": "commit", "msgs": [encode_message(c) for c in commits]}
+        replies = await self.cluster.multicast({aid: frame for aid in self.cluster.peers})
+        self.stats["deliveries"] += len(commits) * len(self.cluster.peers)
+        return sum(r.get("committed") is True for r in replies.values()) >= self.cluster.f + 1
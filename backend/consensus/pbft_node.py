@@ -1,22 +1,78 @@
-from typing import Dict, Any, List, Optional
-from backend.consensus.messages import PrePrepare, Prepare, Commit, ViewChange
+import threading
+from collections import Counter
+from typing import Dict, Any, Optional, Set, Tuple, List, TypeVar
+from backend.consensus.messages import PBFTMessage, PrePrepare, Prepare, Commit, ViewChange, Checkpoint, signing_payload
 from backend.crypto.identity import AgentIdentity
+from backend.crypto.merkle import merkle_root
+from backend.crypto.verifier import SignatureVerifier
 from backend.utils import canonical_json, sha256
 
+M = TypeVar("M", bound=PBFTMessage)
+
+
 class PBFTNode:
-    def __init__(self, agent_id: str, identity: AgentIdentity, f: int):
+    def __init__(self, agent_id: str, identity: AgentIdentity, f: int, verifier: Optional[SignatureVerifier] = None):
         self.agent_id = agent_id
         self.identity = identity
         self.f = f
         self.quorum_size = 2 * f + 1
+
+        # Incoming messages must carry a valid signature from a registered key. Nodes in one
+        # process share a verifier, so each message is checked once for all of them.
+        self.verifier = verifier or SignatureVerifier({agent_id: identity.verify_key})
+        self.rejected = 0  # messages dropped for a missing or invalid signature
+        # Held by whoever drives the node from a worker thread (see InProcessBroadcast)
+        self.lock = threading.RLock()
         
         self.view_number = 0
         self.sequence_number = 0
         
-        # message logs
+        # message logs: view -> seq -> request_hash -> sender -> message
+        # (keyed by sender so a duplicate delivery never counts twice towards a quorum)
         self.pre_prepares: Dict[int, Dict[int, Dict[str, PrePrepare]]] = {}
-        self.prepares: Dict[int, Dict[int, Dict[str, List[Prepare]]]] = {}
-        self.commits: Dict[int, Dict[int, Dict[str, List[Commit]]]] = {}
+        self.prepares: Dict[int, Dict[int, Dict[str, Dict[str, Prepare]]]] = {}
+        self.commits: Dict[int, Dict[int, Dict[str, Dict[str, Commit]]]] = {}
+
+        # Quorum tracking: (phase, view, seq, request_hash) -> bitmap of senders, so a quorum
+        # check is one popcount however large the roster is
+        self.quorum_bits: Dict[Tuple[str, int, int, str], int] = {}
+        self._bit_of: Dict[str, int] = {}
+
+        # (view, seq) slots this node already sent its own Prepare / Commit for
+        self.sent_prepares: Set[Tuple[int, int]] = set()
+        self.sent_commits: Set[Tuple[int, int]] = set()
+
+        # executed log (seq -> request_hash) since the last stable checkpoint
+        self.executed: Dict[int, str] = {}
+        # checkpoint votes: seq -> state_digest -> {agent_id: Checkpoint}
+        self.checkpoints: Dict[int, Dict[str, Dict[str, Checkpoint]]] = {}
+        self.stable_checkpoint: Dict[str, Any] = {
+            "sequence_number": 0,
+            "state_digest": sha256("genesis"),
+            "proof": [],
+        }
+
+    def is_authentic(self, msg: PBFTMessage) -> bool:
+        """True if msg is signed by the agent it claims to come from."""
+        if self.verifier.verify(msg.agent_id, signing_payload(msg), msg.signature):
+            return True
+        self.rejected += 1
+        return False
+
+    def verify_batch(self, msgs: List[M]) -> List[M]:
+        """
+        Verifies a whole phase's messages at once (cache first, the rest on a thread pool)
+        and returns the authentic ones. Their results stay cached, so the per-message
+        checks in on_prepare / on_commit that follow are free.
+        """
+        results = self.verifier.verify_many([(m.agent_id, signing_payload(m), m.signature) for m in msgs])
+        self.rejected += results.count(False)
+        return [m for m, ok in zip(msgs, results) if ok]
+
+    def _mark(self, phase: str, msg: PBFTMessage):
+        bit = self._bit_of.setdefault(msg.agent_id, len(self._bit_of))
+        key = (phase, msg.view_number, msg.sequence_number, msg.request_hash)
+        self.quorum_bits[key] = self.quorum_bits.get(key, 0) | (1 << bit)
 
     def on_view_change(self, new_view: int) -> ViewChange:
         """Transitions node to a new view and generates a signed ViewChange message."""
@@ -27,16 +83,27 @@ class PBFTNode:
             sequence_number=self.sequence_number,
             new_view=new_view,
         )
-        payload = canonical_json(vc.model_dump(exclude={"signature"}))
-        vc.signature = self.identity.sign(payload)
+        vc = vc.signed(self.identity.sign(signing_payload(vc)))
         return vc
 
     def on_pre_prepare(self, msg: PrePrepare) -> Optional[Prepare]:
-        """Receives a Pre-Prepare message. Returns a Prepare message to broadcast if valid."""
-        if msg.view_number < self.view_number:
+        """
+        Receives a Pre-Prepare message. Returns a Prepare message to broadcast if valid.
+        A node prepares at most once per (view, seq), and only a batch whose request_hash is
+        the Merkle root of its batch_hashes (the leaves it later proves inclusion against).
+        """
+        if msg.view_number < self.view_number or self._below_checkpoint(msg.sequence_number):
+            return None
+        if not self.is_authentic(msg):
+            return None
+        if msg.batch_hashes and merkle_root(msg.batch_hashes) != msg.request_hash:
             return None
         
         self.pre_prepares.setdefault(msg.view_number, {}).setdefault(msg.sequence_number, {})[msg.request_hash] = msg
+        slot = (msg.view_number, msg.sequence_number)
+        if slot in self.sent_prepares:
+            return None
+        self.sent_prepares.add(slot)
         
         prep = Prepare(
             agent_id=self.agent_id,
@@ -45,17 +112,25 @@ class PBFTNode:
             request_hash=msg.request_hash
         )
         
-        payload = canonical_json(prep.model_dump(exclude={"signature"}))
-        prep.signature = self.identity.sign(payload)
+        prep = prep.signed(self.identity.sign(signing_payload(prep)))
         
         return prep
 
-    def on_prepare(self, msg: Prepare, result: Dict[str, Any]) -> Optional[Commit]:
-        """Receives a Prepare message. Returns a Commit message to broadcast if prepared (quorum reached)."""
-        self.prepares.setdefault(msg.view_number, {}).setdefault(msg.sequence_number, {}).setdefault(msg.request_hash, []).append(msg)
+    def on_prepare(self, msg: Prepare, result: Dict[str, Any], result_hash: Optional[str] = None) -> Optional[Commit]:
+        """
+        Receives a Prepare message. Returns a Commit message to broadcast if prepared (quorum reached).
+        Only the first Prepare that completes the quorum yields a Commit; later ones are just logged.
+        result_hash may be passed by an in-process caller that has already hashed result.
+        """
+        if self._below_checkpoint(msg.sequence_number) or not self.is_authentic(msg):
+            return None
+        self.prepares.setdefault(msg.view_number, {}).setdefault(msg.sequence_number, {}).setdefault(msg.request_hash, {})[msg.agent_id] = msg
+        self._mark("prepare", msg)
         
-        if self.is_prepared(msg.view_number, msg.sequence_number, msg.request_hash):
-            result_hash = sha256(canonical_json(result))
+        slot = (msg.view_number, msg.sequence_number)
+        if slot not in self.sent_commits and self.is_prepared(msg.view_number, msg.sequence_number, msg.request_hash):
+            self.sent_commits.add(slot)
+            result_hash = result_hash or sha256(canonical_json(result))
             
             com = Commit(
                 agent_id=self.agent_id,
@@ -66,21 +141,158 @@ class PBFTNode:
                 result=result
             )
             
-            payload = canonical_json(com.model_dump(exclude={"signature"}))
-            com.signature = self.identity.sign(payload)
+            com = com.signed(self.identity.sign(signing_payload(com)))
             
             return com
         return None
 
     def on_commit(self, msg: Commit) -> bool:
         """Receives a Commit message. Returns True if committed (quorum reached)."""
-        self.commits.setdefault(msg.view_number, {}).setdefault(msg.sequence_number, {}).setdefault(msg.request_hash, []).append(msg)
-        return self.is_committed(msg.view_number, msg.sequence_number, msg.request_hash)
+        if self._below_checkpoint(msg.sequence_number) or not self.is_authentic(msg):
+            return False
+        self.commits.setdefault(msg.view_number, {}).setdefault(msg.sequence_number, {}).setdefault(msg.request_hash, {})[msg.agent_id] = msg
+        self._mark("commit", msg)
+        if self.is_committed(msg.view_number, msg.sequence_number, msg.request_hash):
+            self.executed.setdefault(msg.sequence_number, msg.request_hash)
+            return True
+        return False
 
     def is_prepared(self, view: int, seq: int, req_hash: str) -> bool:
-        prepares = self.prepares.get(view, {}).get(seq, {}).get(req_hash, [])
-        return len(prepares) >= self.quorum_size
+        return self.quorum_bits.get(("prepare", view, seq, req_hash), 0).bit_count() >= self.quorum_size
 
     def is_committed(self, view: int, seq: int, req_hash: str) -> bool:
-        commits = self.commits.get(view, {}).get(seq, {}).get(req_hash, [])
-        return len(commits) >= self.quorum_size
+        return self.quorum_bits.get(("commit", view, seq, req_hash), 0).bit_count() >= self.quorum_size
+
+    # ── Checkpoints & garbage collection ─────────────────────────
+
+    def _below_checkpoint(self, seq: int) -> bool:
+        return seq <= self.stable_checkpoint["sequence_number"]
+
+    def state_digest(self, seq: int) -> str:
+        """Digest chaining the last stable checkpoint with everything executed up to seq."""
+        log = [[s, h] for s, h in sorted(self.executed.items()) if s <= seq]
+        return sha256(canonical_json({
+            "prev": self.stable_checkpoint["state_digest"],
+            "seq": seq,
+            "log": log,
+        }))
+
+    def make_checkpoint(self, seq: int) -> Checkpoint:
+        """Signs this node's state digest at seq. Every sequence up to seq must have finished."""
+        cp = Checkpoint(
+            agent_id=self.agent_id,
+            view_number=self.view_number,
+            sequence_number=seq,
+            state_digest=self.state_digest(seq),
+        )
+        cp = cp.signed(self.identity.sign(signing_payload(cp)))
+        return cp
+
+    def on_checkpoint(self, msg: Checkpoint) -> bool:
+        """Receives a Checkpoint message. Returns True if it made a new checkpoint stable."""
+        if self._below_checkpoint(msg.sequence_number) or not self.is_authentic(msg):
+            return False
+        votes = self.checkpoints.setdefault(msg.sequence_number, {}).setdefault(msg.state_digest, {})
+        votes[msg.agent_id] = msg
+        if len(votes) < self.quorum_size:
+            return False
+
+        self.stable_checkpoint = {
+            "sequence_number": msg.sequence_number,
+            "state_digest": msg.state_digest,
+            "proof": [
+                {"agent_id": aid, "view_number": cp.view_number, "signature": cp.signature}
+                for aid, cp in votes.items()
+            ],
+        }
+        self.collect_garbage(msg.sequence_number)
+        return True
+
+    def collect_garbage(self, seq: int):
+        """Drops every log entry at or below a stable checkpoint."""
+        for log in (self.pre_prepares, self.prepares, self.commits):
+            for view in list(log):
+                for s in [s for s in log[view] if s <= seq]:
+                    del log[view][s]
+                if not log[view]:
+                    del log[view]
+        self.quorum_bits = {key: bits for key, bits in self.quorum_bits.items() if key[2] > seq}
+        self.sent_prepares = {slot for slot in self.sent_prepares if slot[1] > seq}
+        self.sent_commits = {slot for slot in self.sent_commits if slot[1] > seq}
+        for s in [s for s in self.executed if s <= seq]:
+            del self.executed[s]
+        for s in [s for s in self.checkpoints if s <= seq]:
+            del self.checkpoints[s]
+
+    # ── Snapshots & state transfer ───────────────────────────────
+
+    def state_summary(self) -> Dict[str, Any]:
+        """What a peer needs to catch up: the stable checkpoint (with its proof) and the
+        executed log above it."""
+        with self.lock:
+            return {
+                "agent_id": self.agent_id,
+                "view_number": self.view_number,
+                "sequence_number": self.sequence_number,
+                "stable_checkpoint": dict(self.stable_checkpoint),
+                "executed": [[s, h] for s, h in sorted(self.executed.items())],
+            }
+
+    def restore_state(self, summary: Dict[str, Any]):
+        """Reloads this node's own state_summary() (from a trusted local snapshot)."""
+        with self.lock:
+            self.view_number = summary["view_number"]
+            self.sequence_number = summary["sequence_number"]
+            self.stable_checkpoint = dict(summary["stable_checkpoint"])
+            self.executed = {s: h for s, h in summary["executed"]}
+
+    def checkpoint_is_proven(self, checkpoint: Dict[str, Any]) -> bool:
+        """True if checkpoint's proof holds 2f+1 authentic Checkpoint signatures from distinct agents."""
+        msgs = [
+            Checkpoint(
+                agent_id=p["agent_id"],
+                view_number=p.get("view_number", 0),
+                sequence_number=checkpoint["sequence_number"],
+                state_digest=checkpoint["state_digest"],
+            ).signed(p["signature"])
+            for p in checkpoint.get("proof", [])
+        ]
+        return len({m.agent_id for m in self.verify_batch(msgs)}) >= self.quorum_size
+
+    def install_state(self, summaries: List[Dict[str, Any]]) -> bool:
+        """
+        State transfer from peers' state_summary(), none of which is trusted on its own:
+        adopts the newest stable checkpoint whose proof verifies, then every executed entry
+        above it, and a view, that at least f+1 peers (so one honest one) report.
+        Returns True if the node moved forward.
+        """
+        with self.lock:
+            changed = False
+            newer = [
+                s["stable_checkpoint"] for s in summaries
+                if s["stable_checkpoint"]["sequence_number"] > self.stable_checkpoint["sequence_number"]
+            ]
+            for checkpoint in sorted(newer, key=lambda cp: -cp["sequence_number"]):
+                if self.checkpoint_is_proven(checkpoint):
+                    self.stable_checkpoint = dict(checkpoint)
+                    self.collect_garbage(checkpoint["sequence_number"])
+                    changed = True
+                    break
+
+            reports = Counter((s, h) for summary in summaries for s, h in summary["executed"])
+            for (s, h), count in sorted(reports.items()):
+                if count > self.f and not self._below_checkpoint(s) and s not in self.executed:
+                    self.executed[s] = h
+                    changed = True
+
+            views = sorted((s["view_number"] for s in summaries), reverse=True)
+            if len(views) > self.f and views[self.f] > self.view_number:
+                self.view_number = views[self.f]
+                changed = True
+            return changed
+
+    def log_size(self) -> int:
+        """Number of (view, seq) slots currently held across all message logs."""
+        with self.lock:
+            return sum(len(seqs) for log in (self.pre_prepares, self.prepares, self.commits) for seqs in log.values()) \
+                + len(self.executed) + len(self.checkpoints)
@@ -0,0 +1,74 @@
+"""
+Ordering protocols — how the nodes exchange Phases 1-3 of a round.
+
+The engine runs Phase 0, picks the primary and builds the certificate itself, and drives
+the message exchange through an OrderingProtocol: deliver the primary's Pre-Prepare and
+collect the Prepares, deliver those and collect the Commits, deliver those and report
+whether the round committed. Implementations differ only in who talks to whom:
+
+- "pbft" (broadcast.InProcessBroadcast): all-to-all Prepare and Commit, O(n²) messages
+- "hotstuff" (hotstuff.LinearBroadcast): votes go to the leader, which forwards them as
+  one quorum certificate per phase, O(n) messages
+- network.RemoteBroadcast: the PBFT exchange with replicas in other processes
+
+Every implementation leaves the nodes in the same state (prepared, committed, executed),
+so checkpoints, view changes and certificates are shared by all of them. CONSENSUS_PROTOCOL
+selects the in-process protocol: PROTOCOLS maps names to ProtocolFactory callables, which
+build an OrderingProtocol over the nodes for one round. Nothing requires an implementation
+to subclass InProcessBroadcast; it only has to satisfy OrderingProtocol.
+"""
+
+from typing import Dict, Any, List, Optional, Protocol
+
+from backend.consensus.messages import PrePrepare, Prepare, Commit
+from backend.consensus.pbft_node import PBFTNode
+from backend.consensus.broadcast import InProcessBroadcast
+from backend.consensus.hotstuff import LinearBroadcast
+from backend.crypto.signer import SigningService
+
+
+class OrderingProtocol(Protocol):
+    # per-round traffic counters: pre_prepare, prepare, commit, deliveries, signatures, ...
+    stats: Dict[str, int]
+
+    async def pre_prepare(self, msg: PrePrepare) -> List[Prepare]:
+        """Delivers the primary's Pre-Prepare; returns the Prepares the nodes signed."""
+        ...
+
+    async def prepare(
+        self,
+        prepares: List[Prepare],
+        node_results: Dict[str, Dict[str, Any]],
+        result_hashes: Optional[Dict[str, str]] = None,
+    ) -> List[Commit]:
+        """Delivers the Prepares to every node holding a result; returns the Commits signed."""
+        ...
+
+    async def commit(self, commits: List[Commit]) -> bool:
+        """Delivers the Commits; True if the round committed."""
+        ...
+
+
+class ProtocolFactory(Protocol):
+    def __call__(
+        self,
+        nodes: Dict[str, PBFTNode],
+        signer: Optional[SigningService] = None,
+        members: Optional[List[str]] = None,
+    ) -> OrderingProtocol:
+        """Builds the protocol for one round among members (None = every node)."""
+        ...
+
+
+PROTOCOLS: Dict[str, ProtocolFactory] = {
+    "pbft": InProcessBroadcast,
+    "hotstuff": LinearBroadcast,
+}
+
+
+def protocol_class(name: str) -> ProtocolFactory:
+    """The in-process OrderingProtocol registered under name."""
+    try:
+        return PROTOCOLS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown consensus protocol {name!r}, expected one of {sorted(PROTOCOLS)}") from None
@@ -0,0 +1,161 @@
+"""
+ReplicaServer — one PBFTNode running in its own process.
+
+The replica owns its agent's signing key, so its Prepare, Commit, Checkpoint and
+ViewChange messages are signed here and not in the API process. The node verifies every
+incoming message against the cluster's verify keys (batch-verifying each phase); forged or
+unsigned messages are dropped and counted.
+
+Each request frame carries an "op" and gets exactly one reply frame:
+
+    pre_prepare      {msg}           -> {prepare}
+    prepare          {msgs, result}  -> {commits}
+    commit           {msgs}          -> {committed}
+    view_change      {new_view}      -> {view_change}
+    make_checkpoint  {seq}           -> {checkpoint}
+    checkpoint       {msgs}          -> {stable_checkpoint}
+    state            {}              -> {state}
+    install_state    {summaries}     -> {installed}
+
+A replica that restarted empty is brought up to date by state transfer (install_state):
+it adopts the newest stable checkpoint whose 2f+1 proof verifies and the log above it
+that f+1 peers agree on, instead of replaying history.
+
+Run one with:
+    python -m backend.consensus.replica --agent-id agent_1 --listen 127.0.0.1:9101 --keys cluster_keys.json
+"""
+
+import os
+import json
+import asyncio
+import logging
+import argparse
+from typing import Dict, Any, List, Optional
+
+from backend.config import F_FAULTS
+from backend.consensus.pbft_node import PBFTNode
+from backend.consensus.messages import PBFTMessage
+from backend.consensus.transport import (
+    read_frame, write_frame, start_server, encode_message, decode_message, FrameError,
+)
+from backend.crypto.identity import AgentIdentity
+from backend.crypto.verifier import SignatureVerifier
+
+logger = logging.getLogger("byzantinemind.replica")
+
+
+def write_cluster_keys(path: str, agent_ids: List[str], seeds: Optional[Dict[str, bytes]] = None) -> Dict[str, bytes]:
+    """Stores one Ed25519 seed per agent (hex) in an owner-only JSON file, generating new
+    seeds unless given (e.g. StateStore.seeds(), to keep identities across restarts)."""
+    seeds = seeds or {agent_id: os.urandom(32) for agent_id in agent_ids}
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as fh:
+        json.dump({agent_id: seed.hex() for agent_id, seed in seeds.items()}, fh, indent=2)
+    return seeds
+
+
+def load_cluster_keys(path: str) -> Dict[str, bytes]:
+    with open(path) as fh:
+        return {agent_id: bytes.fromhex(seed) for agent_id, seed in json.load(fh).items()}
+
+
+class ReplicaServer:
+    def __init__(self, node: PBFTNode):
+        self.node = node
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _verified(self, raw: List[Dict[str, Any]]) -> List[PBFTMessage]:
+        """Decodes messages and keeps only those signed by the agent they claim to come from."""
+        rejected = self.node.rejected
+        messages = self.node.verify_batch([decode_message(item) for item in raw])
+        if self.node.rejected > rejected:
+            logger.warning(f"[{self.node.agent_id}] Dropped {self.node.rejected - rejected} message(s) with a bad signature")
+        return messages
+
+    def handle(self, frame: Dict[str, Any]) -> Dict[str, Any]:
+        """Applies one request frame to the node and builds the reply."""
+        op = frame.get("op")
+        node = self.node
+        if op == "pre_prepare":
+            prep = None
+            for msg in self._verified([frame["msg"]]):
+                prep = node.on_pre_prepare(msg)
+            reply = {"prepare": encode_message(prep) if prep else None}
+        elif op == "prepare":
+            commits = [node.on_prepare(msg, frame.get("result", {})) for msg in self._verified(frame.get("msgs", []))]
+            reply = {"commits": [encode_message(c) for c in commits if c]}
+        elif op == "commit":
+            committed = [node.on_commit(msg) for msg in self._verified(frame.get("msgs", []))]
+            reply = {"committed": any(committed)}
+        elif op == "view_change":
+            reply = {"view_change": encode_message(node.on_view_change(int(frame["new_view"])))}
+        elif op == "make_checkpoint":
+            reply = {"checkpoint": encode_message(node.make_checkpoint(int(frame["seq"])))}
+        elif op == "checkpoint":
+            for msg in self._verified(frame.get("msgs", [])):
+                node.on_checkpoint(msg)
+            reply = {"stable_checkpoint": node.stable_checkpoint}
+        elif op == "state":
+            reply = {"state": node.state_summary()}
+        elif op == "install_state":
+            reply = {"installed": node.install_state(frame.get("summaries", []))}
+        else:
+            raise FrameError(f"Unknown op: {op!r}")
+        reply.update({"agent_id": node.agent_id, "log_size": node.log_size(), "rejected": node.rejected})
+        return reply
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame is None:
+                    break
+                try:
+                    reply = self.handle(frame)
+                except Exception as e:
+                    reply = {"agent_id": self.node.agent_id, "error": str(e)}
+                await write_frame(writer, reply)
+        except (ConnectionError, FrameError) as e:
+            logger.warning(f"[{self.node.agent_id}] Connection dropped: {e}")
+        finally:
+            writer.close()
+
+    async def start(self, address: str):
+        self._server = await start_server(self._serve_connection, address)
+        logger.info(f"[{self.node.agent_id}] Replica listening on {address}")
+
+    async def serve_forever(self, address: str):
+        await self.start(address)
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+def build_replica(agent_id: str, seeds: Dict[str, bytes], f: int = F_FAULTS) -> ReplicaServer:
+    identity = AgentIdentity(agent_id, seed=seeds[agent_id])
+    verifier = SignatureVerifier({aid: AgentIdentity(aid, seed=seed).verify_key for aid, seed in seeds.items()})
+    return ReplicaServer(PBFTNode(agent_id, identity, f, verifier))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one ByzantineMind PBFT replica")
+    parser.add_argument("--agent-id", required=True)
+    parser.add_argument("--listen", required=True, help='"host:port" or "unix:/path.sock"')
+    parser.add_argument("--keys", required=True, help="cluster key file written by backend.cluster")
+    parser.add_argument("--f", type=int, default=F_FAULTS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s │ {args.agent_id:<8} │ %(levelname)-7s │ %(message)s")
+    replica = build_replica(args.agent_id, load_cluster_keys(args.keys), args.f)
+    try:
+        asyncio.run(replica.serve_forever(args.listen))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+RoundStore — bounded store of recent consensus rounds for debugging.
+
+Each finished round is kept as one compact record (ConsensusRound.to_record() encoded with
+the binary codec): per-agent results, errors and Phase 0 latencies, the signed
+Prepare/Commit messages, message counts, timings and the certificate.
+
+- In memory: an LRU bounded both by max_rounds and by max_bytes of encoded records
+- Evicted records spill to a SQLite file (db_path) so memory stays flat; without a
+  db_path they are dropped
+- Lookups by sequence number (a batch shares one), everything after a sequence number or
+  by action_id, across both tiers
+- Read-only lane rounds are not ordered: their certificate is only stamped with the low
+  watermark, so they are stored without a sequence number and never turn up in the
+  sequence lookups next to the round that really owns that slot (by_action finds them)
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from backend import codec
+from backend.config import ROUND_STORE_SIZE, ROUND_STORE_MAX_BYTES, ROUND_STORE_DB
+
+
+class RoundStore:
+    def __init__(
+        self,
+        max_rounds: int = ROUND_STORE_SIZE,
+        max_bytes: int = ROUND_STORE_MAX_BYTES,
+        db_path: str = ROUND_STORE_DB,
+    ):
+        self.max_rounds = max(1, max_rounds)
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        # action_id -> (sequence_number or None for a read, encoded record)
+        self._records: "OrderedDict[str, Tuple[Optional[int], bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.spilled = 0
+        self.dropped = 0
+        if db_path:
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS rounds (
+                        action_id TEXT PRIMARY KEY,
+                        sequence_number INTEGER,
+                        record BLOB
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS rounds_seq ON rounds (sequence_number)")
+
+    def record(self, record: Dict[str, Any]):
+        """Stores (or replaces) a round's record, evicting the least recently used ones."""
+        data = codec.encode(record)
+        action_id = record["action_id"]
+        seq = None if record.get("path") == "READ" else record["sequence_number"]
+        with self._lock:
+            previous = self._records.pop(action_id, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._records[action_id] = (seq, data)
+            self._bytes += len(data)
+            evicted = []
+            while len(self._records) > 1 and (
+                len(self._records) > self.max_rounds or self._bytes > self.max_bytes
+            ):
+                old_id, (seq, old) = self._records.popitem(last=False)
+                self._bytes -= len(old)
+                evicted.append((old_id, seq, old))
+        self._spill(evicted)
+
+    def _spill(self, evicted: List[Tuple[str, Optional[int], bytes]]):
+        if not evicted:
+            return
+        if not self.db_path:
+            self.dropped += len(evicted)
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO rounds (action_id, sequence_number, record) VALUES (?, ?, ?)",
+                evicted,
+            )
+        self.spilled += len(evicted)
+
+    def _query(self, sql: str, args: tuple) -> List[Dict[str, Any]]:
+        if not self.db_path:
+            return []
+        with sqlite3.connect(self.db_path) as conn:
+            return [codec.decode(row[0]) for row in conn.execute(sql, args)]
+
+    def by_sequence(self, seq: int) -> List[Dict[str, Any]]:
+        """Every stored round ordered under seq (several for a batch or several rosters)."""
+        with self._lock:
+            hits = [action_id for action_id, (s, _) in self._records.items() if s == seq]
+            for action_id in hits:
+                self._records.move_to_end(action_id)
+            found = {action_id: codec.decode(self._records[action_id][1]) for action_id in hits}
+        for record in self._query("SELECT record FROM rounds WHERE sequence_number = ?", (seq,)):
+            found.setdefault(record["action_id"], record)
+        return sorted(found.values(), key=lambda r: r["finished_at"])
+
+    def by_action(self, action_id: str) -> Optional[Dict[str, Any]]:
+        """The stored round of one request (reads included)."""
+        with self._lock:
+            found = self._records.get(action_id)
+            if found is not None:
+                self._records.move_to_end(action_id)
+                return codec.decode(found[1])
+        rows = self._query("SELECT record FROM rounds WHERE action_id = ?", (action_id,))
+        return rows[0] if rows else None
+
+    def since(self, seq: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """Up to limit rounds with a sequence number above seq, oldest first."""
+        with self._lock:
+            found = {
+                action_id: codec.decode(data)
+                for action_id, (s, data) in self._records.items() if s is not None and s > seq
+            }
+        rows = self._query(
+            "SELECT record FROM rounds WHERE sequence_number > ? ORDER BY sequence_number LIMIT ?",
+            (seq, limit),
+        )
+        for record in rows:
+            found.setdefault(record["action_id"], record)
+        ordered = sorted(found.values(), key=lambda r: (r["sequence_number"], r["finished_at"]))
+        return ordered[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rounds": len(self._records),
+            "bytes": self._bytes,
+            "max_rounds": self.max_rounds,
+            "max_bytes": self.max_bytes,
+            "spilled": self.spilled,
+            "dropped": self.dropped,
+            "persistent": bool(self.db_path),
+        }
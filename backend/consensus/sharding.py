@@ -0,0 +1,141 @@
+"""
+Shards — independent consensus committees routed by target namespace.
+
+Every shard has its own roster of agents and is run by its own ConsensusEngine, so it keeps
+its own sequence numbers, checkpoints and certificates (verified with its own agents' keys)
+and spends its own providers' rate limits. Shards are listed in a YAML file:
+
+    shards:
+      - id: payments
+        target: "^PAYMENTS"                    # regex on the intent's target
+        policy: human_review_for_financials    # and/or the PolicyEngine policy it matched
+        agents: ["openrouter:phi4", "cerebras:llama3.1-8b", "groq:llama-3.3-70b-versatile", "gemini:gemini-2.0-flash"]
+        f: 1                                   # optional, default F_FAULTS
+
+Shards are tried top to bottom and the first match takes the intent; an intent no shard
+matches runs on the main roster (DEFAULT_SHARD). Shard agents are numbered
+<id>_agent_1, <id>_agent_2, ... so their identities never collide with the main roster's.
+
+The router keeps a bounded index of intent_id -> (shard, sequence number, path) so a
+decision can be traced back to the committee (and the sequence) that ordered it. Reads
+certified on the read-only lane are not ordered and are indexed without a sequence number.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from backend.agents.base import BaseAgent
+from backend.agents.factory import create_model_agents
+from backend.config import F_FAULTS, SHARD_INDEX_SIZE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD = "default"
+
+
+@dataclass
+class Shard:
+    id: str
+    agents: List[BaseAgent]
+    target: Optional[str] = None  # regex matched (case-insensitively) against the intent's target
+    policy: Optional[str] = None  # PolicyEngine policy id
+    f: int = F_FAULTS
+    _pattern: Optional[re.Pattern] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if not self.target and not self.policy:
+            raise ValueError(f"Shard {self.id!r} needs a target or a policy rule")
+        if len(self.agents) < 3 * self.f + 1:
+            raise ValueError(
+                f"Shard {self.id!r} needs at least {3 * self.f + 1} agents for f={self.f}, got {len(self.agents)}"
+            )
+        if self.target:
+            self._pattern = re.compile(self.target, re.IGNORECASE)
+
+    def matches(self, target: str, policy_id: Optional[str]) -> bool:
+        """Both rules, when present, must hold."""
+        if self._pattern is not None and not self._pattern.search(target):
+            return False
+        return self.policy is None or self.policy == policy_id
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "target": self.target,
+            "policy": self.policy,
+            "f": self.f,
+            "agents": [agent.agent_id for agent in self.agents],
+        }
+
+
+def load_shards(path: str, mode: str) -> List[Shard]:
+    """Builds the shards listed in the YAML file at path, with their agents for mode."""
+    with open(path) as f:
+        data = yaml.safe_load(f) or {}
+    shards: List[Shard] = []
+    for entry in data.get("shards", []):
+        shard_id = str(entry["id"])
+        if shard_id == DEFAULT_SHARD or any(s.id == shard_id for s in shards):
+            raise ValueError(f"Duplicate shard id {shard_id!r}")
+        specs = entry.get("agents", [])
+        if isinstance(specs, str):
+            specs = specs.split(",")
+        shards.append(Shard(
+            id=shard_id,
+            agents=create_model_agents(mode, specs, f"{shard_id}_agent"),
+            target=entry.get("target"),
+            policy=entry.get("policy"),
+            f=int(entry.get("f", F_FAULTS)),
+        ))
+    logger.info(f"Loaded {len(shards)} consensus shards from {path}")
+    return shards
+
+
+class ShardRouter:
+    def __init__(self, shards: List[Shard], index_size: int = SHARD_INDEX_SIZE):
+        self.shards = shards
+        self.index_size = max(1, index_size)
+        # intent_id -> (shard id, sequence number or None until ordered, certificate path)
+        self._index: "OrderedDict[str, Tuple[str, Optional[int], Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.routed: Dict[str, int] = {DEFAULT_SHARD: 0, **{s.id: 0 for s in shards}}
+
+    def route(self, intent_id: str, target: str, policy_id: Optional[str] = None) -> Optional[Shard]:
+        """The first shard whose rule matches, or None for the main roster. Indexes intent_id."""
+        shard = next((s for s in self.shards if s.matches(target, policy_id)), None)
+        name = shard.id if shard else DEFAULT_SHARD
+        self.routed[name] += 1
+        self._put(intent_id, name, None, None)
+        return shard
+
+    def record(self, intent_id: str, shard_id: str, sequence_number: Optional[int], path: Optional[str] = None):
+        """Records the sequence number the shard ordered intent_id under (none for a READ)."""
+        self._put(intent_id, shard_id, None if path == "READ" else sequence_number, path)
+
+    def _put(self, intent_id: str, shard_id: str, sequence_number: Optional[int], path: Optional[str]):
+        with self._lock:
+            self._index.pop(intent_id, None)
+            self._index[intent_id] = (shard_id, sequence_number, path)
+            while len(self._index) > self.index_size:
+                self._index.popitem(last=False)
+
+    def lookup(self, intent_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._index.get(intent_id)
+        if entry is None:
+            return None
+        return {"intent_id": intent_id, "shard": entry[0], "sequence_number": entry[1], "path": entry[2]}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "shards": [s.describe() for s in self.shards],
+            "routed": dict(self.routed),
+            "indexed": len(self._index),
+            "index_size": self.index_size,
+        }
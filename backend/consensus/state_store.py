@@ -0,0 +1,127 @@
+"""
+StateStore — durable snapshot of the engines' ordering state and the agents' signing keys.
+
+One snapshot file (the canonical codec, replaced atomically) holds, per engine roster:
+its sequence and view numbers, the last stable checkpoint and each in-process node's
+state summary (stable checkpoint plus the executed log above it, at most one checkpoint
+interval long). A restarted engine restores this in milliseconds instead of starting over
+at sequence 0 / view 0; rounds that were in flight at the crash are abandoned and their
+sequence numbers never reused.
+
+The agents' Ed25519 seeds are stored alongside, sealed with a NaCl SecretBox, so agents
+keep their identities and certificates issued before a restart stay verifiable. The box
+key comes from STATE_SNAPSHOT_KEY (64 hex chars) or, without it, from an owner-only
+"<path>.key" file created on first use. The replica cluster launcher draws its replicas'
+seeds from the same store (seeds()), so a restarted cluster keeps its identities too.
+
+Engines write their snapshot from the default executor after every released sequence and
+view change, coalescing writes that pile up (ConsensusEngine._persist), so the fsync never
+blocks the event loop.
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+
+from nacl.secret import SecretBox
+from nacl.utils import random as random_bytes
+
+from backend import codec
+from backend.agents.base import BaseAgent
+from backend.config import STATE_SNAPSHOT_PATH, STATE_SNAPSHOT_KEY
+from backend.crypto.identity import AgentIdentity
+
+logger = logging.getLogger("byzantinemind.state")
+
+VERSION = 1
+
+
+class StateStore:
+    def __init__(self, path: str = STATE_SNAPSHOT_PATH, key: Optional[bytes] = None):
+        self.path = path
+        self._box = SecretBox(key or self._load_key())
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {"version": VERSION, "engines": {}, "keys": ""}
+        self.restored = False
+        self.saves = 0
+        if os.path.exists(path):
+            with open(path, "rb") as fh:
+                state = codec.decode(fh.read())
+            if state.get("version") != VERSION:
+                raise ValueError(f"Unsupported snapshot version {state.get('version')!r} in {path}")
+            self._state = state
+            self.restored = True
+
+    def _load_key(self) -> bytes:
+        if STATE_SNAPSHOT_KEY:
+            return bytes.fromhex(STATE_SNAPSHOT_KEY)
+        key_path = f"{self.path}.key"
+        if os.path.exists(key_path):
+            with open(key_path) as fh:
+                return bytes.fromhex(fh.read().strip())
+        key = random_bytes(SecretBox.KEY_SIZE)
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as fh:
+            fh.write(key.hex())
+        return key
+
+    def _seeds(self) -> Dict[str, str]:
+        sealed = self._state.get("keys")
+        return codec.decode(self._box.decrypt(bytes.fromhex(sealed))) if sealed else {}
+
+    def identities(self, agents: List[BaseAgent]) -> int:
+        """Gives every agent its stored identity; agents without one keep theirs, which is
+        stored. Returns the number of identities restored."""
+        with self._lock:
+            seeds = self._seeds()
+            restored = 0
+            for agent in agents:
+                seed = seeds.get(agent.agent_id)
+                if seed:
+                    agent.identity = AgentIdentity(agent.agent_id, seed=bytes.fromhex(seed))
+                    restored += 1
+                else:
+                    seeds[agent.agent_id] = agent.identity.signing_key.encode().hex()
+            if len(seeds) > restored:
+                self._state["keys"] = self._box.encrypt(codec.encode(seeds)).hex()
+                self._write()
+        return restored
+
+    def seeds(self, agent_ids: List[str]) -> Dict[str, bytes]:
+        """The stored seed of every agent in agent_ids, generating (and storing) missing ones."""
+        with self._lock:
+            seeds = self._seeds()
+            missing = [agent_id for agent_id in agent_ids if agent_id not in seeds]
+            for agent_id in missing:
+                seeds[agent_id] = random_bytes(32).hex()
+            if missing:
+                self._state["keys"] = self._box.encrypt(codec.encode(seeds)).hex()
+                self._write()
+        return {agent_id: bytes.fromhex(seeds[agent_id]) for agent_id in agent_ids}
+
+    def engine_state(self, scope: str) -> Optional[Dict[str, Any]]:
+        return self._state["engines"].get(scope)
+
+    def save(self, scope: str, state: Dict[str, Any]):
+        """Records one engine's snapshot (ConsensusEngine.snapshot()) and writes the file."""
+        with self._lock:
+            self._state["engines"][scope] = state
+            self._write()
+
+    def _write(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(codec.encode(self._state))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        self.saves += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "restored": self.restored,
+            "engines": len(self._state["engines"]),
+            "saves": self.saves,
+        }
@@ -0,0 +1,97 @@
+"""
+VoteTally — Phase 0 vote counting over agent indices.
+
+Each agent owns one slot of a fixed array indexed by its position in the roster, holding
+the code of its current decision (-1 = no vote). Recording, replacing or withdrawing a
+vote is O(1) and keeps a per-decision count array up to date, so finding the leading
+decision costs O(#decisions) instead of re-counting every vote. The voters of a decision
+are available as an int bitmap (bit i = roster[i]).
+
+NumPy backs the arrays when it is installed (bulk loads are one vectorized bincount);
+without it plain lists are used and results are identical.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional; the list-backed path gives the same answers
+    np = None
+
+NO_VOTE = -1
+
+
+class VoteTally:
+    def __init__(self, agent_ids: Sequence[str]):
+        self.agent_ids = list(agent_ids)
+        self.index = {agent_id: i for i, agent_id in enumerate(self.agent_ids)}
+        self.labels: List[Any] = []  # code -> decision
+        self._codes: Dict[Any, int] = {}  # decision -> code
+        n = len(self.agent_ids)
+        self._votes = np.full(n, NO_VOTE, dtype=np.int32) if np is not None else [NO_VOTE] * n
+        self._counts: List[int] = []
+
+    @classmethod
+    def of(cls, agent_ids: Sequence[str], results: Dict[str, Dict[str, Any]]) -> "VoteTally":
+        """A tally of every result's "decision" in one pass."""
+        tally = cls(agent_ids)
+        voters = [(tally.index[aid], tally._code(r.get("decision"))) for aid, r in results.items() if aid in tally.index]
+        if not voters:
+            return tally
+        if np is not None:
+            slots, codes = np.array(voters, dtype=np.int32).T
+            tally._votes[slots] = codes
+            tally._counts = np.bincount(codes, minlength=len(tally.labels)).tolist()
+        else:
+            for slot, code in voters:
+                tally._votes[slot] = code
+                tally._counts[code] += 1
+        return tally
+
+    def _code(self, decision: Any) -> int:
+        code = self._codes.get(decision)
+        if code is None:
+            code = self._codes[decision] = len(self.labels)
+            self.labels.append(decision)
+            self._counts.append(0)
+        return code
+
+    def record(self, agent_id: str, decision: Any):
+        """Sets (or replaces) agent_id's vote."""
+        slot, code = self.index[agent_id], self._code(decision)
+        previous = int(self._votes[slot])
+        if previous != NO_VOTE:
+            self._counts[previous] -= 1
+        self._votes[slot] = code
+        self._counts[code] += 1
+
+    def withdraw(self, agent_id: str):
+        slot = self.index[agent_id]
+        previous = int(self._votes[slot])
+        if previous != NO_VOTE:
+            self._counts[previous] -= 1
+            self._votes[slot] = NO_VOTE
+
+    @property
+    def total(self) -> int:
+        return sum(self._counts)
+
+    def counts(self) -> Dict[Any, int]:
+        return {label: count for label, count in zip(self.labels, self._counts) if count}
+
+    def leader(self) -> Tuple[Optional[Any], int]:
+        """(decision, votes) of the most voted decision. A tie goes to the decision that was
+        seen first (the lowest code), like Counter.most_common, not the first to reach that count."""
+        if not self.total:
+            return None, 0
+        code = max(range(len(self._counts)), key=self._counts.__getitem__)
+        return self.labels[code], self._counts[code]
+
+    def voters(self, decision: Any) -> int:
+        """Bitmap of the agents currently voting for decision."""
+        code = self._codes.get(decision)
+        if code is None:
+            return 0
+        if np is not None:
+            return sum(1 << int(i) for i in np.flatnonzero(self._votes == code))
+        return sum(1 << i for i, c in enumerate(self._votes) if c == code)
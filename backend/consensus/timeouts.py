@@ -0,0 +1,94 @@
+"""
+Adaptive timers for the consensus engine.
+
+LatencyTracker  — rolling per-agent latency samples; each agent's Phase 0 timeout is its
+                  observed p99 × factor, clamped to [min_timeout, max_timeout]. Agents with
+                  too few samples get max_timeout (the global CONSENSUS_TIMEOUT_SEC).
+                  A timed-out call is recorded as a censored sample at its timeout, so an
+                  agent whose latency steps up for good widens its timeout (by up to
+                  factor per timeout, never past max_timeout) until its answers fit again.
+ViewChangeBackoff — the pause before a new view doubles on every consecutive view change
+                  and resets once a round commits.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Any, Optional
+
+from backend.config import (
+    CONSENSUS_TIMEOUT_SEC,
+    ADAPTIVE_TIMEOUT_FACTOR,
+    ADAPTIVE_TIMEOUT_MIN_SEC,
+    VIEW_CHANGE_BASE_SEC,
+    VIEW_CHANGE_MAX_SEC,
+)
+
+
+class LatencyTracker:
+    def __init__(
+        self,
+        window: int = 100,
+        factor: float = ADAPTIVE_TIMEOUT_FACTOR,
+        min_timeout: float = ADAPTIVE_TIMEOUT_MIN_SEC,
+        max_timeout: float = CONSENSUS_TIMEOUT_SEC,
+        min_samples: int = 5,
+    ):
+        self.window = window
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, agent_id: str, seconds: float):
+        """Record a successful call's latency."""
+        self._samples.setdefault(agent_id, deque(maxlen=self.window)).append(seconds)
+
+    def record_timeout(self, agent_id: str):
+        """Record a call that hit its timeout: it took at least that long."""
+        self.record(agent_id, self.timeout_for(agent_id))
+
+    def percentile(self, agent_id: str, q: float) -> Optional[float]:
+        """Nearest-rank percentile (q in [0, 1]) of an agent's samples, or None if too few."""
+        samples = self._samples.get(agent_id)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        rank = max(0, math.ceil(q * len(ordered)) - 1)
+        return ordered[rank]
+
+    def timeout_for(self, agent_id: str) -> float:
+        p99 = self.percentile(agent_id, 0.99)
+        if p99 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.factor))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            agent_id: {
+                "samples": len(samples),
+                "p50_ms": _ms(self.percentile(agent_id, 0.5)),
+                "p99_ms": _ms(self.percentile(agent_id, 0.99)),
+                "timeout_ms": _ms(self.timeout_for(agent_id)),
+            }
+            for agent_id, samples in self._samples.items()
+        }
+
+
+class ViewChangeBackoff:
+    def __init__(self, base: float = VIEW_CHANGE_BASE_SEC, maximum: float = VIEW_CHANGE_MAX_SEC):
+        self.base = base
+        self.maximum = maximum
+        self.consecutive_failures = 0
+
+    def next_delay(self) -> float:
+        delay = min(self.maximum, self.base * (2 ** self.consecutive_failures))
+        self.consecutive_failures += 1
+        return delay
+
+    def reset(self):
+        self.consecutive_failures = 0
+
+
+def _ms(seconds: Optional[float]) -> Optional[int]:
+    return None if seconds is None else int(seconds * 1000)
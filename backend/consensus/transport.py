@@ -0,0 +1,96 @@
+"""
+Length-prefixed framing for replicas running in separate processes.
+
+Every frame is a 4-byte big-endian length followed by that many bytes of canonical JSON.
+Addresses are either "host:port" (TCP) or "unix:/path/to.sock" (Unix domain socket).
+
+PBFT messages travel inside frames as {"kind": <class name>, "body": <fields incl. signature>}
+so the receiver can rebuild the exact message type — validating every field, since the frame
+came from another process — and check its signature.
+"""
+
+import json
+import struct
+import asyncio
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+
+from backend.consensus.messages import PBFTMessage, MESSAGE_TYPES, message_fields, validate_message
+from backend.utils import canonical_json
+
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+
+class FrameError(Exception):
+    """Raised on a malformed or oversized frame."""
+
+
+def encode_message(msg: PBFTMessage) -> Dict[str, Any]:
+    return {"kind": type(msg).__name__, "body": message_fields(msg)}
+
+
+def decode_message(data: Dict[str, Any]) -> PBFTMessage:
+    cls = MESSAGE_TYPES.get(data.get("kind"))
+    if cls is None:
+        raise FrameError(f"Unknown message kind: {data.get('kind')!r}")
+    return validate_message(cls, data.get("body", {}))
+
+
+async def write_frame(writer: asyncio.StreamWriter, payload: Dict[str, Any]):
+    data = canonical_json(payload).encode()
+    if len(data) > MAX_FRAME_BYTES:
+        raise FrameError(f"Frame of {len(data)} bytes exceeds {MAX_FRAME_BYTES}")
+    writer.write(FRAME_HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Reads one frame; None once the peer has closed the connection."""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise FrameError(f"Peer announced a {length}-byte frame (max {MAX_FRAME_BYTES})")
+    try:
+        payload = json.loads(await reader.readexactly(length))
+    except asyncio.IncompleteReadError:
+        raise FrameError(f"Connection closed inside a {length}-byte frame")
+    except ValueError as e:  # json.JSONDecodeError and invalid UTF-8
+        raise FrameError(f"Malformed frame: {e}")
+    if not isinstance(payload, dict):
+        raise FrameError(f"Frame is a {type(payload).__name__}, not an object")
+    return payload
+
+
+def _unix_path(address: str) -> Optional[str]:
+    return address[len("unix:"):] if address.startswith("unix:") else None
+
+
+async def open_connection(address: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    path = _unix_path(address)
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    host, _, port = address.rpartition(":")
+    return await asyncio.open_connection(host, int(port))
+
+
+async def start_server(
+    handler: Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]],
+    address: str,
+) -> asyncio.AbstractServer:
+    path = _unix_path(address)
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path)
+    host, _, port = address.rpartition(":")
+    return await asyncio.start_server(handler, host, int(port))
+
+
+def parse_peers(spec: str) -> Dict[str, str]:
+    """Parses "agent_1=127.0.0.1:9101,agent_2=unix:/tmp/a2.sock" into {agent_id: address}."""
+    peers = {}
+    for entry in filter(None, (e.strip() for e in spec.split(","))):
+        agent_id, _, address = entry.partition("=")
+        peers[agent_id] = address
+    return peers
@@ -1,2 +1,4 @@
 from backend.crypto.identity import AgentIdentity
 from backend.crypto.certificate import ConsensusCertificate
+from backend.crypto.verifier import SignatureVerifier
+from backend.crypto.signer import SigningService
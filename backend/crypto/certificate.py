@@ -6,12 +6,47 @@ This is the core auditable artifact. Any third party can independently verify:
 2. At least 2f+1 agents participated in both Prepare and Commit quorums
 3. The request hash is consistent throughout
 4. No tampering occurred (hash chain integrity)
+
+Batched certificates: when several requests were ordered under one sequence number, the
+quorum signatures cover the batch's Merkle roots (request root and result root) and each
+request's certificate carries inclusion proofs for its own request_hash and result_hash.
+
+Certificate paths:
+- "PBFT": full three-phase exchange; 2f+1 prepare signatures over the request hash and
+  2f+1 commit signatures over the result hash.
+- "FAST": speculative single-phase certificate issued when all 3f+1 agents agreed in
+  Phase 0; no prepare quorum, 3f+1 signatures over vote_digest(request_hash, result_hash).
+- "READ": read-only lane for LOW-risk requests; 2f+1 signatures over the same vote digest.
+  Reads are not ordered: sequence_number is the last sequence finished when it was read.
+
+Sampled committees: a round run by a committee drawn from a larger roster carries
+committee = {"beacon", "size", "roster", "members"}; verification recomputes the draw
+(backend.crypto.sortition) from the recorded roster, so holding more keys than the round's
+roster (spares, other shards) does not change it, and rejects signers outside it. Every
+roster agent must be known to the verifier.
+
+Hot spares: when roster agents failed in Phase 0 and spares with their own identities
+took their place, substitutions = {failed agent_id: spare agent_id} records the swap.
+Verification needs the spares' keys and rejects signatures from the replaced agents.
+
+to_bytes() / from_bytes() use the compact canonical codec (backend.codec): signatures and
+hashes are stored raw, and the round trip back to to_dict() is lossless.
 """
 
 import datetime
 from typing import List, Dict, Any, Optional
 from nacl.signing import VerifyKey
+from backend import codec
 from backend.utils import sha256
+from backend.crypto.merkle import verify_merkle_proof
+from backend.crypto.sortition import committee_seed, sample_committee
+from backend.crypto.verifier import SignatureVerifier
+
+
+def vote_digest(request_hash: str, result_hash: str) -> str:
+    """What an agent signs to vouch for a result to a request in a single step."""
+    return sha256(f"{request_hash}:{result_hash}")
+
 
 class ConsensusCertificate:
     def __init__(
@@ -25,6 +60,10 @@ class ConsensusCertificate:
         result_hash: str,
         decision: str,
         timestamp: Optional[str] = None,
+        batch: Optional[Dict[str, Any]] = None,
+        path: str = "PBFT",
+        committee: Optional[Dict[str, Any]] = None,
+        substitutions: Optional[Dict[str, str]] = None,
     ):
         self.view_number = view_number
         self.sequence_number = sequence_number
@@ -35,9 +74,34 @@ class ConsensusCertificate:
         self.result_hash = result_hash
         self.decision = decision
         self.timestamp = timestamp or datetime.datetime.now(datetime.timezone.utc).isoformat()
+        # {"size", "index", "request_root", "request_proof", "result_root", "result_proof"}
+        self.batch = batch
+        self.path = path
+        self.committee = committee
+        self.substitutions = substitutions or {}
+
+    @property
+    def prepare_message(self) -> str:
+        """The message signed by the prepare quorum."""
+        return self.batch["request_root"] if self.batch else self.request_hash
+
+    @property
+    def commit_message(self) -> str:
+        """The message signed by the commit quorum."""
+        if self.path in ("FAST", "READ"):
+            return vote_digest(self.request_hash, self.result_hash)
+        return self.batch["result_root"] if self.batch else self.result_hash
+
+    def required_quorums(self, f: int) -> Dict[str, int]:
+        """Minimum number of valid prepare and commit signatures for this certificate's path."""
+        if self.path == "FAST":
+            return {"prepare": 0, "commit": 3 * f + 1}
+        if self.path == "READ":
+            return {"prepare": 0, "commit": 2 * f + 1}
+        return {"prepare": 2 * f + 1, "commit": 2 * f + 1}
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "view_number": self.view_number,
             "sequence_number": self.sequence_number,
             "request_hash": self.request_hash,
@@ -47,65 +111,117 @@ class ConsensusCertificate:
             "result_hash": self.result_hash,
             "decision": self.decision,
             "timestamp": self.timestamp,
+            "path": self.path,
             "quorum_met": {
                 "prepare": len(self.prepare_quorum),
                 "commit": len(self.commit_quorum),
             },
         }
+        if self.batch:
+            data["batch"] = self.batch
+        if self.committee:
+            data["committee"] = self.committee
+        if self.substitutions:
+            data["substitutions"] = self.substitutions
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConsensusCertificate":
+        """Rebuilds a certificate from to_dict() output (quorum_met is derived, not read)."""
+        return cls(
+            view_number=data["view_number"],
+            sequence_number=data["sequence_number"],
+            request_hash=data["request_hash"],
+            pre_prepare_signature=data["pre_prepare_signature"],
+            prepare_quorum=data["prepare_quorum"],
+            commit_quorum=data["commit_quorum"],
+            result_hash=data["result_hash"],
+            decision=data["decision"],
+            timestamp=data.get("timestamp"),
+            batch=data.get("batch"),
+            path=data.get("path", "PBFT"),
+            committee=data.get("committee"),
+            substitutions=data.get("substitutions"),
+        )
+
+    def to_bytes(self) -> bytes:
+        return codec.encode(self.to_dict())
 
-    def verify(self, agent_verify_keys: Dict[str, VerifyKey], f: int) -> Dict[str, Any]:
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ConsensusCertificate":
+        return cls.from_dict(codec.decode(data))
+
+    def verify(
+        self, agent_verify_keys: Dict[str, VerifyKey], f: int, verifier: Optional[SignatureVerifier] = None
+    ) -> Dict[str, Any]:
         """
         Independently verify the certificate's cryptographic integrity.
         
         Args:
             agent_verify_keys: Mapping of agent_id -> Ed25519 VerifyKey
             f: Number of tolerable faults
+            verifier: Optional shared SignatureVerifier (its cache makes re-verification cheap);
+                      by default a fresh one over agent_verify_keys is used
             
         Returns:
             Dict with verification results
         """
-        quorum_size = 2 * f + 1
+        required = self.required_quorums(f)
+        quorum_size = required["commit"]
         errors = []
 
         # Check prepare quorum size
-        if len(self.prepare_quorum) < quorum_size:
-            errors.append(f"Prepare quorum too small: {len(self.prepare_quorum)} < {quorum_size}")
+        if len(self.prepare_quorum) < required["prepare"]:
+            errors.append(f"Prepare quorum too small: {len(self.prepare_quorum)} < {required['prepare']}")
 
         # Check commit quorum size
-        if len(self.commit_quorum) < quorum_size:
-            errors.append(f"Commit quorum too small: {len(self.commit_quorum)} < {quorum_size}")
+        if len(self.commit_quorum) < required["commit"]:
+            errors.append(f"Commit quorum too small: {len(self.commit_quorum)} < {required['commit']}")
 
-        # Verify each prepare signature
-        valid_prepares = 0
-        for entry in self.prepare_quorum:
-            agent_id = entry.get("agent_id")
-            sig = entry.get("signature")
-            vk = agent_verify_keys.get(agent_id)
-            if vk and sig:
-                try:
-                    vk.verify(self.request_hash.encode(), bytes.fromhex(sig))
-                    valid_prepares += 1
-                except Exception:
-                    errors.append(f"Invalid prepare signature from {agent_id}")
-            else:
-                errors.append(f"Missing verify key or signature for {agent_id}")
+        # Batched certificates: the request and result must be included under the signed roots
+        if self.batch:
+            if not verify_merkle_proof(self.request_hash, self.batch.get("request_proof", []), self.batch.get("request_root", "")):
+                errors.append("Request hash is not included in the batch request root")
+            if not verify_merkle_proof(self.result_hash, self.batch.get("result_proof", []), self.batch.get("result_root", "")):
+                errors.append("Result hash is not included in the batch result root")
+
+        # Sampled committee: the draw must be reproducible and only its members may sign
+        members = None
+        if self.committee:
+            seed = committee_seed(self.committee.get("beacon", ""), self.sequence_number, self.request_hash)
+            roster = self.committee.get("roster") or list(agent_verify_keys)
+            unknown = sorted(set(roster) - set(agent_verify_keys))
+            if unknown:
+                errors.append(f"Committee roster includes unknown agents: {unknown}")
+            members = set(sample_committee(roster, self.committee.get("size", 0), seed))
+            if members != set(self.committee.get("members", [])):
+                errors.append("Committee does not match the sampled draw for this round")
 
-        # Verify each commit signature
-        valid_commits = 0
-        for entry in self.commit_quorum:
+        # Verify every signature in one batch (each agent counts once per quorum)
+        verifier = verifier or SignatureVerifier(agent_verify_keys)
+        entries = [("prepare", self.prepare_message, e) for e in self.prepare_quorum] + \
+                  [("commit", self.commit_message, e) for e in self.commit_quorum]
+        results = verifier.verify_many([
+            (e.get("agent_id", ""), message, e.get("signature", "")) for _, message, e in entries
+        ])
+        signers: Dict[str, set] = {"prepare": set(), "commit": set()}
+        for (kind, _, entry), ok in zip(entries, results):
             agent_id = entry.get("agent_id")
-            sig = entry.get("signature")
-            vk = agent_verify_keys.get(agent_id)
-            if vk and sig:
-                try:
-                    vk.verify(self.result_hash.encode(), bytes.fromhex(sig))
-                    valid_commits += 1
-                except Exception:
-                    errors.append(f"Invalid commit signature from {agent_id}")
-            else:
+            if ok and members is not None and agent_id not in members:
+                errors.append(f"{kind.capitalize()} signature from {agent_id}, who is not in the committee")
+            elif ok and agent_id in self.substitutions:
+                errors.append(f"{kind.capitalize()} signature from {agent_id}, who was replaced by {self.substitutions[agent_id]}")
+            elif ok:
+                signers[kind].add(agent_id)
+            elif agent_id not in verifier.verify_keys or not entry.get("signature"):
                 errors.append(f"Missing verify key or signature for {agent_id}")
+            else:
+                errors.append(f"Invalid {kind} signature from {agent_id}")
+        prepare_signers, commit_signers = signers["prepare"], signers["commit"]
 
-        is_valid = len(errors) == 0 and valid_prepares >= quorum_size and valid_commits >= quorum_size
+        valid_prepares = len(prepare_signers)
+        valid_commits = len(commit_signers)
+        is_valid = len(errors) == 0 and valid_prepares >= required["prepare"] and valid_commits >= required["commit"]
 
         return {
             "valid": is_valid,
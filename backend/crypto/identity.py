@@ -1,9 +1,11 @@
+from typing import Optional
 from nacl.signing import SigningKey
 
 class AgentIdentity:
-    def __init__(self, agent_id: str):
+    def __init__(self, agent_id: str, seed: Optional[bytes] = None):
+        """A fresh keypair, or a deterministic one from a 32-byte seed (shared with replica processes)."""
         self.agent_id = agent_id
-        self.signing_key = SigningKey.generate()
+        self.signing_key = SigningKey(seed) if seed else SigningKey.generate()
         self.verify_key = self.signing_key.verify_key
 
     def sign(self, message: str) -> str:
@@ -0,0 +1,60 @@
+"""
+Merkle trees over hex SHA-256 digests, used to commit to a batch of requests with one root.
+
+Leaves and interior nodes are domain-separated ("0" / "1" prefixes) so an interior node
+can never be passed off as a leaf. An odd node at the end of a level is promoted
+unchanged rather than duplicated.
+
+Inclusion proofs are lists of {"hash": sibling, "side": "L" | "R"} from leaf to root.
+"""
+
+from typing import List, Dict
+from backend.utils import sha256
+
+
+def _leaf(digest: str) -> str:
+    return sha256("0" + digest)
+
+
+def _node(left: str, right: str) -> str:
+    return sha256("1" + left + right)
+
+
+def _levels(digests: List[str]) -> List[List[str]]:
+    if not digests:
+        raise ValueError("Cannot build a Merkle tree over an empty batch")
+    levels = [[_leaf(d) for d in digests]]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parent = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parent.append(level[-1])
+        levels.append(parent)
+    return levels
+
+
+def merkle_root(digests: List[str]) -> str:
+    """Root over an ordered list of hex digests."""
+    return _levels(digests)[-1][0]
+
+
+def merkle_proof(digests: List[str], index: int) -> List[Dict[str, str]]:
+    """Inclusion proof for digests[index]."""
+    proof = []
+    for level in _levels(digests)[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append({"hash": level[sibling], "side": "L" if sibling < index else "R"})
+        index //= 2
+    return proof
+
+
+def verify_merkle_proof(digest: str, proof: List[Dict[str, str]], root: str) -> bool:
+    """Checks that digest is included under root."""
+    current = _leaf(digest)
+    for step in proof:
+        if step.get("side") == "L":
+            current = _node(step.get("hash", ""), current)
+        else:
+            current = _node(current, step.get("hash", ""))
+    return current == root
@@ -0,0 +1,49 @@
+"""
+SigningService — Ed25519 signing off the asyncio event loop.
+
+Signing runs on a dedicated thread pool (libsodium releases the GIL), so a round that has
+to produce dozens of signatures no longer stalls HTTP handlers and WebSocket sends on the
+loop. sign_many() signs a whole quorum concurrently; run() offloads any other
+signature-heavy work, such as a PBFT node processing a phase.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple, TypeVar
+
+from backend.config import SIGNING_WORKERS
+from backend.crypto.identity import AgentIdentity
+
+T = TypeVar("T")
+
+
+class SigningService:
+    def __init__(self, workers: int = SIGNING_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="sig-sign")
+        self.signatures = 0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Runs fn(*args) on the signing pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def sign(self, identity: AgentIdentity, message: str) -> str:
+        self.signatures += 1
+        return await self.run(identity.sign, message)
+
+    async def sign_many(self, jobs: List[Tuple[AgentIdentity, str]]) -> List[str]:
+        """Signs every (identity, message) pair concurrently; signatures are in input order."""
+        return list(await asyncio.gather(*(self.sign(identity, message) for identity, message in jobs)))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_default: "SigningService | None" = None
+
+
+def default_signing_service() -> SigningService:
+    """Process-wide service shared by every engine that does not bring its own."""
+    global _default
+    if _default is None:
+        _default = SigningService()
+    return _default
@@ -0,0 +1,29 @@
+"""
+Verifiable committee sampling.
+
+A sampled round is run by a committee of `size` agents drawn from the roster. The draw is
+deterministic: every agent is ranked by sha256(seed:agent_id) and the lowest `size` hashes
+win, with the seed bound to the round (committee_seed). Anyone holding the roster and the
+certificate can recompute the committee and check that only its members signed.
+
+The beacon mixed into the seed is the engine's last stable checkpoint digest, which is
+signed by 2f+1 nodes and not known to a client in advance, so a client cannot grind its
+request to pick a committee.
+
+As long as the roster holds at most f faulty agents, any committee of 3f+1 or more
+contains at most f of them, so a 2f+1 quorum inside the committee is as safe as one
+drawn from the whole roster.
+"""
+
+from typing import Iterable, List
+
+from backend.utils import sha256
+
+
+def committee_seed(beacon: str, sequence_number: int, request_hash: str) -> str:
+    return sha256(f"{beacon}:{sequence_number}:{request_hash}")
+
+
+def sample_committee(agent_ids: Iterable[str], size: int, seed: str) -> List[str]:
+    """The `size` agents with the lowest sha256(seed:agent_id), lowest first."""
+    return sorted(agent_ids, key=lambda agent_id: sha256(f"{seed}:{agent_id}"))[:size]
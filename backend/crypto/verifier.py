@@ -0,0 +1,117 @@
+"""
+SignatureVerifier — Ed25519 verification against a registry of agent verify keys.
+
+Results are memoized in a bounded LRU keyed by (signer, digest), where the digest covers
+both the signed payload and the signature. A message that several nodes, a certificate
+check and an audit replay all look at is verified once.
+
+verify_many() checks a whole phase's worth of signatures at once: cache hits are answered
+immediately and the misses are spread over a shared thread pool (libsodium releases the
+GIL, so the checks run in parallel).
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from nacl.signing import VerifyKey
+
+from backend.config import SIGNATURE_CACHE_SIZE, VERIFY_WORKERS
+from backend.utils import sha256
+
+# Below this many cache misses the thread pool costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="sig-verify")
+        return _executor
+
+
+class SignatureVerifier:
+    def __init__(self, verify_keys: Optional[Dict[str, VerifyKey]] = None, cache_size: int = SIGNATURE_CACHE_SIZE):
+        self.verify_keys: Dict[str, VerifyKey] = dict(verify_keys or {})
+        self.cache_size = max(0, cache_size)
+        self._cache: "OrderedDict[Tuple[str, str], bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, agent_id: str, verify_key: VerifyKey):
+        """Adds or replaces a signer's key; cached results for that signer are dropped."""
+        with self._lock:
+            self.verify_keys[agent_id] = verify_key
+            for key in [k for k in self._cache if k[0] == agent_id]:
+                del self._cache[key]
+
+    def _check(self, signer: str, message: str, signature_hex: str) -> bool:
+        key = self.verify_keys.get(signer)
+        if key is None or not signature_hex:
+            return False
+        try:
+            key.verify(message.encode(), bytes.fromhex(signature_hex))
+            return True
+        except Exception:
+            return False
+
+    def _lookup(self, cache_key: Tuple[str, str]) -> Optional[bool]:
+        with self._lock:
+            ok = self._cache.get(cache_key)
+            if ok is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(cache_key)
+            self.hits += 1
+            return ok
+
+    def _store(self, cache_key: Tuple[str, str], ok: bool):
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[cache_key] = ok
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _cache_key(signer: str, message: str, signature_hex: str) -> Tuple[str, str]:
+        return signer, sha256(f"{message}\x00{signature_hex}")
+
+    def verify(self, signer: str, message: str, signature_hex: str) -> bool:
+        """True if signature_hex is signer's signature over message."""
+        cache_key = self._cache_key(signer, message, signature_hex)
+        ok = self._lookup(cache_key)
+        if ok is None:
+            ok = self._check(signer, message, signature_hex)
+            self._store(cache_key, ok)
+        return ok
+
+    def verify_many(self, items: List[Tuple[str, str, str]]) -> List[bool]:
+        """Verifies (signer, message, signature_hex) triples; results are in input order."""
+        results: List[Optional[bool]] = []
+        missing: List[int] = []
+        cache_keys = [self._cache_key(*item) for item in items]
+        for i, cache_key in enumerate(cache_keys):
+            ok = self._lookup(cache_key)
+            results.append(ok)
+            if ok is None:
+                missing.append(i)
+
+        if len(missing) >= PARALLEL_THRESHOLD:
+            checked = list(_shared_executor().map(lambda i: self._check(*items[i]), missing))
+        else:
+            checked = [self._check(*items[i]) for i in missing]
+        for i, ok in zip(missing, checked):
+            results[i] = ok
+            self._store(cache_keys[i], ok)
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self._cache), "capacity": self.cache_size}
@@ -38,3 +38,22 @@ def test_sentry_drift():
     # Malicious target drift
     result_drift = {"decision": "APPROVE", "target": "MALICIOUS_TARGET"}
     assert not Sentry.validate_consensus_alignment(intent, result_drift)
+
+def test_auditor_stores_binary_certificate(tmp_path):
+    import json
+    from backend.armoriq.auditor import Auditor
+    from backend.crypto.certificate import ConsensusCertificate
+
+    cert = ConsensusCertificate(
+        view_number=0, sequence_number=1, request_hash="ab" * 32, pre_prepare_signature="cd" * 64,
+        prepare_quorum=[{"agent_id": "agent_1", "signature": "ef" * 64}],
+        commit_quorum=[{"agent_id": "agent_1", "signature": "01" * 64}],
+        result_hash="23" * 32, decision="APPROVE",
+    )
+    auditor = Auditor(db_path=str(tmp_path / "audit.db"))
+    intent = IntentDeclaration(action_type="READ", target="X", description="")
+    auditor.log_execution(intent, cert, True)
+
+    row = auditor.get_history()[0]
+    assert "consensus_cert_bin" not in row
+    assert json.loads(row["consensus_cert"]) == cert.to_dict()
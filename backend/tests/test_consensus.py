@@ -100,3 +100,870 @@ async def test_consensus_round_audit_trail(agents):
     assert rnd.started_at is not None
     assert len(rnd.prepare_msgs) == 4
     assert len(rnd.commit_msgs) > 0
+
+
+@pytest.mark.asyncio
+async def test_early_quorum_does_not_wait_for_straggler(agents):
+    """With early quorum, a slow agent must not hold up the round; its vote arrives late."""
+    from backend.faults.injector import FaultInjector, FaultConfig, FaultType
+
+    injector = FaultInjector()
+    injector.inject(agents, "agent_4", FaultConfig(fault_type=FaultType.TIMING, delay_seconds=1.0))
+    engine = ConsensusEngine(agents, early_quorum=True)
+
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result, cert, rnd = await engine.submit_request("action_005", request)
+
+    assert cert is not None
+    assert loop.time() - started < 1.0, "Round should finish before the straggler"
+    assert "agent_4" not in rnd.agent_results
+    assert len(rnd.stragglers) == 1
+
+    await rnd.wait_for_stragglers()
+    assert rnd.late_results["agent_4"]["decision"] == "APPROVE"
+
+    injector.clear_all(agents)
+
+
+def test_merkle_inclusion_proofs():
+    """Every leaf of an odd-sized batch should prove inclusion under the root, and only there."""
+    from backend.crypto.merkle import merkle_root, merkle_proof, verify_merkle_proof
+    from backend.utils import sha256
+
+    leaves = [sha256(str(i)) for i in range(5)]
+    root = merkle_root(leaves)
+    for i, leaf in enumerate(leaves):
+        assert verify_merkle_proof(leaf, merkle_proof(leaves, i), root)
+    assert not verify_merkle_proof(sha256("other"), merkle_proof(leaves, 0), root)
+
+
+def test_batched_pre_prepare_must_match_its_merkle_root(agents):
+    """A node refuses to prepare a batch root that does not commit to the batch's leaves."""
+    from backend.consensus.messages import PrePrepare, signing_payload
+    from backend.consensus.pbft_node import PBFTNode
+    from backend.crypto.merkle import merkle_root
+    from backend.crypto.verifier import SignatureVerifier
+    from backend.utils import sha256
+
+    verifier = SignatureVerifier({a.agent_id: a.identity.verify_key for a in agents})
+    node = PBFTNode("agent_2", agents[1].identity, 1, verifier)
+    leaves = [sha256(str(i)) for i in range(3)]
+
+    def pre_prepare(seq, batch_hashes):
+        msg = PrePrepare(
+            agent_id="agent_1", view_number=0, sequence_number=seq,
+            request_hash=merkle_root(leaves), request={}, batch_hashes=batch_hashes,
+        )
+        return msg.signed(agents[0].identity.sign(signing_payload(msg)))
+
+    assert node.on_pre_prepare(pre_prepare(1, [leaves[0], sha256("tampered"), leaves[2]])) is None
+    assert node.on_pre_prepare(pre_prepare(2, leaves)).request_hash == merkle_root(leaves)
+
+
+@pytest.mark.asyncio
+async def test_batched_consensus_shares_one_sequence(agents):
+    """A batch orders every request under one sequence number with verifiable per-request certificates."""
+    engine = ConsensusEngine(agents)
+    items = [
+        ("batch_a", {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}),
+        ("batch_b", {"type": "EXECUTION", "operation": "DELETE", "risk": "CRITICAL"}),
+        ("batch_c", {"type": "READ", "operation": "GET", "risk": "LOW", "target": "users"}),
+    ]
+    outcomes = await engine.submit_batch(items)
+
+    verify_keys = {agent.agent_id: agent.identity.verify_key for agent in agents}
+    decisions = [cert.decision for _, cert, _ in outcomes]
+    assert decisions == ["APPROVE", "REJECT", "APPROVE"]
+    assert {cert.sequence_number for _, cert, _ in outcomes} == {1}
+    assert outcomes[0][1].commit_quorum == outcomes[2][1].commit_quorum, "Signatures are shared"
+    for _, cert, _ in outcomes:
+        assert cert.verify(verify_keys, f=1)["valid"]
+
+    forged = outcomes[0][1]
+    forged.result_hash = outcomes[1][1].result_hash
+    assert not forged.verify(verify_keys, f=1)["valid"]
+
+
+@pytest.mark.asyncio
+async def test_request_batcher_flushes_on_size(agents):
+    """Concurrent submissions are grouped by the batcher into a single ordered batch."""
+    from backend.consensus.batching import RequestBatcher
+
+    batcher = RequestBatcher(ConsensusEngine(agents), max_batch_size=2, max_linger_sec=5.0)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    (_, cert_a, _), (_, cert_b, _) = await asyncio.gather(
+        batcher.submit("a", request), batcher.submit("b", dict(request, target="x")),
+    )
+    assert cert_a.batch["size"] == 2
+    assert cert_a.sequence_number == cert_b.sequence_number
+
+
+@pytest.mark.asyncio
+async def test_concurrent_rounds_respect_watermark_window(agents):
+    """A shared engine pipelines concurrent rounds but never has more in flight than the window."""
+    engine = ConsensusEngine(agents, watermark_window=2)
+    peak = 0
+    original = engine._run_round
+
+    async def tracking_run_round(seq, action_id, request, read=None):
+        nonlocal peak
+        peak = max(peak, len(engine._in_flight))
+        return await original(seq, action_id, request, read)
+
+    engine._run_round = tracking_run_round
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    outcomes = await asyncio.gather(*(
+        engine.submit_request(f"pipe_{i}", dict(request, target=str(i))) for i in range(5)
+    ))
+
+    assert [cert.sequence_number for _, cert, _ in outcomes] == [1, 2, 3, 4, 5]
+    assert peak == 2
+    assert engine.low_watermark == 5
+    assert engine.get_state()["in_flight"] == []
+
+
+@pytest.mark.asyncio
+async def test_stable_checkpoint_truncates_node_logs(agents):
+    """Node logs stay bounded by the checkpoint interval rather than by traffic."""
+    engine = ConsensusEngine(agents, checkpoint_interval=3)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    for i in range(7):
+        await engine.submit_request(f"cp_{i}", dict(request, target=str(i)))
+
+    assert engine.stable_checkpoint["sequence_number"] == 6
+    assert len(engine.stable_checkpoint["proof"]) >= 3
+    for node in engine.nodes.values():
+        assert node.stable_checkpoint["state_digest"] == engine.stable_checkpoint["state_digest"]
+        assert set(node.executed) == {7}
+        assert all(seq > 6 for view in node.commits.values() for seq in view)
+
+
+@pytest.mark.asyncio
+async def test_each_node_sends_one_prepare_and_one_commit(agents):
+    """Fan-out is deduplicated: n prepares, n commits and 2n+1 protocol signatures per round."""
+    engine = ConsensusEngine(agents)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    result, cert, rnd = await engine.submit_request("action_006", request)
+
+    assert len(rnd.commit_msgs) == 4
+    assert len({c.agent_id for c in rnd.commit_msgs}) == 4
+    assert rnd.message_stats["prepare"] == 4
+    assert rnd.message_stats["commit"] == 4
+    assert rnd.message_stats["signatures"] == 9
+
+    # Re-delivering a prepare neither produces another commit nor double counts the sender
+    node = engine.nodes["agent_1"]
+    assert node.on_prepare(rnd.prepare_msgs[0], rnd.agent_results["agent_1"]) is None
+    assert len(node.prepares[0][1][rnd.request_hash]) == 4
+
+
+def test_adaptive_timeout_and_view_change_backoff():
+    """Timeouts follow each agent's p99 within bounds; view-change pauses double until reset."""
+    from backend.consensus.timeouts import LatencyTracker, ViewChangeBackoff
+
+    tracker = LatencyTracker(factor=2.0, min_timeout=0.5, max_timeout=30.0, min_samples=5)
+    assert tracker.timeout_for("fast") == 30.0, "No history yet -> global timeout"
+    for _ in range(10):
+        tracker.record("fast", 0.1)
+        tracker.record("slow", 4.0)
+    assert tracker.timeout_for("fast") == 0.5
+    assert tracker.timeout_for("slow") == 8.0
+
+    # The fast agent's latency steps up to 3s for good: each timeout is a censored sample,
+    # so its timeout widens (bounded by max_timeout) until the answers fit again
+    timeouts = 0
+    while tracker.timeout_for("fast") < 3.0:
+        tracker.record_timeout("fast")
+        timeouts += 1
+    assert timeouts == 3 and tracker.timeout_for("fast") == 4.0
+    tracker.record("fast", 3.0)
+    for _ in range(50):
+        tracker.record_timeout("hung")
+    assert tracker.timeout_for("hung") == 30.0
+
+    backoff = ViewChangeBackoff(base=0.5, maximum=3.0)
+    assert [backoff.next_delay() for _ in range(4)] == [0.5, 1.0, 2.0, 3.0]
+    backoff.reset()
+    assert backoff.next_delay() == 0.5
+
+
+@pytest.mark.asyncio
+async def test_speculative_fast_path_on_unanimous_vote(agents):
+    """All 3f+1 agents agree -> single-phase FAST certificate with no protocol messages."""
+    engine = ConsensusEngine(agents, speculative=True)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    result, cert, rnd = await engine.submit_request("action_007", request)
+
+    assert cert.path == "FAST"
+    assert rnd.prepare_msgs == [] and rnd.commit_msgs == []
+    verify_keys = {agent.agent_id: agent.identity.verify_key for agent in agents}
+    verification = cert.verify(verify_keys, f=1)
+    assert verification["valid"], verification["errors"]
+    assert verification["valid_commits"] == 4
+
+    # A fast-path certificate missing one agent's signature is not valid
+    cert.commit_quorum = cert.commit_quorum[:3]
+    assert not cert.verify(verify_keys, f=1)["valid"]
+
+
+@pytest.mark.asyncio
+async def test_speculative_falls_back_when_votes_diverge(agents):
+    """One dissenting agent sends the round down the normal three-phase path."""
+    from backend.faults.injector import FaultInjector, FaultConfig, FaultType
+
+    injector = FaultInjector()
+    injector.inject(agents, "agent_2", FaultConfig(fault_type=FaultType.BYZANTINE, malicious_decision="REJECT"))
+    engine = ConsensusEngine(agents, speculative=True)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    result, cert, rnd = await engine.submit_request("action_008", request)
+
+    assert cert.path == "PBFT"
+    assert cert.decision == "APPROVE"
+    assert len(rnd.prepare_msgs) == 4
+    injector.clear_all(agents)
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_backup_wins_for_slow_agent(agents):
+    """A slot slower than its p95 is raced against its backup; the backup's answer is signed by the slot."""
+    from backend.crypto.identity import AgentIdentity
+    from backend.faults.injector import FaultInjector, FaultConfig, FaultType
+
+    engine = ConsensusEngine(agents, backups={"agent_3": SimulatedAgent("agent_3_backup")})
+    for _ in range(10):
+        engine.latency.record("agent_3", 0.1)
+
+    injector = FaultInjector()
+    injector.inject(agents, "agent_3", FaultConfig(fault_type=FaultType.TIMING, delay_seconds=5.0))
+    engine.agents = list(agents)
+
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    result, cert, rnd = await engine.submit_request("action_009", request)
+
+    assert result["decision"] == "APPROVE"
+    assert "agent_3" in rnd.agent_results
+    assert engine.hedge_stats["agent_3"] == {"calls": 1, "hedged": 1, "backup_wins": 1}
+    assert engine.hedge_snapshot()["agent_3"]["hedge_rate"] == 1.0
+    assert AgentIdentity.verify(
+        rnd.vote_digest(rnd.agent_results["agent_3"]), rnd.vote_signatures["agent_3"], agents[2].identity.verify_key
+    )
+
+
+@pytest.mark.asyncio
+async def test_replica_cluster_over_unix_sockets(agents, tmp_path, monkeypatch, caplog):
+    """Phases 1-3 run on replica servers over framed sockets; a downed replica is tolerated,
+    messages with a forged signature are dropped at ingress and bad frames only cost a call."""
+    from backend.consensus.messages import Prepare, signing_payload
+    from backend.consensus.network import ReplicaCluster
+    from backend.consensus.replica import build_replica, write_cluster_keys
+    from backend.consensus.transport import encode_message
+    from backend.crypto.identity import AgentIdentity
+
+    agent_ids = [a.agent_id for a in agents]
+    seeds = write_cluster_keys(str(tmp_path / "keys.json"), agent_ids)
+    for agent in agents:
+        agent.identity = AgentIdentity(agent.agent_id, seed=seeds[agent.agent_id])
+    peers = {aid: f"unix:{tmp_path / aid}.sock" for aid in agent_ids}
+
+    replicas = {aid: build_replica(aid, seeds, f=1) for aid in agent_ids[:3]}  # agent_4 is down
+    for aid, replica in replicas.items():
+        await replica.start(peers[aid])
+    cluster = ReplicaCluster(peers, {a.agent_id: a.identity.verify_key for a in agents}, rpc_timeout=1.0)
+    try:
+        engine = ConsensusEngine(agents, cluster=cluster)
+        request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+        result, cert, rnd = await engine.submit_request("action_010", request)
+
+        assert result["decision"] == "APPROVE"
+        assert {p.agent_id for p in rnd.prepare_msgs} == set(agent_ids[:3])
+        assert rnd.message_stats["prepare"] == 3
+        assert all(replicas[aid].node.executed == {1: rnd.request_hash} for aid in replicas)
+        assert engine.get_state()["deployment"] == "cluster"
+
+        forged = Prepare(agent_id="agent_2", view_number=0, sequence_number=2, request_hash="x")
+        forged = forged.signed(AgentIdentity("mallory").sign(signing_payload(forged)))
+        await cluster.multicast({"agent_1": {"op": "prepare", "msgs": [encode_message(forged)], "result": {}}})
+        assert replicas["agent_1"].node.rejected == 1
+        assert 2 not in replicas["agent_1"].node.prepares.get(0, {})
+
+        # Malformed JSON closes that connection; the replica keeps serving
+        from backend.consensus import transport
+        reader, writer = await transport.open_connection(peers["agent_1"])
+        writer.write(transport.FRAME_HEADER.pack(5) + b"{nope")
+        await writer.drain()
+        assert await transport.read_frame(reader) is None
+        writer.close()
+        assert "Malformed frame" in caplog.text
+        assert await cluster._call("agent_1", {"op": "state"}) is not None
+
+        # An oversized frame is a failed call, not an exception in the round
+        monkeypatch.setattr(transport, "MAX_FRAME_BYTES", 64)
+        assert await cluster._call("agent_1", {"op": "state", "pad": "x" * 128}) is None
+    finally:
+        await cluster.close()
+        for replica in replicas.values():
+            await replica.close()
+
+
+@pytest.mark.asyncio
+async def test_byzantine_replica_replies_are_dropped(agents, tmp_path):
+    """A replica replying with malformed messages and false commit claims cannot abort or
+    decide a round on its own."""
+    from backend.consensus.network import ReplicaCluster
+    from backend.consensus.replica import ReplicaServer, build_replica, write_cluster_keys
+    from backend.crypto.identity import AgentIdentity
+
+    class LyingReplica(ReplicaServer):
+        def handle(self, frame):
+            garbage = {"kind": "Prepare", "body": {"view_number": "x"}}
+            return {"agent_id": self.node.agent_id, "prepare": garbage, "commits": [garbage, "junk"], "committed": True}
+
+    agent_ids = [a.agent_id for a in agents]
+    seeds = write_cluster_keys(str(tmp_path / "keys.json"), agent_ids)
+    for agent in agents:
+        agent.identity = AgentIdentity(agent.agent_id, seed=seeds[agent.agent_id])
+    peers = {aid: f"unix:{tmp_path / aid}.sock" for aid in agent_ids}
+    replicas = {aid: build_replica(aid, seeds, f=1) for aid in agent_ids}
+    replicas["agent_4"] = LyingReplica(replicas["agent_4"].node)
+    for aid, replica in replicas.items():
+        await replica.start(peers[aid])
+    cluster = ReplicaCluster(peers, {a.agent_id: a.identity.verify_key for a in agents}, rpc_timeout=1.0)
+    try:
+        engine = ConsensusEngine(agents, cluster=cluster)
+        result, cert, rnd = await engine.submit_request("action_010b", {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"})
+        assert result["decision"] == "APPROVE" and cert is not None
+        assert {p.agent_id for p in rnd.prepare_msgs} == set(agent_ids[:3])
+        assert cluster.dropped["agent_4"] >= 3 and cluster.rejected["agent_4"] == cluster.dropped["agent_4"]
+
+        # Only the liar claims a commit for a slot nobody ordered: not enough
+        assert not await cluster.broadcast().commit([])
+    finally:
+        await cluster.close()
+        for replica in replicas.values():
+            await replica.close()
+
+
+@pytest.mark.asyncio
+async def test_nodes_verify_signatures_with_shared_cache(agents):
+    """Forged messages never reach a node's log; each phase is verified once for all nodes."""
+    from backend.consensus.messages import Prepare, signing_payload
+    from backend.crypto.identity import AgentIdentity
+
+    engine = ConsensusEngine(agents)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    result, cert, rnd = await engine.submit_request("action_011", request)
+    assert result is not None
+
+    # 4 nodes x (4 prepares + 4 commits) checks, but each distinct signature is verified once
+    stats = engine.verifier.stats()
+    assert stats["misses"] == 1 + 4 + 4  # pre-prepare, prepares, commits
+    assert stats["hits"] > stats["misses"]
+
+    verify_keys = {a.agent_id: a.identity.verify_key for a in agents}
+    assert cert.verify(verify_keys, f=1, verifier=engine.verifier)["valid"]
+
+    node = engine.nodes["agent_1"]
+    forged = Prepare(agent_id="agent_2", view_number=0, sequence_number=2, request_hash="x")
+    forged = forged.signed(AgentIdentity("mallory").sign(signing_payload(forged)))
+    unsigned = Prepare(agent_id="agent_3", view_number=0, sequence_number=2, request_hash="x")
+    assert node.verify_batch([forged, unsigned]) == []
+    assert node.on_prepare(forged, {}) is None
+    assert 2 not in node.prepares.get(0, {})
+    assert node.rejected == 3
+
+
+@pytest.mark.asyncio
+async def test_binary_codec_round_trips_messages_and_certificates(agents):
+    """Messages and certificates survive the compact codec unchanged, at well under JSON size."""
+    from backend.codec import encode, decode
+    from backend.crypto.certificate import ConsensusCertificate
+    from backend.consensus.messages import pack_message, unpack_message, signing_payload
+    from backend.utils import canonical_json
+
+    engine = ConsensusEngine(agents)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW", "nested": [1, -2, 0.5, None, True]}
+    _, cert, rnd = await engine.submit_request("action_012", request)
+
+    for msg in rnd.prepare_msgs + rnd.commit_msgs:
+        restored = unpack_message(pack_message(msg))
+        assert type(restored) is type(msg) and restored == msg
+        assert signing_payload(restored) == signing_payload(msg)
+
+    data = cert.to_bytes()
+    assert decode(data) == cert.to_dict()
+    assert ConsensusCertificate.from_bytes(data).to_dict() == cert.to_dict()
+    assert len(data) < 0.65 * len(canonical_json(cert.to_dict()))
+    assert encode({"b": 1, "a": [2]}) == encode({"a": [2], "b": 1}), "Encoding is canonical"
+
+
+@pytest.mark.asyncio
+async def test_signing_runs_off_the_event_loop(agents):
+    """Phase and certificate signatures are produced on the signing pool and timed per round."""
+    import threading
+
+    on_loop = []
+    for agent in agents:
+        sign = agent.identity.sign
+
+        def recording_sign(message, _sign=sign):
+            on_loop.append(threading.current_thread() is threading.main_thread())
+            return _sign(message)
+
+        agent.identity.sign = recording_sign
+
+    engine = ConsensusEngine(agents)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    result, cert, rnd = await engine.submit_request("action_013", request)
+
+    assert result is not None
+    # Nothing is signed on the loop: Phase 0 votes (4), pre-prepare (1), prepares (4),
+    # commits (4) and the two certificate quorums (3 + 3) are signed on worker threads.
+    assert on_loop.count(True) == 0
+    assert on_loop.count(False) == 4 + 1 + 4 + 4 + 3 + 3
+    assert rnd.signing_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_optimistic_committee_escalates_only_on_dissent(agents):
+    """A unanimous 2f+1 committee is enough; a dissenting member brings in the remaining agents."""
+    from backend.faults.injector import FaultInjector, FaultConfig, FaultType
+
+    scores = {"agent_1": 90.0, "agent_2": 80.0, "agent_3": 70.0, "agent_4": 10.0}
+    engine = ConsensusEngine(agents, optimistic=True, agent_score=scores.get)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+
+    result, cert, rnd = await engine.submit_request("action_014a", request)
+    assert result["decision"] == "APPROVE" and cert is not None
+    assert rnd.committee == ["agent_1", "agent_2", "agent_3"]
+    assert rnd.agent_queries == 3 and not rnd.escalated
+
+    injector = FaultInjector()
+    injector.inject(agents, "agent_2", FaultConfig(fault_type=FaultType.BYZANTINE, malicious_decision="REJECT"))
+    engine.agents = list(agents)
+    result, cert, rnd = await engine.submit_request("action_014b", request)
+    assert result["decision"] == "APPROVE" and cert is not None
+    assert rnd.escalated and rnd.agent_queries == 4
+    assert engine.committee_stats == {"rounds": 2, "escalations": 1, "queries_saved": 1}
+
+
+@pytest.mark.asyncio
+async def test_decision_cache_reuses_certificate(agents):
+    """An identical request is answered from the cache with the original certificate."""
+    from backend.consensus.cache import DecisionCache
+
+    engine = ConsensusEngine(agents, cache=DecisionCache(max_entries=8))
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    assert engine.lookup_cached("action_015a", request) is None
+
+    result, cert, rnd = await engine.submit_request("action_015a", request)
+    engine.remember(rnd, result, cert, ttl=60)
+    cached_result, cached_cert, cached_rnd = engine.lookup_cached("action_015b", request)
+
+    assert cached_rnd.cache_hit and cached_rnd.agent_queries == 0
+    assert cached_result == result
+    assert cached_cert.to_dict() == cert.to_dict()
+    assert cached_cert.verify({a.agent_id: a.identity.verify_key for a in agents}, engine.f)["valid"]
+    assert cached_rnd.sequence_number == rnd.sequence_number
+    assert engine.sequence_number == rnd.sequence_number, "A hit does not consume a sequence number"
+
+    other = dict(request, operation="STATUS")
+    assert engine.lookup_cached("action_015c", other) is None
+    assert engine.cache.stats()["hits"] == 1
+
+
+def test_decision_cache_ttl_eviction_and_sqlite_tier(tmp_path):
+    from backend.consensus.cache import DecisionCache, parse_ttls
+
+    assert parse_ttls("LOW:300, medium:60,HIGH:0") == {"LOW": 300.0, "MEDIUM": 60.0, "HIGH": 0.0}
+
+    cache = DecisionCache(max_entries=2)
+    cache.put("h0", "roster", {"n": 0}, ttl=0)
+    assert cache.get("h0", "roster") is None, "TTL 0 is never cached"
+    for i in range(1, 4):
+        cache.put(f"h{i}", "roster", {"n": i}, ttl=60)
+    assert cache.get("h1", "roster") is None and cache.get("h3", "roster") == {"n": 3}
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("h3", "other roster") is None, "Entries are scoped to the roster"
+
+    version = ["policies-v1"]
+    db = str(tmp_path / "decisions.db")
+    DecisionCache(db_path=db, version=lambda: version[0]).put("h", "roster", {"sig": "ab" * 32}, ttl=60)
+    restarted = DecisionCache(db_path=db, version=lambda: version[0])
+    assert restarted.get("h", "roster") == {"sig": "ab" * 32}
+    version[0] = "policies-v2"
+    assert restarted.get("h", "roster") is None, "A policy change invalidates cached decisions"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_round(agents):
+    """Duplicates in flight await the first caller's round instead of starting their own."""
+    from backend.consensus.batching import RequestBatcher
+
+    engine = ConsensusEngine(agents)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    outcomes = await asyncio.gather(*(engine.submit_request(f"dup_{i}", request) for i in range(5)))
+
+    certs = {id(cert) for _, cert, _ in outcomes}
+    _, cert, rnd = outcomes[0]
+    assert len(certs) == 1 and engine.sequence_number == 1
+    assert rnd.action_id == "dup_0" and sorted(rnd.coalesced) == ["dup_1", "dup_2", "dup_3", "dup_4"]
+    assert engine.flight_stats == {"flights": 1, "coalesced": 4}
+    assert engine.get_state()["single_flight"]["in_flight"] == 0
+
+    batcher = RequestBatcher(engine, max_batch_size=2, max_linger_sec=0.05)
+    other = dict(request, target="x")
+    outcomes = await asyncio.gather(
+        batcher.submit("b_1", request), batcher.submit("b_2", request), batcher.submit("b_3", other),
+    )
+    assert outcomes[0][1] is outcomes[1][1]
+    assert outcomes[0][1].batch["size"] == 2, "The duplicate did not take a batch slot"
+    assert engine.sequence_number == 2
+
+
+@pytest.mark.asyncio
+async def test_canonical_json_is_stdlib_identical_and_hashed_once(agents, monkeypatch):
+    """The fast encoder never changes a byte, and a round hashes each result only once."""
+    import json
+    from backend import utils
+
+    samples = [
+        {"b": 1, "a": [0.1, 1e-05, 2.5e-05, 1e16, 123456.0, -0.0, True, None]},
+        {"id": "intent-7f3c2a1e9b", "text": "naïve   \x7f", "n": 2 ** 70},
+        {"nan": float("nan"), "inf": [float("-inf")], "confidence": 0.99},
+        [{"z": {"y": [1, 2, {"x": "0.00001"}]}}], "bare string", 1e-07,
+    ]
+    for sample in samples:
+        expected = json.dumps(sample, sort_keys=True, separators=(",", ":"))
+        assert utils.canonical_json(sample) == expected
+        monkeypatch.setattr(utils, "orjson", None)
+        assert utils.canonical_json(sample) == expected
+        monkeypatch.undo()
+
+    engine = ConsensusEngine(agents)
+    result, cert, rnd = await engine.submit_request("action_017", {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"})
+    assert cert.verify({a.agent_id: a.identity.verify_key for a in agents}, engine.f)["valid"]
+    assert rnd.digest.computed == 1 + len(agents), "The request and each agent result are hashed once"
+
+
+def test_messages_are_frozen_and_validated_at_the_boundary():
+    """Internal messages are immutable; input from another process is type-checked."""
+    import dataclasses
+    from pydantic import ValidationError
+    from backend.consensus.messages import Prepare, signing_payload
+    from backend.consensus.transport import encode_message, decode_message
+
+    prep = Prepare(agent_id="agent_1", view_number=0, sequence_number=3, request_hash="ab" * 32)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        prep.signature = "00"
+    assert not hasattr(prep, "__dict__")
+
+    payload = signing_payload(prep)
+    signed = prep.signed("cd" * 64)
+    assert signed.signature == "cd" * 64 and prep.signature == ""
+    assert signing_payload(signed) is payload, "The payload is computed once"
+    assert decode_message(encode_message(signed)) == signed
+
+    with pytest.raises(ValidationError):
+        decode_message({"kind": "Prepare", "body": {"agent_id": "agent_1", "view_number": "x", "sequence_number": 3}})
+
+
+@pytest.mark.asyncio
+async def test_round_store_keeps_recent_rounds_and_spills(agents, tmp_path):
+    """Finished rounds are stored with per-agent detail; evicted ones are read back from disk."""
+    from backend.consensus.round_store import RoundStore
+
+    store = RoundStore(max_rounds=2, max_bytes=1 << 20, db_path=str(tmp_path / "rounds.db"))
+    engine = ConsensusEngine(agents, round_store=store)
+    for i in range(3):
+        await engine.submit_request(f"action_019_{i}", {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW", "target": str(i)})
+
+    assert store.stats()["rounds"] == 2 and store.stats()["spilled"] == 1
+    (first,) = store.by_sequence(1)  # spilled to disk
+    assert first["action_id"] == "action_019_0" and first["decision"] == "APPROVE"
+    assert set(first["agent_latency_ms"]) == {a.agent_id for a in agents}
+    assert len(first["commit_msgs"]) == len(agents) and first["certificate"]["sequence_number"] == 1
+    assert [r["sequence_number"] for r in store.since(1)] == [2, 3]
+    assert store.by_sequence(99) == []
+
+    tiny = RoundStore(max_rounds=10, max_bytes=len(str(first)) // 4, db_path="")
+    tiny.record(first)
+    tiny.record(dict(first, action_id="other", sequence_number=2))
+    assert tiny.stats()["rounds"] == 1 and tiny.stats()["dropped"] == 1, "Bounded by bytes"
+
+
+def test_vote_tally_matches_a_counter():
+    """Indexed tallies give the same leader and counts as re-counting every vote."""
+    from collections import Counter
+    from backend.consensus.tally import VoteTally
+
+    roster = [f"agent_{i}" for i in range(10)]
+    votes = {aid: ("APPROVE" if i % 3 else "REJECT") for i, aid in enumerate(roster)}
+    tally = VoteTally.of(roster, {aid: {"decision": d} for aid, d in votes.items()})
+    assert tally.counts() == dict(Counter(votes.values()))
+    assert tally.leader() == Counter(votes.values()).most_common(1)[0]
+    assert tally.voters("REJECT") == sum(1 << i for i in range(0, 10, 3))
+
+    tally.record("agent_1", "REJECT")  # replaces an APPROVE
+    tally.withdraw("agent_2")
+    assert tally.counts() == {"APPROVE": 4, "REJECT": 5} and tally.total == 9
+    tally.withdraw("agent_3")
+    assert tally.leader() == ("REJECT", 4), "A tie goes to the decision seen first"
+    assert VoteTally(roster).leader() == (None, 0)
+
+
+@pytest.mark.asyncio
+async def test_sampled_committee_runs_the_round():
+    """A 13-agent roster runs each round on a verifiable committee of 3f+1."""
+    from backend.crypto.certificate import ConsensusCertificate
+
+    agents = [SimulatedAgent(f"agent_{i}") for i in range(1, 14)]
+    engine = ConsensusEngine(agents, f=1, sample_size=4)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    result, cert, rnd = await engine.submit_request("action_020", request)
+
+    assert result["decision"] == "APPROVE"
+    assert rnd.agent_queries == 4, "Only the committee is asked"
+    members = set(cert.committee["members"])
+    assert len(members) == 4 and set(rnd.agent_results) == members
+    verify_keys = {a.agent_id: a.identity.verify_key for a in agents}
+    assert cert.verify(verify_keys, f=1)["valid"]
+    # A verifier that also holds spares' or other shards' keys redraws from the recorded roster
+    others = [SimulatedAgent(f"spare_{i}") for i in range(10)] + [SimulatedAgent(f"payments_agent_{i}") for i in range(10)]
+    all_keys = {**verify_keys, **{a.agent_id: a.identity.verify_key for a in others}}
+    assert cert.verify(all_keys, f=1)["valid"]
+    legacy = ConsensusCertificate.from_dict(dict(cert.to_dict(), committee={k: v for k, v in cert.committee.items() if k != "roster"}))
+    assert not legacy.verify(all_keys, f=1)["valid"], "Without the roster the draw depends on the keys held"
+    learners = [node for aid, node in engine.nodes.items() if aid not in members]
+    assert learners and all(1 in node.executed for node in learners), "Non-members learn the commit"
+
+    outsider = next(a.agent_id for a in agents if a.agent_id not in members)
+    cert.committee = dict(cert.committee, members=sorted(members - {cert.commit_quorum[0]["agent_id"]}) + [outsider])
+    verification = cert.verify(verify_keys, f=1)
+    assert not verification["valid"] and any("committee" in e.lower() for e in verification["errors"])
+
+    with pytest.raises(ValueError):
+        ConsensusEngine(agents, f=1, sample_size=3)
+
+
+@pytest.mark.asyncio
+async def test_read_only_lane_certifies_with_one_vote_quorum(agents):
+    """LOW-risk reads are answered by 2f+1 signed votes without being ordered."""
+    from backend.armoriq.intent_engine import IntentEngine
+
+    def read_only(request):
+        return IntentEngine.classify_risk(request["operation"], request.get("target", "")) == "LOW"
+
+    class FlakyAgent(SimulatedAgent):
+        calls = 0
+
+        async def decide_async(self, action_id, user_request):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("provider hiccup")
+            return await super().decide_async(action_id, user_request)
+
+    from backend.consensus.round_store import RoundStore
+    from backend.consensus.sharding import ShardRouter
+
+    store = RoundStore(db_path="")
+    engine = ConsensusEngine(agents, read_only=read_only, round_store=store)
+    result, cert, rnd = await engine.submit_request("action_021", {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"})
+    verify_keys = {a.agent_id: a.identity.verify_key for a in agents}
+    assert result["decision"] == "APPROVE" and cert.path == "READ"
+    assert len(cert.commit_quorum) == 3 and not cert.prepare_quorum and not rnd.prepare_msgs
+    assert cert.verify(verify_keys, f=1)["valid"]
+    assert engine.sequence_number == 0 and not any(node.executed for node in engine.nodes.values())
+
+    _, cert, _ = await engine.submit_request("action_021b", {"type": "EXECUTION", "operation": "DELETE", "risk": "CRITICAL"})
+    assert cert.path == "PBFT" and engine.sequence_number == 1, "Writes are still ordered"
+
+    # A read stamped with the write's slot does not shadow the write's round or index entry
+    _, cert, rnd = await engine.submit_request("action_021r", {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"})
+    assert cert.path == "READ" and cert.sequence_number == 1
+    assert [r["action_id"] for r in store.by_sequence(1)] == ["action_021b"]
+    assert store.by_action("action_021r")["path"] == "READ" and store.since(0)[-1]["action_id"] == "action_021b"
+    index = ShardRouter([])
+    index.record("action_021b", "default", 1, "PBFT")
+    index.record("action_021r", "default", rnd.sequence_number, rnd.path)
+    assert index.lookup("action_021r")["sequence_number"] is None
+
+    # Without a vote quorum the read falls back to PBFT and keeps the votes it got
+    flaky = [FlakyAgent("agent_1"), FlakyAgent("agent_2"), agents[2], agents[3]]
+    engine = ConsensusEngine(flaky, read_only=read_only)
+    result, cert, rnd = await engine.submit_request("action_021c", {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"})
+    assert cert.path == "PBFT" and result["decision"] == "APPROVE"
+    assert rnd.agent_queries == 6 and engine.read_stats == {"reads": 1, "fallbacks": 1}
+
+
+@pytest.mark.asyncio
+async def test_hotstuff_protocol_commits_with_linear_messages():
+    """Leader-collected quorum certificates commit the same rounds with O(n) messages."""
+    agents = [SimulatedAgent(f"agent_{i}") for i in range(1, 8)]
+    verify_keys = {a.agent_id: a.identity.verify_key for a in agents}
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+
+    deliveries = {}
+    for protocol in ("pbft", "hotstuff"):
+        engine = ConsensusEngine(agents, f=2, protocol=protocol)
+        result, cert, rnd = await engine.submit_request(f"action_022_{protocol}", request)
+        assert result["decision"] == "APPROVE" and cert.verify(verify_keys, f=2)["valid"]
+        assert all(node.executed == {1: rnd.request_hash} for node in engine.nodes.values())
+        deliveries[protocol] = rnd.message_stats["deliveries"]
+
+    assert rnd.message_stats["qc"] == 2
+    assert deliveries["hotstuff"] == 5 * len(agents)
+    assert deliveries["pbft"] == len(agents) + 2 * len(agents) ** 2
+
+    with pytest.raises(ValueError, match="Unknown consensus protocol"):
+        ConsensusEngine(agents, f=2, protocol="raft")
+
+
+@pytest.mark.asyncio
+async def test_any_ordering_protocol_can_be_registered(agents, monkeypatch):
+    """The registry takes any factory of OrderingProtocol, not only InProcessBroadcast subclasses."""
+    from backend.consensus import protocol as protocols
+    from backend.consensus.broadcast import InProcessBroadcast
+
+    class Traced:  # composition, not inheritance
+        def __init__(self, nodes, signer=None, members=None):
+            self.inner = InProcessBroadcast(nodes, signer, members)
+            self.stats = self.inner.stats
+
+        async def pre_prepare(self, msg):
+            return await self.inner.pre_prepare(msg)
+
+        async def prepare(self, prepares, node_results, result_hashes=None):
+            return await self.inner.prepare(prepares, node_results, result_hashes)
+
+        async def commit(self, commits):
+            return await self.inner.commit(commits)
+
+    monkeypatch.setitem(protocols.PROTOCOLS, "traced", Traced)
+    engine = ConsensusEngine(agents, protocol="traced")
+    result, cert, _ = await engine.submit_request("action_022_traced", {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"})
+    assert result["decision"] == "APPROVE" and cert.path == "PBFT"
+    assert engine.get_state()["protocol"] == "traced"
+
+
+@pytest.mark.asyncio
+async def test_hot_spare_replaces_crashed_agents_without_view_change(agents):
+    """Spares with their own keys stand in for crashed agents; the swap is certified."""
+    from backend.faults.injector import FaultInjector, FaultConfig, FaultType
+    from backend.crypto.certificate import ConsensusCertificate
+
+    injector = FaultInjector()
+    injector.inject(agents, "agent_1", FaultConfig(fault_type=FaultType.CRASH))
+    injector.inject(agents, "agent_3", FaultConfig(fault_type=FaultType.CRASH))
+    spares = [SimulatedAgent("spare_1"), SimulatedAgent("spare_2")]
+    engine = ConsensusEngine(agents, spares=spares)
+
+    result, cert, rnd = await engine.submit_request("action_023", {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"})
+    assert result["decision"] == "APPROVE" and engine.view_number == 0, "No view change"
+    assert cert.substitutions == {"agent_1": "spare_1", "agent_3": "spare_2"}
+    assert rnd.prepare_msgs[0].agent_id != "agent_1" and all(m.agent_id != "agent_3" for m in rnd.commit_msgs)
+
+    verify_keys = {a.agent_id: a.identity.verify_key for a in agents + spares}
+    assert cert.verify(verify_keys, f=1)["valid"]
+    forged = ConsensusCertificate.from_dict(dict(cert.to_dict(), substitutions={"agent_2": "spare_1"}))
+    assert not forged.verify(verify_keys, f=1)["valid"], "A replaced agent may not sign"
+    assert engine.spare_stats == {"rounds": 1, "substitutions": 2}
+
+
+@pytest.mark.asyncio
+async def test_engine_state_and_keys_survive_a_restart(agents, tmp_path):
+    """A restarted engine resumes its sequence and checkpoint, and its agents their keys."""
+    import os
+    from backend.consensus.state_store import StateStore
+
+    path = str(tmp_path / "state.bin")
+    store = StateStore(path)
+    store.identities(agents)
+    engine = ConsensusEngine(agents, checkpoint_interval=2, state_store=store)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    for i in range(3):
+        _, cert, _ = await engine.submit_request(f"action_024_{i}", dict(request, target=str(i)))
+    await engine.flush_state()  # snapshots are written off the event loop
+    cluster_seeds = store.seeds(["replica_1", "replica_2"])
+
+    restarted = [SimulatedAgent(a.agent_id) for a in agents]
+    store = StateStore(path)
+    assert store.seeds(["replica_1", "replica_2"]) == cluster_seeds, "Replica seeds are kept"
+    assert store.restored and store.identities(restarted) == len(agents)
+    assert os.stat(f"{path}.key").st_mode & 0o777 == 0o600
+    seed = agents[0].identity.signing_key.encode().hex()
+    assert seed.encode() not in open(path, "rb").read(), "Keys are sealed at rest"
+
+    engine = ConsensusEngine(restarted, checkpoint_interval=2, state_store=store)
+    assert engine.sequence_number == 3 and engine.stable_checkpoint["sequence_number"] == 2
+    assert cert.verify({a.agent_id: a.identity.verify_key for a in restarted}, f=1)["valid"]
+    _, cert, _ = await engine.submit_request("action_024_next", request)
+    assert cert.sequence_number == 4
+
+
+@pytest.mark.asyncio
+async def test_lagging_nodes_catch_up_by_state_transfer(agents):
+    """Nodes that lost their state adopt their peers' proven checkpoint and log."""
+    from backend.consensus.pbft_node import PBFTNode
+
+    engine = ConsensusEngine(agents, checkpoint_interval=2)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+
+    def wipe(agent_id):
+        node = engine.nodes[agent_id]
+        engine.nodes[agent_id] = PBFTNode(agent_id, node.identity, node.f, node.verifier)
+
+    await engine.submit_request("action_024_a", dict(request, target="a"))
+    wipe("agent_3")
+    wipe("agent_4")
+    await engine.submit_request("action_024_b", dict(request, target="b"))  # checkpoint 2 fails
+    assert engine.stable_checkpoint["sequence_number"] == 0
+    assert engine.nodes["agent_4"].executed == {1: engine.nodes["agent_1"].executed[1], 2: engine.nodes["agent_1"].executed[2]}
+    await engine.submit_request("action_024_c", dict(request, target="c"))
+    assert engine.stable_checkpoint["sequence_number"] == 3 and engine.state_transfers == 2
+
+    wipe("agent_2")
+    forged = dict(engine.nodes["agent_1"].state_summary())
+    forged["stable_checkpoint"] = dict(forged["stable_checkpoint"], sequence_number=9)
+    assert not engine.nodes["agent_2"].install_state([forged]), "An unproven checkpoint is ignored"
+    assert (await engine.state_transfer())["agent_2"]
+    assert engine.nodes["agent_2"].stable_checkpoint == engine.stable_checkpoint
+
+
+@pytest.mark.asyncio
+async def test_shards_route_by_target_and_order_independently(agents, tmp_path):
+    """Each shard runs its own committee and sequence; the index maps intents to shards."""
+    from backend.consensus.sharding import DEFAULT_SHARD, ShardRouter, load_shards
+
+    path = tmp_path / "shards.yaml"
+    path.write_text(
+        "shards:\n"
+        "  - id: payments\n    target: '^PAYMENTS'\n    agents: [phi4, qwen2, mistral, llama3]\n"
+        "  - id: review\n    policy: human_review_for_financials\n    agents: 'phi4,qwen2,mistral,llama3'\n"
+    )
+    router = ShardRouter(load_shards(str(path), "fast"), index_size=2)
+    payments = router.route("i1", "payments/ledger", "standard_operations")
+    assert payments.id == "payments" and [a.agent_id for a in payments.agents][0] == "payments_agent_1"
+    assert router.route("i2", "users", "human_review_for_financials").id == "review"
+    assert router.route("i3", "users", "standard_operations") is None
+    assert router.lookup("i1") is None, "The index is bounded"
+    assert router.lookup("i3") == {"intent_id": "i3", "shard": DEFAULT_SHARD, "sequence_number": None, "path": None}
+
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    main, shard = ConsensusEngine(agents), ConsensusEngine(payments.agents, f=payments.f)
+    results = await asyncio.gather(
+        main.submit_request("action_025_a", request),
+        shard.submit_request("action_025_b", request),
+        shard.submit_request("action_025_c", dict(request, target="c")),
+    )
+    assert [cert.sequence_number for _, cert, _ in results] == [1, 1, 2]
+    router.record("action_025_c", payments.id, results[2][1].sequence_number)
+    assert router.lookup("action_025_c")["sequence_number"] == 2
+    shard_keys = {a.agent_id: a.identity.verify_key for a in payments.agents}
+    assert results[1][1].verify(shard_keys, f=1)["valid"]
+    assert not results[0][1].verify(shard_keys, f=1)["valid"], "Shards do not vouch for each other"
+
+    path.write_text("shards:\n  - id: tiny\n    target: x\n    agents: [phi4, qwen2]\n")
+    with pytest.raises(ValueError, match="at least 4 agents"):
+        load_shards(str(path), "fast")
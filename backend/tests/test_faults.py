@@ -106,3 +106,42 @@ async def test_scenario_crash_recovery(agents):
     report = await scenario_crash_recovery(agents)
     assert report["consensus_reached"] is True
     assert report["consensus_decision"] is not None
+
+
+@pytest.mark.asyncio
+async def test_view_change_reuses_phase0_votes(agents):
+    """After the primary crashes, the new view only re-queries the failed agent."""
+    injector = FaultInjector()
+    injector.inject(agents, "agent_1", FaultConfig(fault_type=FaultType.CRASH))
+
+    engine = ConsensusEngine(agents)
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    result, cert, rnd = await engine.submit_request("test_reuse_001", request)
+
+    assert cert is not None
+    assert engine.view_number == 1
+    assert rnd.agent_queries == 5, "4 initial calls + 1 retry of the crashed primary"
+    assert set(rnd.vote_signatures) == {"agent_2", "agent_3", "agent_4"}
+
+    injector.clear_all(agents)
+
+
+@pytest.mark.asyncio
+async def test_injected_fault_invalidates_cached_decisions(agents, tmp_path, monkeypatch):
+    """A decision cached before a fault was injected is not served while the fault is active."""
+    from backend.consensus.cache import DecisionCache
+
+    monkeypatch.chdir(tmp_path)  # the API module creates its audit/policy files on import
+    from backend.api import routes
+
+    monkeypatch.setattr(routes, "injector", FaultInjector())
+    engine = ConsensusEngine(agents, cache=DecisionCache(version=routes._decision_version))
+    request = {"type": "HEALTHCHECK", "operation": "PING", "risk": "LOW"}
+    result, cert, rnd = await engine.submit_request("action_cache_1", request)
+    engine.remember(rnd, result, cert, ttl=60)
+    assert engine.lookup_cached("action_cache_2", request) is not None
+
+    routes.injector.inject(agents, "agent_2", FaultConfig(fault_type=FaultType.CRASH))
+    assert engine.lookup_cached("action_cache_3", request) is None, "Fault changes the cache version"
+    routes.injector.clear(agents, "agent_2")
+    assert engine.lookup_cached("action_cache_4", request) is not None
@@ -1,9 +1,83 @@
+import re
 import json
+import math
 import hashlib
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
-def canonical_json(data: Dict[str, Any]) -> str:
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib encoder is always correct
+    orjson = None
+
+# orjson output is only trusted when it cannot differ from the stdlib encoder: stdlib
+# escapes non-ASCII and DEL, writes floats below 1e-4 or from 1e16 as "1e-05" / "1e+16"
+# and NaN/Infinity literally, where orjson writes UTF-8, "0.00001" / "1e16" and null.
+# Only numbers are inspected (inside an object or array they follow "[", ":" or ","), so
+# digests and ids inside strings rarely force the fallback; bare scalars always use stdlib.
+_STDLIB_FLOAT_SHAPES = re.compile(rb"[\[:,]-?(?:\d+(?:\.\d+)?e|0\.0000)")
+
+# Types the stdlib rejects (dataclasses, datetimes) or treats differently must not be
+# encoded by orjson; they raise and fall back.
+_ORJSON_OPTIONS = (
+    orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_SUBCLASS
+) if orjson else 0
+
+
+def _stdlib_canonical_json(data: Any) -> str:
     return json.dumps(data, sort_keys=True, separators=(",", ":"))
 
+
+def _has_non_finite(data: Any) -> bool:
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite(v) for v in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(v) for v in data)
+    return False
+
+
+def canonical_json(data: Dict[str, Any]) -> str:
+    """Sorted-key, compact JSON. Uses orjson when installed; the output is byte-identical
+    to json.dumps(sort_keys=True, separators=(",", ":")) either way."""
+    if orjson is None:
+        return _stdlib_canonical_json(data)
+    try:
+        out = orjson.dumps(data, option=_ORJSON_OPTIONS)
+    except TypeError:  # non-str keys, >64-bit ints, subclasses, ...: let the stdlib decide
+        return _stdlib_canonical_json(data)
+    if (
+        out[:1] not in (b"{", b"[") or not out.isascii() or b"\x7f" in out
+        or _STDLIB_FLOAT_SHAPES.search(out)
+        or (b"null" in out and _has_non_finite(data))
+    ):
+        return _stdlib_canonical_json(data)
+    return out.decode()
+
+
 def sha256(s: str) -> str:
     return hashlib.sha256(s.encode()).hexdigest()
+
+
+class DigestMemo:
+    """
+    sha256(canonical_json(obj)) computed once per object.
+
+    Entries are keyed by object identity and keep the object alive; hashed objects must not
+    be modified while the memo is in use. A ConsensusRound owns one for its request and the
+    agent results it has accepted, which are never changed after Phase 0.
+    """
+
+    def __init__(self):
+        self._digests: Dict[int, Tuple[Any, str]] = {}
+        self.computed = 0
+
+    def __call__(self, obj: Any) -> str:
+        hit = self._digests.get(id(obj))
+        if hit is not None and hit[0] is obj:
+            return hit[1]
+        digest = sha256(canonical_json(obj))
+        self._digests[id(obj)] = (obj, digest)
+        self.computed += 1
+        return digest